@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -122,6 +123,178 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# Schedule solver profiles
+# 요청의 "profile" 값으로 선택하며, 없으면 SCHEDULE_SOLVER_DEFAULT_PROFILE을 사용합니다.
+# 기본 프로필(interactive, batch, throughput, fair)은 schedule/profiles.py의 DEFAULT_PROFILES에 있고,
+# 여기에는 바꿀 값이나 새 프로필만 적습니다. (이름이 같으면 적은 항목만 기본값 대신 사용)
+#   'batch': {'time_limit': 300.0},
+#   'nightly': {'num_search_workers': 0, 'time_limit': 1800.0, 'symmetry_breaking': True},
+# num_search_workers=0은 CPU 코어 수에 맞춰 자동으로 정해집니다.
+# 'symmetry_breaking': True이면 입력이 같은 근무자끼리 사전순 정렬 제약을 추가합니다.
+# (효과는 인스턴스마다 다르므로 benchmarks/bench_symmetry_breaking.py로 확인 후 사용)
+# 'objective_stages': [[항목, 시간(초)], ...]이면 목적함수 항목을 순서대로 하나씩 최소화합니다.
+# 단계별 시간의 합이 time_limit을 넘으면 남은 단계는 time_limit 안에서 실행합니다.
+
+SCHEDULE_SOLVER_PROFILES = {}
+SCHEDULE_SOLVER_DEFAULT_PROFILE = 'interactive'
+
+# Schedule solver job queue (/api/jobs/)
+
+# 동시에 실행할 계산 프로세스 수 (작업 큐와 일괄 계산이 함께 사용)
+SCHEDULE_JOB_MAX_WORKERS = os.cpu_count() or 2
+# 실행 중인 작업 외에 대기할 수 있는 최대 작업 수 (초과 시 503)
+SCHEDULE_JOB_MAX_QUEUE = 20
+# 작업 하나당 CP-SAT 계산 시간 상한 (초). 실제 제한은 프로필의 time_limit과 이 값 중 작은 값
+SCHEDULE_JOB_TIMEOUT = 600.0
+# 작업에 profile이 없을 때 사용할 프로필 (계산 프로세스가 SCHEDULE_JOB_MAX_WORKERS개이므로 프로세스마다 스레드 1개)
+SCHEDULE_JOB_PROFILE = 'throughput'
+# 상태 조회 long-poll(?wait=N)의 최대 대기 시간 (초)
+SCHEDULE_JOB_MAX_WAIT = 30
+# 진행 상황을 DB에 기록하는 최소 간격 (초)
+SCHEDULE_JOB_PROGRESS_INTERVAL = 1.0
+# 'pool': 웹 프로세스의 프로세스 풀에서 실행, 'worker': `manage.py solver_worker`가 DB에서 가져가 실행
+SCHEDULE_JOB_BACKEND = 'pool'
+# solver_worker의 대기열 확인 간격 (초)
+SCHEDULE_WORKER_POLL_INTERVAL = 1.0
+# 실행 중인 작업이 생존 신호(heartbeat_at)를 기록하는 간격 (초)
+SCHEDULE_JOB_HEARTBEAT_INTERVAL = 10.0
+# 생존 신호가 이 시간(초) 이상 없는 RUNNING 작업은 실행하던 프로세스가 종료된 것으로 보고 다시 실행
+SCHEDULE_JOB_STALE_AFTER = 60.0
+# 계산 모듈(OR-Tools)을 wsgi/asgi 로딩 시 미리 불러옴 (gunicorn --preload처럼 fork 전에 한 번 불러올 때)
+# False이면 계산하는 요청에서 처음 사용할 때 불러옵니다.
+SCHEDULE_PRELOAD_SOLVER = False
+
+# Batch solve (/api/solve_schedule/batch/)
+
+# 한 요청에 포함할 수 있는 최대 항목 수
+SCHEDULE_BATCH_MAX_ITEMS = 100
+# 항목에 profile이 없을 때 사용할 프로필
+SCHEDULE_BATCH_PROFILE = 'throughput'
+
+# What-if sweep (/api/solve_schedule/sweep/, schedule/sweep.py)
+
+# 한 요청에서 계산할 수 있는 최대 변형 수 (sweep 값 목록의 데카르트 곱). profile은 일괄 계산과 같음
+SCHEDULE_SWEEP_MAX_VARIANTS = 64
+
+# Solver admission control (schedule/admission.py)
+# 웹 프로세스에서 바로 계산하는 요청(solve_schedule, stream, repair)에 적용합니다. 값은 프로세스별이며 0이면 제한 없음
+
+# 동시에 실행할 계산 수와 CP-SAT 탐색 스레드 합계 (요청의 스레드 수는 프로필의 num_search_workers, 0이면 코어 수)
+SCHEDULE_SOLVER_MAX_CONCURRENT = 2
+SCHEDULE_SOLVER_MAX_THREADS = os.cpu_count() or 2
+# 자리를 기다릴 수 있는 요청 수와 최대 대기 시간 (초). 초과하면 429 + Retry-After
+SCHEDULE_SOLVER_MAX_QUEUE = 8
+SCHEDULE_SOLVER_QUEUE_TIMEOUT = 30.0
+# 클라이언트(IP)별 요청 수 제한: per초에 requests개 (계산/작업 제출 API 전체, None이면 사용 안 함)
+SCHEDULE_RATE_LIMIT = {'requests': 60, 'per': 60.0}
+# 프록시 뒤에서 실행할 때 X-Forwarded-For의 첫 주소를 클라이언트 주소로 사용
+SCHEDULE_RATE_LIMIT_TRUST_FORWARDED = False
+
+# Schedule repair (/api/solve_schedule/repair/)
+
+# 부분 재계산의 CP-SAT 계산 시간 제한 (초)
+SCHEDULE_REPAIR_TIME_LIMIT = 1.0
+
+# Stored schedules (/api/teams/, /api/runs/)
+
+# 배정 목록 / 계산 결과 목록의 기본 페이지 크기와 최대 페이지 크기 (?limit)
+SCHEDULE_STORAGE_PAGE_SIZE = 500
+SCHEDULE_STORAGE_RUN_PAGE_SIZE = 50
+SCHEDULE_STORAGE_MAX_PAGE_SIZE = 5000
+
+# Alternative schedules (요청의 alternatives)
+
+# 대안 스케줄 하나당 CP-SAT 계산 시간 상한 (초). 실제 제한은 프로필의 time_limit과 이 값 중 작은 값
+SCHEDULE_ALTERNATIVE_TIME_LIMIT = 2.0
+
+# Infeasibility explanation
+
+# 요청에 explain이 있고 해가 없다고 증명되면 충돌하는 제약조건/고정 근무를 찾는 시간 제한 (초, 0이면 사용 안 함)
+# 실제 제한은 이 값과 요청의 계산 시간 중 남은 시간 중 작은 값이며, 걸린 시간은 stats['explain_seconds']
+SCHEDULE_EXPLAIN_TIME_LIMIT = 5.0
+
+# Multi-month planning (/api/horizon/)
+
+# 구간(window) 하나당 CP-SAT 계산 시간 상한 (초). 실제 제한은 프로필의 time_limit과 이 값 중 작은 값
+SCHEDULE_HORIZON_WINDOW_TIME_LIMIT = 10.0
+
+# Large rosters (/api/roster/, schedule/roster.py)
+
+# 팀 하나당 CP-SAT 계산 시간 상한 (초). 실제 제한은 프로필의 time_limit과 이 값 중 작은 값
+SCHEDULE_ROSTER_TEAM_TIME_LIMIT = 10.0
+# LNS 한 번(팀 일부를 다시 계산)의 계산 시간 (초)
+SCHEDULE_ROSTER_LNS_ITERATION_TIME = 1.0
+# 요청의 lns_time 상한 (초)
+SCHEDULE_ROSTER_MAX_LNS_TIME = 120.0
+# 팀별 계산을 동시에 실행할 프로세스 수 (작업 프로세스 안에서 실행되므로 SCHEDULE_JOB_MAX_WORKERS와 곱해짐)
+SCHEDULE_ROSTER_MAX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Rule configurations (schedule/plan.py)
+# 요청의 "rule_config" 값으로 선택합니다. 값은 규칙 설정 dict 또는 JSON 파일 경로이며,
+# rule_config가 없는 요청은 기본 규칙(DEFAULT_CONSTRAINTS)을 사용합니다.
+
+SCHEDULE_RULE_CONFIGS = {
+    # 주간/저녁/야간 3교대
+    'evening': {
+        'duties': [
+            {'name': 'OFF', 'hours': 0, 'type': 'off', 'color': '#FF7B7B'},
+            {'name': 'DAY', 'hours': 8, 'type': 'work', 'color': '#38AFFF'},
+            {'name': 'EVENING', 'hours': 8, 'type': 'work', 'color': '#9B7BFF'},
+            {'name': 'NIGHT', 'hours': 10, 'type': 'work', 'color': '#FFF064'},
+            {'name': 'VACATION', 'hours': 0, 'type': 'leave', 'color': '#B9B9B9'},
+        ],
+        'coverage': [
+            {'duty': 'DAY', 'min': 1, 'min_available': 3},
+            {'duty': 'EVENING', 'min': 1, 'min_available': 3},
+            {'duty': 'NIGHT', 'min': 1, 'max': 1},
+        ],
+        'rest': [
+            {'after': 'NIGHT', 'next': 'OFF', 'min_available': 2},
+        ],
+        'no_consecutive': ['OFF'],
+        'workload': {'min_work_days': 15, 'min_hours': 120, 'min_counts': {'NIGHT': 1}},
+        'objective': {'duty': 'DAY', 'weights': {'hours': 1, 'weekday': 8, 'holiday': 3, 'total_hours': 1}},
+    },
+}
+
+# Schedule result cache
+# 같은 입력의 계산 결과를 재사용합니다. 웹 프로세스와 작업 프로세스가 캐시를
+# 공유하려면 DatabaseCache(SQLite)를 CACHES에 등록하고
+# (python manage.py createcachetable) 아래처럼 설정합니다.
+#   'BACKEND': 'schedule.cache.DjangoResultCache',
+#   'OPTIONS': {'alias': 'schedule', 'ttl': 3600},
+
+SCHEDULE_RESULT_CACHE = {
+    'BACKEND': 'schedule.cache.LocMemResultCache',
+    'OPTIONS': {'max_entries': 256, 'ttl': 3600},
+}
+
+# Model template cache (schedule/templates.py)
+# 같은 모양(근무자 수, 일수, 주말/공휴일, 최대 근무시간, 규칙)의 모델을 한 번만 만들고 복제해 사용합니다.
+# 프로세스별 최대 템플릿 수와 템플릿 proto 직렬화 크기 합 (바이트). None이면 사용 안 함
+
+SCHEDULE_MODEL_TEMPLATE_CACHE = {'max_entries': 32, 'max_bytes': 64 * 1024 * 1024}
+
+# Solver telemetry
+# True이면 CP-SAT 검색 로그(log_search_progress)를 읽어 presolve 전/후 모델 크기를 telemetry에 기록하고,
+# 입력 presolve 전 제약조건 수(input_presolve.constraints_before)를 모델을 한 번 더 만들어 셉니다.
+# 모든 계산이 검색 로그 출력과 파싱, 추가 모델 생성 비용을 내므로 진단할 때만 켭니다.
+SCHEDULE_TELEMETRY_PRESOLVE_STATS = False
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "simple": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "simple"},
+    },
+    "loggers": {
+        "schedule": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ShiftWorkScheduler.settings")
 
 application = get_wsgi_application()
+
+# gunicorn --preload 등에서 fork 전에 계산 모듈을 한 번만 불러옴 (settings.SCHEDULE_PRELOAD_SOLVER)
+from django.conf import settings  # noqa: E402
+
+if settings.SCHEDULE_PRELOAD_SOLVER:
+    from schedule.jobs import preload_solver
+
+    preload_solver()
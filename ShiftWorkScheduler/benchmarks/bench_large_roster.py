@@ -0,0 +1,62 @@
+"""
+대규모 근무자 모드(schedule/roster.py)의 시간에 따른 해 품질
+
+    cd ShiftWorkScheduler
+    python -m benchmarks.bench_large_roster --workers 100 250 500 --lns-time 60 --team-time-limit 2
+
+인스턴스마다 팀별 계산(1단계)이 끝난 시점과 LNS 경과 시간 checkpoint마다 그때까지의 최선 목적함수 값을
+출력합니다. improve는 1단계 결과 대비 감소율입니다. 기본 규칙은 하루 NIGHT 1명을 모델 전체에 적용하므로
+수백 명을 한 모델로 풀면 해가 없어, 팀별로 규칙을 적용한 이 방식만 비교합니다.
+"""
+import argparse
+import time
+
+from schedule.roster import plan_roster
+
+from .instances import generate_instance
+
+
+def best_at(trajectory, elapsed):
+    """trajectory [(경과 시간, 목적함수 값)]에서 elapsed초까지의 최선 값"""
+    values = [value for at, value in trajectory if at <= elapsed]
+    return min(values) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[100, 250, 500])
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--fixed-density', type=float, default=0.02)
+    parser.add_argument('--team-size', type=int, default=10)
+    parser.add_argument('--team-time-limit', type=float, default=2.0)
+    parser.add_argument('--lns-time', type=float, default=60.0)
+    parser.add_argument('--lns-iteration-time', type=float, default=1.0)
+    parser.add_argument('--checkpoints', type=float, nargs='+', default=[5, 15, 30, 60])
+    parser.add_argument('--max-workers', type=int, default=1, help="팀별 계산 프로세스 수")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    checkpoints = [at for at in args.checkpoints if at < args.lns_time] + [args.lns_time]
+    header = ' '.join(f"{f'+{at:g}s':>8}" for at in checkpoints)
+    print(f"{'instance':<12} {'teams':>5} {'phase1(s)':>9} {'phase1':>8} {header} {'improve':>8} {'iters':>6}")
+    for num_workers in args.workers:
+        params = generate_instance(num_workers, args.days, fixed_density=args.fixed_density, seed=args.seed)['params']
+        start = time.perf_counter()
+        _, stats = plan_roster(
+            params, team_size=args.team_size, lns_time=args.lns_time, lns_iteration_time=args.lns_iteration_time,
+            team_time_limit=args.team_time_limit, max_workers=args.max_workers, seed=args.seed,
+        )
+        name = f'w{num_workers}-d{args.days}'
+        if 'objective' not in stats:
+            print(f"{name:<12} {stats['teams']:>5} 팀 {len(stats['failed_teams'])}개에서 해 없음", flush=True)
+            continue
+        phase1 = stats['phase1_seconds']
+        values = ' '.join(f"{best_at(stats['trajectory'], phase1 + at):>8}" for at in checkpoints)
+        improve = 1 - stats['objective'] / stats['phase1_objective']
+        print(f"{name:<12} {stats['teams']:>5} {phase1:>9.1f} {stats['phase1_objective']:>8} {values} "
+              f"{improve:>7.1%} {stats['lns_iterations']:>6}  ({time.perf_counter() - start:.0f}s)", flush=True)
+        print(f"{'':<12} terms {stats['terms']}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
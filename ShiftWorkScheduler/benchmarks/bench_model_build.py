@@ -0,0 +1,196 @@
+"""
+모델 생성 시간 비교: 기존 방식(dict + 규칙마다 generator 합계) vs 현재 ScheduleSolver
+
+    cd ShiftWorkScheduler
+    python -m benchmarks.bench_model_build --sizes 15x31 100x31 300x92
+
+계산(Solve)은 하지 않고, 변수 생성 + 제약조건 + 목적함수 반영까지의 시간만 측정합니다.
+두 방식이 만든 모델의 변수/제약조건 수도 함께 출력해 같은 모델인지 확인합니다.
+"""
+import argparse
+import time
+
+from ortools.sat.python import cp_model
+
+from schedule.rules import ALL_DUTIES_DICT, DAY, NIGHT, NUM_SHIFT, OFF, VACATION
+from schedule.solve import DEFAULT_CONSTRAINTS, ScheduleSolver, get_weekends, setObjective
+
+
+# ---------------------------------------------------------------------------
+# 기존 방식 (변경 전 solve.py / rules.py)
+# ---------------------------------------------------------------------------
+
+class LegacyModel:
+    def __init__(self, num_workers, num_days, fixed_assignments, weekends, holidays, max_monthly_hours):
+        self.num_workers = num_workers
+        self.num_days = num_days
+        self.all_workers = range(num_workers)
+        self.all_days = range(num_days)
+        self.all_shifts = range(NUM_SHIFT)
+        self.fixed_assignments = {(n, d - 1): s for (n, d), s in fixed_assignments.items()}
+        self.weekends = weekends
+        self.holidays = [h - 1 for h in holidays]
+        self.max_monthly_hours = max_monthly_hours
+        self.model = cp_model.CpModel()
+        self.shifts = {}
+        for n in self.all_workers:
+            for d in self.all_days:
+                for s in self.all_shifts:
+                    self.shifts[(n, d, s)] = self.model.NewBoolVar(f'shift_n{n}_d{d}_s{s}')
+
+    def build(self):
+        for rule in (legacyExactlyOne, legacyDailyShiftRequirements, legacyNightShiftRestRequirement,
+                     legacyFixedAssignments, legacyVacationRestrictions, legacyNoConsecutiveOffDays,
+                     legacyMonthlyWorkConstraints, legacyObjective):
+            rule(self)
+
+
+def legacyExactlyOne(self):
+    for n in self.all_workers:
+        for d in self.all_days:
+            self.model.AddExactlyOne(self.shifts[(n, d, s)] for s in self.all_shifts)
+
+
+def legacyDailyShiftRequirements(self):
+    for d in self.all_days:
+        available_workers = self.num_workers - sum(self.shifts[(n, d, VACATION)] for n in self.all_workers)
+        has_at_least_3_workers = self.model.NewBoolVar(f'has_at_least_3_workers_d{d}')
+        self.model.Add(available_workers >= 3).OnlyEnforceIf(has_at_least_3_workers)
+        self.model.Add(available_workers < 3).OnlyEnforceIf(has_at_least_3_workers.Not())
+        self.model.Add(sum(self.shifts[(n, d, DAY)] for n in self.all_workers) >= 1).OnlyEnforceIf(has_at_least_3_workers)
+        self.model.Add(sum(self.shifts[(n, d, NIGHT)] for n in self.all_workers) == 1)
+
+
+def legacyNightShiftRestRequirement(self):
+    for d in range(self.num_days - 1):
+        available_workers_next_day = self.num_workers - sum(self.shifts[(n, d + 1, VACATION)] for n in self.all_workers)
+        has_at_least_2_workers_next_day = self.model.NewBoolVar(f'has_at_least_2_workers_d{d+1}')
+        self.model.Add(available_workers_next_day >= 2).OnlyEnforceIf(has_at_least_2_workers_next_day)
+        self.model.Add(available_workers_next_day < 2).OnlyEnforceIf(has_at_least_2_workers_next_day.Not())
+        for n in self.all_workers:
+            self.model.AddImplication(self.shifts[(n, d, NIGHT)], self.shifts[(n, d + 1, OFF)]).OnlyEnforceIf(has_at_least_2_workers_next_day)
+
+
+def legacyFixedAssignments(self):
+    for (n, d), s in self.fixed_assignments.items():
+        self.model.Add(self.shifts[(n, d, s)] == 1)
+
+
+def legacyVacationRestrictions(self):
+    for n in self.all_workers:
+        for d in self.all_days:
+            if (n, d) not in self.fixed_assignments:
+                self.model.Add(self.shifts[(n, d, VACATION)] == 0)
+
+
+def legacyNoConsecutiveOffDays(self):
+    for n in self.all_workers:
+        for d in range(self.num_days - 1):
+            self.model.Add(self.shifts[(n, d, OFF)] + self.shifts[(n, d + 1, OFF)] <= 1)
+
+
+def legacyMonthlyWorkConstraints(self):
+    for n in self.all_workers:
+        total_work_hours = cp_model.LinearExpr.Sum([
+            self.shifts[(n, d, s)] * ALL_DUTIES_DICT[s].time
+            for d in self.all_days for s in [DAY, NIGHT]
+        ])
+        total_work_days = cp_model.LinearExpr.Sum([
+            self.shifts[(n, d, s)]
+            for d in self.all_days for s in [DAY, NIGHT]
+        ])
+        self.model.Add(total_work_days >= 15)
+        self.model.Add(total_work_hours >= 160)
+        self.model.Add(total_work_hours <= self.max_monthly_hours)
+        self.model.Add(cp_model.LinearExpr.Sum([self.shifts[(n, d, NIGHT)] for d in self.all_days]) >= 1)
+
+
+def legacyObjective(self):
+    worker_total_hours = []
+    worker_weekday_day_shifts = []
+    worker_holiday_day_shifts = []
+    all_holidays = set(self.weekends) | set(self.holidays)
+    for n in self.all_workers:
+        worker_total_hours.append(cp_model.LinearExpr.Sum([
+            self.shifts[(n, d, s)] * ALL_DUTIES_DICT[s].time for d in self.all_days for s in [DAY, NIGHT]
+        ]))
+        worker_weekday_day_shifts.append(cp_model.LinearExpr.Sum([
+            self.shifts[(n, d, DAY)] for d in self.all_days if d not in all_holidays
+        ]))
+        worker_holiday_day_shifts.append(cp_model.LinearExpr.Sum([
+            self.shifts[(n, d, DAY)] for d in self.all_days if d in all_holidays
+        ]))
+    max_h = self.model.NewIntVar(0, self.max_monthly_hours, 'max_hours')
+    min_h = self.model.NewIntVar(0, self.max_monthly_hours, 'min_hours')
+    self.model.AddMaxEquality(max_h, worker_total_hours)
+    self.model.AddMinEquality(min_h, worker_total_hours)
+    max_wd = self.model.NewIntVar(0, self.num_days, 'max_weekday_days')
+    min_wd = self.model.NewIntVar(0, self.num_days, 'min_weekday_days')
+    self.model.AddMaxEquality(max_wd, worker_weekday_day_shifts)
+    self.model.AddMinEquality(min_wd, worker_weekday_day_shifts)
+    max_hd = self.model.NewIntVar(0, self.num_days, 'max_holiday_days')
+    min_hd = self.model.NewIntVar(0, self.num_days, 'min_holiday_days')
+    self.model.AddMaxEquality(max_hd, worker_holiday_day_shifts)
+    self.model.AddMinEquality(min_hd, worker_holiday_day_shifts)
+    self.model.Minimize((max_h - min_h) + (max_wd - min_wd) * 8 + (max_hd - min_hd) * 3
+                        + cp_model.LinearExpr.Sum(worker_total_hours))
+
+
+# ---------------------------------------------------------------------------
+
+def make_instance(num_workers, num_days):
+    """근무자 10명마다 1명씩 4일 휴가를 넣은 인스턴스"""
+    fixed = {}
+    for n in range(0, num_workers, 10):
+        start = 1 + (n * 7) % max(1, num_days - 4)
+        fixed.update({(n, d): VACATION for d in range(start, start + 4)})
+    return {
+        'fixed_assignments': fixed,
+        'weekends': get_weekends(num_days, 0),
+        'holidays': [1],
+        'max_monthly_hours': 220 * max(1, num_days // 30),
+    }
+
+
+def build_legacy(num_workers, num_days, instance):
+    model = LegacyModel(num_workers, num_days, **instance)
+    model.build()
+    return model.model
+
+
+def build_current(num_workers, num_days, instance):
+    solver = ScheduleSolver(num_workers, num_days, constraints=DEFAULT_CONSTRAINTS, objectiveFunc=setObjective, **instance)
+    solver.build()
+    return solver.model
+
+
+def measure(build, num_workers, num_days, repeat):
+    instance = make_instance(num_workers, num_days)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        model = build(num_workers, num_days, instance)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    proto = model.Proto()
+    return best, len(proto.variables), len(proto.constraints)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', default=['15x31', '100x31', '300x92'],
+                        help='근무자수x일수 목록')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'legacy (s)':>11} {'current (s)':>12} {'speedup':>8} {'vars':>14} {'constraints':>16}")
+    for size in args.sizes:
+        num_workers, num_days = map(int, size.split('x'))
+        legacy = measure(build_legacy, num_workers, num_days, args.repeat)
+        current = measure(build_current, num_workers, num_days, args.repeat)
+        print(f"{size:>10} {legacy[0]:>11.3f} {current[0]:>12.3f} {legacy[0] / current[0]:>7.1f}x "
+              f"{legacy[1]:>6}/{current[1]:<7} {legacy[2]:>7}/{current[2]:<8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+모델 템플릿 캐시(schedule/templates.py) 사용 여부에 따른 모델 생성 시간 비교
+
+    cd ShiftWorkScheduler
+    python -m benchmarks.bench_model_templates --workers 10 30 100 --days 31 --repeat 20
+
+모양(근무자 수, 일수)마다 고정 근무만 다른 인스턴스를 repeat개 만들어, 템플릿 없이 /
+템플릿 캐시로 ScheduleSolver 생성과 build()까지의 시간을 잽니다 (계산은 하지 않음).
+템플릿의 첫 요청(miss)은 템플릿을 만드는 시간이 포함되므로 따로 출력합니다.
+"""
+import argparse
+import statistics
+import time
+
+from schedule.solve import build_solver
+from schedule.templates import TemplateCache
+
+from .instances import generate_instance
+
+
+def build_seconds(params, template_cache):
+    start = time.perf_counter()
+    solver = build_solver(params, template_cache=template_cache)
+    solver.build()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[10, 30, 100])
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--fixed-density', type=float, default=0.03)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'shape':<12} {'plain(ms)':>10} {'miss(ms)':>10} {'hit(ms)':>10} {'speedup':>8} {'template':>10}")
+    for num_workers in args.workers:
+        base = generate_instance(num_workers, args.days, fixed_density=0.0, seed=0)['params']
+        # 같은 모양(주말/공휴일 포함), 고정 근무만 다른 요청들
+        requests = [
+            dict(base, fixed_assignments=generate_instance(
+                num_workers, args.days, fixed_density=args.fixed_density, seed=seed)['params']['fixed_assignments'])
+            for seed in range(args.repeat)
+        ]
+        plain = statistics.median(build_seconds(params, None) for params in requests)
+        cache = TemplateCache()
+        miss = build_seconds(requests[0], cache)
+        hit = statistics.median(build_seconds(params, cache) for params in requests[1:])
+        print(f"{f'w{num_workers}-d{args.days}':<12} {plain * 1000:>10.1f} {miss * 1000:>10.1f} {hit * 1000:>10.1f} "
+              f"{plain / hit:>7.1f}x {cache.stats()['bytes'] // 1024:>8}KB", flush=True)
+
+
+if __name__ == '__main__':
+    main()
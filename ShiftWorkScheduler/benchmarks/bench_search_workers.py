@@ -0,0 +1,64 @@
+"""
+병렬 탐색 스레드 수에 따른 최적해 도달 시간 비교 (15명 / 31일)
+
+    cd ShiftWorkScheduler
+    python -m benchmarks.bench_search_workers --workers 1 2 4 8 16 --time-limit 60
+
+각 스레드 수마다 같은 문제를 풀고, 최종 상태와 목적함수 값,
+마지막으로 해가 개선된 시점(time_to_best), 전체 계산 시간을 출력합니다.
+"""
+import argparse
+
+from schedule.profiles import SolverProfile
+from schedule.solve import DEFAULT_CONSTRAINTS, ScheduleSolver, get_weekends, setObjective
+
+NUM_WORKERS = 15
+NUM_DAYS = 31
+START_DAY_OF_WEEK = 2
+HOLIDAYS = [1, 15]
+MAX_MONTHLY_HOURS = 220
+# 근무자 3명의 휴가 (1-based day)
+FIXED = {(0, d): 3 for d in range(5, 9)}
+FIXED.update({(4, d): 3 for d in range(12, 15)})
+FIXED.update({(9, d): 3 for d in range(20, 25)})
+
+
+def run(num_search_workers, time_limit, relative_gap_limit):
+    profile = SolverProfile(
+        f'workers={num_search_workers}',
+        num_search_workers=num_search_workers,
+        time_limit=time_limit,
+        relative_gap_limit=relative_gap_limit,
+    )
+    solver = ScheduleSolver(
+        NUM_WORKERS, NUM_DAYS,
+        fixed_assignments=FIXED,
+        weekends=get_weekends(NUM_DAYS, START_DAY_OF_WEEK),
+        holidays=HOLIDAYS,
+        max_monthly_hours=MAX_MONTHLY_HOURS,
+        constraints=DEFAULT_CONSTRAINTS,
+        objectiveFunc=setObjective,
+        profile=profile,
+    )
+    solver.solve()
+    return solver.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--time-limit', type=float, default=60.0)
+    parser.add_argument('--gap', type=float, default=0.0, help='relative_gap_limit')
+    args = parser.parse_args()
+
+    rows = [(w, run(w, args.time_limit, args.gap)) for w in args.workers]
+
+    print(f"\n{'workers':>8} {'status':>10} {'objective':>10} {'bound':>10} {'time_to_best':>13} {'wall_time':>10}")
+    for w, stats in rows:
+        time_to_best = f"{stats['time_to_best']:.2f}" if stats['time_to_best'] is not None else '-'
+        print(f"{w:>8} {stats['status']:>10} {stats['objective']:>10.0f} {stats['best_bound']:>10.0f} "
+              f"{time_to_best:>13} {stats['wall_time']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+웹 프로세스 시작 시간과 메모리 (URLconf 로딩, 계산 모듈 지연 로딩)
+
+    cd ShiftWorkScheduler
+    python -m benchmarks.bench_startup --repeat 5
+
+단계마다 새 Python 프로세스에서 측정합니다 (import 캐시 영향 없음).
+- urlconf : django.setup() + URLconf 로딩 (index만 처리하는 웹 프로세스, 관리 명령)
+- preload : 위 + jobs.preload_solver() (SCHEDULE_PRELOAD_SOLVER, solver_worker 시작)
+ms는 중앙값, RSS는 측정이 끝난 시점의 VmRSS입니다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = r'''
+import json, os, sys, time
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ShiftWorkScheduler.settings')
+start = time.perf_counter()
+import django
+django.setup()
+from django.urls import resolve
+resolve('/')
+if sys.argv[1] == 'preload':
+    from schedule.jobs import preload_solver
+    preload_solver()
+elapsed = time.perf_counter() - start
+rss = next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmRSS'))
+print(json.dumps({'ms': elapsed * 1000, 'rss_mb': rss / 1024,
+                  'ortools': 'ortools' in sys.modules, 'numpy': 'numpy' in sys.modules}))
+'''
+
+
+def probe(stage):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, '-c', PROBE, stage], cwd=root, check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'stage':<10} {'ms':>8} {'RSS(MB)':>8} {'ortools':>8} {'numpy':>6}")
+    for stage in ('urlconf', 'preload'):
+        runs = [probe(stage) for _ in range(args.repeat)]
+        print(f"{stage:<10} {statistics.median(run['ms'] for run in runs):>8.0f} "
+              f"{statistics.median(run['rss_mb'] for run in runs):>8.1f} "
+              f"{str(runs[-1]['ortools']):>8} {str(runs[-1]['numpy']):>6}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+대칭 제거(symmetry_breaking) 사용 여부에 따른 최적해 도달 시간 비교 (10~15명 / 31일)
+
+    cd ShiftWorkScheduler
+    python -m benchmarks.bench_symmetry_breaking --workers 10 12 15 --fixed-density 0 0.03 --time-limit 60
+
+같은 인스턴스(instances.generate_instance)를 대칭 제거 없이/사용해서 풀고, 입력이 같은
+근무자 그룹 크기, 최종 상태와 목적함수 값, 하한, time_to_best, 전체 계산 시간을 출력합니다.
+고정 근무가 적을수록 서로 바꿀 수 있는 근무자가 많아 차이가 커집니다.
+"""
+import argparse
+import itertools
+
+from schedule.profiles import SolverProfile
+from schedule.solve import build_solver
+
+from .instances import generate_instance
+
+
+def run(params, symmetry_breaking, args):
+    profile = SolverProfile(
+        'symmetry' if symmetry_breaking else 'baseline',
+        num_search_workers=args.search_workers,
+        time_limit=args.time_limit,
+        relative_gap_limit=args.gap,
+        symmetry_breaking=symmetry_breaking,
+    )
+    solver = build_solver(params, profile=profile)
+    solver.solve()
+    return solver
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, nargs='+', default=[10, 12, 15])
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--fixed-density', type=float, nargs='+', default=[0.0, 0.03])
+    parser.add_argument('--seeds', type=int, nargs='+', default=[0])
+    parser.add_argument('--time-limit', type=float, default=60.0)
+    parser.add_argument('--search-workers', type=int, default=0, help='CP-SAT num_workers (0이면 자동)')
+    parser.add_argument('--gap', type=float, default=0.0, help='relative_gap_limit')
+    args = parser.parse_args()
+
+    print(f"{'instance':<28} {'symmetry':>8} {'groups':>10} {'status':>10} {'objective':>10} {'bound':>10} "
+          f"{'time_to_best':>13} {'wall_time':>10}")
+    for num_workers, fixed_density, seed in itertools.product(args.workers, args.fixed_density, args.seeds):
+        instance = generate_instance(num_workers, args.days, fixed_density=fixed_density, seed=seed)
+        for symmetry_breaking in (False, True):
+            solver = run(instance['params'], symmetry_breaking, args)
+            stats = solver.stats
+            groups = '+'.join(str(len(group)) for group in solver.interchangeableGroups()) or '-'
+            time_to_best = f"{stats['time_to_best']:.2f}" if stats['time_to_best'] is not None else '-'
+            objective = f"{stats['objective']:.0f}" if stats['solutions'] else '-'
+            print(f"{instance['name']:<28} {'on' if symmetry_breaking else 'off':>8} {groups:>10} {stats['status']:>10} "
+                  f"{objective:>10} {stats['best_bound']:>10.0f} {time_to_best:>13} {stats['wall_time']:>10.2f}",
+                  flush=True)
+
+
+if __name__ == '__main__':
+    main()
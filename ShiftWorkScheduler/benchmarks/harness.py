@@ -0,0 +1,252 @@
+"""
+스케줄 계산 벤치마크 (인스턴스 생성 → 계산 → JSON/CSV 기록 → 비교)
+
+    cd ShiftWorkScheduler
+    # 미리 정의한 묶음(instances.SUITES) 실행
+    python -m benchmarks.harness run --suite default --time-limit 10 --output results/base.json
+    # 직접 지정: 근무자 수 / 일수 / 공휴일, 고정 근무 비율 / seed
+    python -m benchmarks.harness run --workers 5 15 30 --days 28 31 62 --fixed-density 0.05 --seeds 0 1 2 \
+        --output results/new.csv
+    # 제약조건 목록 변경 (rules.py의 함수 이름)
+    python -m benchmarks.harness run --suite smoke --without addNoConsecutiveOffDays --output results/no_off.json
+    # 입력 presolve 전/후 모델 크기 (variables, model_constraints 열)
+    python -m benchmarks.harness run --suite default --no-presolve --output results/no_presolve.json
+    # 계층형 목적함수 (항목:단계별 시간). objective 열은 가중합 목적함수 값
+    python -m benchmarks.harness run --suite smoke --objective-stages weekday:3 holiday:2 hours:3 total_hours:2
+    # 두 결과 비교 (인스턴스 이름 기준). 느려지거나 상태/목적함수가 나빠진 항목이 있으면 종료 코드 1
+    python -m benchmarks.harness compare results/base.json results/new.json --threshold 1.2
+
+Django 설정이나 네트워크 없이 실행됩니다. 결과의 label에는 기본으로 현재 git 커밋을 기록합니다.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import ortools
+
+from schedule import rules
+from schedule.profiles import SolverProfile
+from schedule.solve import DEFAULT_CONSTRAINTS, ScheduleSolver, get_weekends
+
+from .instances import SUITES, generate_suite
+
+FIELDS = [
+    'name', 'num_workers', 'num_days', 'seed', 'holidays', 'fixed', 'constraints',
+    'status', 'objective', 'best_bound', 'gap', 'build_seconds', 'solve_seconds',
+    'time_to_best', 'solutions', 'variables', 'model_constraints',
+]
+# 상태의 좋고 나쁨 (비교 시 낮아지면 회귀)
+STATUS_RANK = {'OPTIMAL': 3, 'FEASIBLE': 2, 'INFEASIBLE': 1, 'UNKNOWN': 0, 'MODEL_INVALID': -1}
+
+
+def git_label():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def resolve_constraints(names=None, without=()):
+    """rules.py의 함수 이름 목록 → 제약조건 함수 목록 (없으면 DEFAULT_CONSTRAINTS)"""
+    constraints = [getattr(rules, name) for name in names] if names else list(DEFAULT_CONSTRAINTS)
+    return [constraint for constraint in constraints if constraint.__name__ not in without]
+
+
+def run_instance(instance, constraints, objective, profile, presolve=True):
+    params = instance['params']
+    solver = ScheduleSolver(
+        params['num_workers'], params['num_days'],
+        fixed_assignments={(item['worker'], item['day']): item['shift'] for item in params['fixed_assignments']},
+        weekends=get_weekends(params['num_days'], params['start_day_of_week']),
+        holidays=params['holidays'],
+        max_monthly_hours=params['max_monthly_hours'],
+        constraints=constraints,
+        objectiveFunc=objective,
+        profile=profile,
+        presolve=presolve,
+    )
+    solver.solve()
+    stats = solver.stats
+    proto = solver.model.Proto()
+    objective_value = stats['objective'] if stats['solutions'] else None
+    gap = None
+    if objective_value is not None and stats['best_bound'] is not None:
+        gap = abs(objective_value - stats['best_bound']) / max(1.0, abs(objective_value))
+    return {
+        'name': instance['name'],
+        'num_workers': params['num_workers'],
+        'num_days': params['num_days'],
+        'seed': instance['seed'],
+        'holidays': len(params['holidays']),
+        'fixed': len(params['fixed_assignments']),
+        'constraints': ' '.join(constraint.__name__ for constraint in constraints),
+        'status': stats['status'],
+        'objective': objective_value,
+        'best_bound': stats['best_bound'],
+        'gap': gap,
+        'build_seconds': solver.telemetry['build_seconds'],
+        'solve_seconds': stats['wall_time'],
+        'time_to_best': stats['time_to_best'],
+        'solutions': stats['solutions'],
+        'variables': len(proto.variables),
+        'model_constraints': len(proto.constraints),
+    }
+
+
+def write_results(path, meta, rows):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['label'] + FIELDS)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow(dict(row, label=meta['label']))
+    else:
+        with open(path, 'w') as f:
+            json.dump({'meta': meta, 'results': rows}, f, indent=2, ensure_ascii=False)
+
+
+def read_results(path):
+    """write_results()가 만든 JSON/CSV → (meta, {name: row})"""
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            for field in ('objective', 'best_bound', 'gap', 'build_seconds', 'solve_seconds', 'time_to_best'):
+                row[field] = float(row[field]) if row[field] not in ('', None) else None
+        meta = {'label': rows[0]['label'] if rows else path}
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        meta, rows = data['meta'], data['results']
+    return meta, {row['name']: row for row in rows}
+
+
+def cmd_run(args):
+    if args.suite:
+        workers, days, holiday_density, fixed_density, seeds = SUITES[args.suite]
+    else:
+        workers, days, holiday_density, fixed_density, seeds = (
+            args.workers, args.days, args.holiday_density, args.fixed_density, args.seeds)
+    instances = generate_suite(workers, days, holiday_density, fixed_density, seeds)
+    constraints = resolve_constraints(args.constraints, args.without)
+    objective = getattr(rules, args.objective) if args.objective != 'none' else None
+    profile = SolverProfile(
+        'benchmark', num_search_workers=args.search_workers, time_limit=args.time_limit, relative_gap_limit=args.gap,
+        symmetry_breaking=args.symmetry_breaking,
+        objective_stages=[
+            (term, float(seconds)) for term, seconds in (stage.split(':') for stage in args.objective_stages)
+        ] if args.objective_stages else None,
+    )
+
+    meta = {
+        'label': args.label or git_label(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'ortools': ortools.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'profile': profile.to_dict(),
+        'objective': args.objective,
+        'presolve': not args.no_presolve,
+    }
+    rows = []
+    for instance in instances:
+        row = run_instance(instance, constraints, objective, profile, presolve=not args.no_presolve)
+        rows.append(row)
+        print(f"{row['name']:<28} {row['status']:>10} build={row['build_seconds']:.3f}s "
+              f"solve={row['solve_seconds']:.3f}s objective={row['objective']}", flush=True)
+    if args.output:
+        write_results(args.output, meta, rows)
+        print(f"\n{len(rows)}개 결과를 {args.output}에 기록했습니다.")
+
+
+def _ratio(new, base):
+    if new is None or base is None:
+        return None
+    return new / base if base > 0 else None
+
+
+def cmd_compare(args):
+    base_meta, base = read_results(args.base)
+    new_meta, new = read_results(args.new)
+    print(f"base: {base_meta['label']}  new: {new_meta['label']}\n")
+    print(f"{'instance':<28} {'status':>21} {'build x':>8} {'solve x':>8} {'objective':>21} {'gap':>13}")
+
+    regressions = 0
+    for name in sorted(base.keys() & new.keys()):
+        b, n = base[name], new[name]
+        build_ratio = _ratio(n['build_seconds'], b['build_seconds'])
+        solve_ratio = _ratio(n['solve_seconds'], b['solve_seconds'])
+        reasons = []
+        if STATUS_RANK.get(n['status'], 0) < STATUS_RANK.get(b['status'], 0):
+            reasons.append('status')
+        if b['objective'] is not None and (n['objective'] is None or n['objective'] > b['objective']):
+            reasons.append('objective')
+        # 아주 짧은 시간은 측정 오차가 크므로 min_seconds 이상일 때만 비교
+        if build_ratio and build_ratio > args.threshold and n['build_seconds'] >= args.min_seconds:
+            reasons.append('build')
+        if solve_ratio and solve_ratio > args.threshold and n['solve_seconds'] >= args.min_seconds:
+            reasons.append('solve')
+        regressions += bool(reasons)
+
+        fmt = lambda value, spec: format(value, spec) if value is not None else '-'
+        print(f"{name:<28} {b['status'] + ' -> ' + n['status']:>21} {fmt(build_ratio, '8.2f'):>8} "
+              f"{fmt(solve_ratio, '8.2f'):>8} {fmt(b['objective'], '.0f') + ' -> ' + fmt(n['objective'], '.0f'):>21} "
+              f"{fmt(n['gap'], '.4f'):>13}{'  REGRESSION: ' + ', '.join(reasons) if reasons else ''}")
+
+    only_base, only_new = base.keys() - new.keys(), new.keys() - base.keys()
+    if only_base or only_new:
+        print(f"\n한쪽에만 있는 인스턴스: base {sorted(only_base)}, new {sorted(only_new)}")
+    print(f"\n{len(base.keys() & new.keys())}개 비교, 회귀 {regressions}개 (threshold x{args.threshold})")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run = subparsers.add_parser('run', help='인스턴스를 생성해 계산하고 결과를 기록')
+    run.add_argument('--suite', choices=sorted(SUITES), help='미리 정의한 인스턴스 묶음 (지정 시 아래 인스턴스 옵션 무시)')
+    run.add_argument('--workers', type=int, nargs='+', default=[5, 10, 15])
+    run.add_argument('--days', type=int, nargs='+', default=[28, 31])
+    run.add_argument('--holiday-density', type=float, default=0.05)
+    run.add_argument('--fixed-density', type=float, default=0.03)
+    run.add_argument('--seeds', type=int, nargs='+', default=[0])
+    run.add_argument('--constraints', nargs='+', help='사용할 제약조건 함수 이름 (기본: DEFAULT_CONSTRAINTS)')
+    run.add_argument('--without', nargs='+', default=[], help='제외할 제약조건 함수 이름')
+    run.add_argument('--objective', default='setObjective', help="목적함수 이름 ('none'이면 실행 가능한 해만 탐색)")
+    run.add_argument('--time-limit', type=float, default=10.0)
+    run.add_argument('--search-workers', type=int, default=0, help='CP-SAT num_workers (0이면 자동)')
+    run.add_argument('--gap', type=float, default=0.0, help='relative_gap_limit')
+    run.add_argument('--symmetry-breaking', action='store_true', help='입력이 같은 근무자 간 대칭 제거')
+    run.add_argument('--objective-stages', nargs='+', metavar='TERM:SECONDS',
+                     help='계층형 목적함수 단계 (예: weekday:3 holiday:2 hours:3 total_hours:2)')
+    run.add_argument('--no-presolve', action='store_true', help='입력 presolve 없이 모든 근무 변수를 생성')
+    run.add_argument('--label', help='결과에 기록할 이름 (기본: git 커밋)')
+    run.add_argument('--output', help='결과 파일 (.json 또는 .csv)')
+
+    compare = subparsers.add_parser('compare', help='두 결과 파일 비교')
+    compare.add_argument('base')
+    compare.add_argument('new')
+    compare.add_argument('--threshold', type=float, default=1.2, help='이 배율보다 느려지면 회귀')
+    compare.add_argument('--min-seconds', type=float, default=0.05, help='이보다 짧은 시간은 비교하지 않음')
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        cmd_run(args)
+    else:
+        sys.exit(cmd_compare(args))
+
+
+if __name__ == '__main__':
+    main()
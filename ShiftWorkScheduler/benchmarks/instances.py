@@ -0,0 +1,82 @@
+"""
+벤치마크용 스케줄 설정 생성기
+
+같은 (근무자 수, 일수, 공휴일/고정 근무 비율, seed)이면 항상 같은 설정을 만듭니다.
+결과는 params_from_form()과 같은 형식이므로 build_solver(), cached_solve()에 그대로
+사용할 수 있습니다.
+"""
+import itertools
+import random
+
+from schedule.precheck import MIN_WORK_DAYS
+from schedule.rules import DAY, NIGHT, OFF, VACATION
+
+# 고정 근무 중 각 근무 종류의 비율 (휴가가 대부분)
+FIXED_SHIFT_WEIGHTS = {VACATION: 6, OFF: 2, DAY: 1, NIGHT: 1}
+
+# 미리 정의한 인스턴스 묶음: (근무자 수 목록, 일수 목록, 공휴일 비율, 고정 근무 비율, seed 목록)
+SUITES = {
+    'smoke': ([3, 5], [28], 0.03, 0.02, [0]),
+    'default': ([5, 10, 15], [28, 31], 0.05, 0.03, [0, 1]),
+    'large': ([15, 30, 60], [31, 62], 0.05, 0.03, [0]),
+}
+
+
+def instance_name(num_workers, num_days, holiday_density, fixed_density, seed):
+    return f"w{num_workers}-d{num_days}-h{holiday_density:g}-f{fixed_density:g}-s{seed}"
+
+
+def generate_instance(num_workers, num_days, holiday_density=0.05, fixed_density=0.03, seed=0, max_monthly_hours=None):
+    """
+    - holiday_density : 공휴일로 지정할 날의 비율
+    - fixed_density   : 고정 근무로 지정할 (근무자, 날짜) 칸의 비율
+    - max_monthly_hours : 없으면 31일당 220시간 (31일보다 긴 기간도 해가 있도록)
+    같은 날 야간 근무를 두 명 이상 고정하거나, 야간 근무 다음 날을 OFF가 아닌 근무로 고정하거나,
+    근무 가능한 날을 최소 근무일 아래로 줄이는 고정 근무는 만들지 않습니다.
+    (사전 검사에서 바로 걸리는 입력 제외)
+    """
+    rng = random.Random(f"{num_workers}-{num_days}-{holiday_density}-{fixed_density}-{seed}")
+    holidays = sorted(rng.sample(range(1, num_days + 1), round(num_days * holiday_density)))
+
+    cells = list(itertools.product(range(num_workers), range(1, num_days + 1)))
+    shifts, weights = zip(*FIXED_SHIFT_WEIGHTS.items())
+    fixed = {}
+    night_days = set()
+    off_days = {n: 0 for n in range(num_workers)}
+    for n, d in rng.sample(cells, round(len(cells) * fixed_density)):
+        shift = rng.choices(shifts, weights)[0]
+        if shift == NIGHT and (d in night_days or fixed.get((n, d + 1)) not in (None, OFF)):
+            continue
+        if shift != OFF and fixed.get((n, d - 1)) == NIGHT:
+            continue
+        if shift in (OFF, VACATION):
+            if off_days[n] >= num_days - MIN_WORK_DAYS - 1:
+                continue
+            if shift == OFF and (fixed.get((n, d - 1)) == OFF or fixed.get((n, d + 1)) == OFF):
+                continue
+            off_days[n] += 1
+        if shift == NIGHT:
+            night_days.add(d)
+        fixed[(n, d)] = shift
+
+    return {
+        'name': instance_name(num_workers, num_days, holiday_density, fixed_density, seed),
+        'seed': seed,
+        'params': {
+            'num_workers': num_workers,
+            'num_days': num_days,
+            'start_day_of_week': rng.randrange(7),
+            'max_monthly_hours': max_monthly_hours or round(220 * max(1, num_days / 31)),
+            'holidays': holidays,
+            'fixed_assignments': [
+                {'worker': n, 'day': d, 'shift': s} for (n, d), s in sorted(fixed.items())
+            ],
+        },
+    }
+
+
+def generate_suite(workers, days, holiday_density, fixed_density, seeds):
+    return [
+        generate_instance(w, d, holiday_density, fixed_density, seed)
+        for w, d, seed in itertools.product(workers, days, seeds)
+    ]
@@ -1,3 +1,41 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Assignment, SolveJob, SolveRun, Team, Worker, WorkerLedger
+
+
+@admin.register(SolveJob)
+class SolveJobAdmin(admin.ModelAdmin):
+    list_display = ("id", "kind", "status", "created_at", "started_at", "finished_at")
+    list_filter = ("status", "kind")
+    readonly_fields = ("params", "progress", "result", "error")
+
+
+@admin.register(Team)
+class TeamAdmin(admin.ModelAdmin):
+    list_display = ("name", "created_at")
+
+
+@admin.register(Worker)
+class WorkerAdmin(admin.ModelAdmin):
+    list_display = ("team", "index", "name")
+    list_filter = ("team",)
+
+
+@admin.register(SolveRun)
+class SolveRunAdmin(admin.ModelAdmin):
+    list_display = ("id", "team", "start_date", "num_days", "job", "created_at")
+    list_filter = ("team",)
+    readonly_fields = ("params", "stats")
+
+
+@admin.register(Assignment)
+class AssignmentAdmin(admin.ModelAdmin):
+    list_display = ("team", "date", "worker", "shift", "hours", "run")
+    list_filter = ("team", "shift")
+    raw_id_fields = ("run", "worker")
+
+
+@admin.register(WorkerLedger)
+class WorkerLedgerAdmin(admin.ModelAdmin):
+    list_display = ("worker", "hours", "night_count", "weekend_count", "holiday_count", "updated_at")
+    list_filter = ("worker__team",)
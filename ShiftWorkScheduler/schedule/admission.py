@@ -0,0 +1,283 @@
+"""
+계산 요청 허용 제어 (admission control)
+
+웹 프로세스 안에서 바로 계산하는 요청(/api/solve_schedule/, stream, repair)이 한꺼번에 들어와
+각자 모든 코어를 쓰는 CP-SAT 탐색을 시작하지 않도록 합니다.
+
+- SolverBudget: 동시에 실행하는 계산 수(SCHEDULE_SOLVER_MAX_CONCURRENT)와 탐색 스레드 합계
+  (SCHEDULE_SOLVER_MAX_THREADS)를 제한합니다. 자리가 없으면 최대 SCHEDULE_SOLVER_MAX_QUEUE개
+  요청이 SCHEDULE_SOLVER_QUEUE_TIMEOUT초까지 기다리고, 대기열이 가득 찼거나 시간이 지나면 429
+- RateLimiter: 클라이언트(IP)별 토큰 버킷 (SCHEDULE_RATE_LIMIT). 초과하면 429
+- admission_control: 위 두 가지를 적용하는 view 데코레이터. 429 응답에는 Retry-After를 붙입니다.
+  예약한 스레드 수는 request.solver_threads로 view에 전달하고, view는 이 값으로 계산합니다.
+  (cached_solve(max_threads=...), SolverProfile.limited)
+
+view는 모두 동기 함수이므로 WSGI(wsgi.py)와 ASGI(asgi.py) 어느 쪽에서 실행해도 같은 제한이
+적용됩니다. 제한은 프로세스별이므로 웹 프로세스를 여러 개 띄우면 그 수만큼 나눠 설정합니다.
+프로세스 풀에서 계산하는 작업 큐/일괄 계산은 SCHEDULE_JOB_MAX_WORKERS로 제한되므로 요청 수만 제한합니다.
+(프로세스마다 계산 하나씩 실행하므로 profile이 없으면 스레드 1개인 throughput 프로필을 사용합니다.
+SCHEDULE_BATCH_PROFILE, SCHEDULE_JOB_PROFILE)
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+
+from .profiles import get_profile
+from .telemetry import ADMISSION_REJECTED, SOLVER_SLOTS
+
+# Retry-After 추정에 쓰는 계산 시간 이동 평균의 가중치
+HOLD_SMOOTHING = 0.2
+# 이 수보다 많은 클라이언트를 기억하면 가득 찬(오래 요청이 없던) 버킷을 정리
+RATE_LIMIT_MAX_CLIENTS = 10000
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, message, retry_after, reason):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class SolverTicket:
+    """SolverBudget.acquire()로 받은 자리. release()는 여러 번 호출해도 한 번만 반영됩니다."""
+
+    def __init__(self, budget, threads):
+        self.budget = budget
+        self.threads = threads
+        self.started = time.monotonic()
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self.budget.release(self)
+
+
+class SolverBudget:
+    def __init__(self, max_concurrent=0, max_threads=0, max_queue=0, queue_timeout=0.0):
+        # 0이면 제한 없음
+        self.max_concurrent = max_concurrent
+        self.max_threads = max_threads
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.threads = 0
+        self.waiting = 0
+        self.hold_seconds = None
+        self._condition = threading.Condition()
+
+    def _fits(self, threads):
+        return ((not self.max_concurrent or self.active < self.max_concurrent)
+                and (not self.max_threads or self.threads + threads <= self.max_threads))
+
+    def retry_after(self):
+        """다시 시도할 때까지의 대략적인 시간 (최근 계산 시간의 이동 평균, 초)"""
+        return max(1, math.ceil(self.hold_seconds or 1))
+
+    def _report(self):
+        SOLVER_SLOTS.set(self.active, kind='active')
+        SOLVER_SLOTS.set(self.threads, kind='threads')
+        SOLVER_SLOTS.set(self.waiting, kind='waiting')
+
+    def acquire(self, threads):
+        """
+        계산 하나의 자리와 탐색 스레드 threads개를 예약합니다. (threads는 max_threads 이하로 맞춤)
+        자리가 없으면 queue_timeout초까지 기다리고, 대기열이 가득 찼거나 시간이 지나면 AdmissionRejected
+        """
+        threads = max(1, min(threads, self.max_threads) if self.max_threads else threads)
+        with self._condition:
+            if not self._fits(threads):
+                if self.waiting >= self.max_queue:
+                    raise AdmissionRejected("계산 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.",
+                                            self.retry_after(), 'queue_full')
+                self.waiting += 1
+                self._report()
+                deadline = time.monotonic() + self.queue_timeout
+                try:
+                    while not self._fits(threads):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise AdmissionRejected("계산 대기 시간이 초과되었습니다. 잠시 후 다시 시도해 주세요.",
+                                                    self.retry_after(), 'timeout')
+                        self._condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+            self.active += 1
+            self.threads += threads
+            self._report()
+        return SolverTicket(self, threads)
+
+    def release(self, ticket):
+        held = time.monotonic() - ticket.started
+        with self._condition:
+            self.active -= 1
+            self.threads -= ticket.threads
+            self.hold_seconds = held if self.hold_seconds is None else (
+                HOLD_SMOOTHING * held + (1 - HOLD_SMOOTHING) * self.hold_seconds)
+            self._report()
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    """클라이언트별 토큰 버킷: per초마다 requests개까지 (순간적으로 requests개까지 몰려도 허용)"""
+
+    def __init__(self, requests, per):
+        self.capacity = requests
+        self.rate = requests / per
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def check(self, client):
+        """요청을 허용하면 0, 아니면 다음 요청이 가능할 때까지의 시간 (초)"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(client, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[client] = (tokens, now)
+                return (1 - tokens) / self.rate
+            self._buckets[client] = (tokens - 1, now)
+            if len(self._buckets) > RATE_LIMIT_MAX_CLIENTS:
+                self._prune(now)
+        return 0
+
+    def _prune(self, now):
+        full = self.capacity / self.rate
+        for client, (_, updated) in list(self._buckets.items()):
+            if now - updated >= full:
+                del self._buckets[client]
+
+
+_budget = None
+_limiter = None
+_lock = threading.Lock()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_budget():
+    global _budget
+    with _lock:
+        if _budget is None:
+            _budget = SolverBudget(
+                max_concurrent=_setting('SCHEDULE_SOLVER_MAX_CONCURRENT', 0),
+                max_threads=_setting('SCHEDULE_SOLVER_MAX_THREADS', 0),
+                max_queue=_setting('SCHEDULE_SOLVER_MAX_QUEUE', 0),
+                queue_timeout=_setting('SCHEDULE_SOLVER_QUEUE_TIMEOUT', 0.0),
+            )
+        return _budget
+
+
+def get_rate_limiter():
+    """settings.SCHEDULE_RATE_LIMIT이 없으면 None (제한 없음)"""
+    global _limiter
+    config = _setting('SCHEDULE_RATE_LIMIT', None)
+    if not config:
+        return None
+    with _lock:
+        if _limiter is None:
+            _limiter = RateLimiter(config['requests'], config['per'])
+        return _limiter
+
+
+def client_address(request):
+    """요청한 클라이언트 주소. SCHEDULE_RATE_LIMIT_TRUST_FORWARDED이면 X-Forwarded-For의 첫 주소"""
+    if _setting('SCHEDULE_RATE_LIMIT_TRUST_FORWARDED', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def requested_threads(request):
+    """요청 본문의 profile로 계산할 때 사용할 탐색 스레드 수 (num_search_workers=0이면 코어 수)"""
+    try:
+        name = json.loads(request.body).get('profile')
+    except (ValueError, AttributeError):
+        name = None
+    try:
+        profile = get_profile(name or None)
+    except (KeyError, TypeError):
+        # 잘못된 profile은 view의 폼 검증에서 400으로 응답
+        profile = get_profile()
+    return profile.num_search_workers or os.cpu_count() or 1
+
+
+def rejected_response(error):
+    ADMISSION_REJECTED.inc(reason=error.reason)
+    response = JsonResponse({'status': 'error', 'message': error.message}, status=429)
+    response['Retry-After'] = str(math.ceil(error.retry_after))
+    return response
+
+
+class _ReleasingStream:
+    """
+    스트리밍 응답의 내용을 그대로 전달하고, 응답을 닫을 때 자리를 반환합니다.
+    WSGI 서버와 Django의 ASGI handler 모두 스트림이 끝나거나 클라이언트가 연결을 끊은 뒤
+    response.close()를 호출하고, close()가 있는 streaming_content는 그때 함께 닫힙니다.
+    """
+
+    def __init__(self, content, ticket):
+        self.content = content
+        self.ticket = ticket
+
+    def __iter__(self):
+        return iter(self.content)
+
+    def close(self):
+        self.ticket.release()
+
+
+class _AsyncReleasingStream(_ReleasingStream):
+    """async iterator 내용 (ASGI에서 streaming.AsyncProducerStream 등)"""
+
+    __iter__ = None
+
+    def __aiter__(self):
+        return aiter(self.content)
+
+
+def admission_control(solve=True):
+    """
+    view 데코레이터. 클라이언트별 요청 수를 제한하고, solve=True이면 계산 자리(SolverBudget)를
+    받은 뒤 view를 실행합니다. 예약한 탐색 스레드 수는 request.solver_threads로 전달합니다. 스트리밍 응답은 응답을 닫을 때(스트림이 끝났거나 연결이 끊긴 뒤) 자리를 반환합니다.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            limiter = get_rate_limiter()
+            if limiter is not None:
+                wait = limiter.check(client_address(request))
+                if wait:
+                    return rejected_response(AdmissionRejected(
+                        "요청이 너무 많습니다. 잠시 후 다시 시도해 주세요.", wait, 'rate_limit'))
+            if not solve:
+                return view(request, *args, **kwargs)
+
+            try:
+                ticket = get_budget().acquire(requested_threads(request))
+            except AdmissionRejected as e:
+                return rejected_response(e)
+            request.solver_threads = ticket.threads
+            try:
+                response = view(request, *args, **kwargs)
+                if response.streaming:
+                    stream_class = _AsyncReleasingStream if response.is_async else _ReleasingStream
+                    response.streaming_content = stream_class(response.streaming_content, ticket)
+                    return response
+            except BaseException:
+                ticket.release()
+                raise
+            ticket.release()
+            return response
+        return wrapper
+    return decorator
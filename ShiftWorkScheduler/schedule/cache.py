@@ -0,0 +1,273 @@
+"""
+동일한 계산 요청에 대한 결과 캐시
+
+캐시 키는 정규화한 입력값(params_from_form)과 제약조건/목적함수 목록의
+SHA-256 해시입니다. 백엔드는 settings.SCHEDULE_RESULT_CACHE로 선택합니다.
+- LocMemResultCache : 프로세스 내부 LRU + TTL
+- DjangoResultCache : Django 캐시 프레임워크 (DatabaseCache 사용 시 SQLite에 저장되어
+                      여러 프로세스가 공유)
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from . import telemetry
+from .plan import plan_for
+from .precheck import precheck
+from .profiles import get_profile
+from .solve import DEFAULT_CONSTRAINTS, build_solver, format_schedule, setObjective
+
+DEFAULT_RESULT_CACHE = {
+    'BACKEND': 'schedule.cache.LocMemResultCache',
+    'OPTIONS': {'max_entries': 256, 'ttl': 3600},
+}
+
+# 대안 스케줄의 목적함수 값 허용 범위 (첫 해 대비)
+DEFAULT_ALTERNATIVE_TOLERANCE = 0.05
+
+# 캐시하는 상태. OPTIMAL/INFEASIBLE은 증명된 결과이지만 FEASIBLE은 시간 제한(또는 프로필의 정체 조건)에서
+# 멈춘 결과이므로, 키에 프로필과 실제 계산 시간 제한을 포함해 같은 조건의 요청에만 사용
+CACHEABLE_STATUSES = ('OPTIMAL', 'FEASIBLE', 'INFEASIBLE')
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _func_name(func):
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def make_cache_key(params, constraints=DEFAULT_CONSTRAINTS, objective=setObjective, profile=None, alternatives=None,
+                   time_limit=None):
+    canonical = {
+        'num_workers': params['num_workers'],
+        'num_days': params['num_days'],
+        'start_day_of_week': params['start_day_of_week'],
+        'max_monthly_hours': params['max_monthly_hours'],
+        'holidays': sorted(set(params['holidays'])),
+        'fixed_assignments': sorted(
+            (item['worker'], item['day'], item['shift']) for item in params['fixed_assignments']
+        ),
+        'constraints': [_func_name(c) for c in constraints],
+        'objective': _func_name(objective) if objective else None,
+        # 설정 기반 규칙은 이름이 아니라 설정 내용의 해시로 구분 (설정이 바뀌면 다른 키)
+        'rule_config': plan_for(params).fingerprint if params.get('rule_config') else None,
+        # 프로필마다 탐색 시간/종료 조건이 달라 결과의 품질이 다를 수 있음
+        'profile': profile,
+        # 실제 계산 시간 제한 (max_time_limit으로 줄어든 계산의 FEASIBLE 결과를 더 긴 계산에 사용하지 않음)
+        'time_limit': time_limit,
+        # 대안 스케줄 요청 (개수, 목적함수 허용 범위, 최소 차이)
+        'alternatives': alternatives,
+        # 누적값 사용(use_ledger): 근무자별 누적값이 바뀌면 다른 키
+        'ledger': params.get('ledger'),
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'))
+    return 'schedule:' + hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def make_hint_key(params):
+    """warm start용 '마지막 결과' 키. 스케줄의 형태(근무자 수, 일수, 시작 요일)만 사용합니다."""
+    shape = (params['num_workers'], params['num_days'], params['start_day_of_week'])
+    return 'schedule:last:' + hashlib.sha256(repr(shape).encode('utf-8')).hexdigest()
+
+
+class LocMemResultCache:
+    """프로세스 내부 LRU 캐시. ttl(초)이 지난 항목은 조회 시 제거됩니다."""
+
+    def __init__(self, max_entries=256, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class DjangoResultCache:
+    """settings.CACHES[alias]를 사용하는 캐시. LRU/TTL 정책은 해당 캐시 백엔드를 따릅니다."""
+
+    def __init__(self, alias='default', ttl=3600):
+        from django.core.cache import caches
+        self._backend = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key):
+        return self._backend.get(key)
+
+    def set(self, key, value):
+        self._backend.set(key, value, timeout=self.ttl or None)
+
+    def clear(self):
+        self._backend.clear()
+
+
+def get_result_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = getattr(settings, 'SCHEDULE_RESULT_CACHE', DEFAULT_RESULT_CACHE)
+            _cache = import_string(config['BACKEND'])(**config.get('OPTIONS', {}))
+    return _cache
+
+
+def result_key(params, profile=None, time_limit=None, max_time_limit=None,
+               alternatives=0, alternative_tolerance=None, alternative_min_distance=None):
+    """
+    cached_solve()가 결과를 저장하는 캐시 키. lookup()도 같은 키로 조회합니다.
+    time_limit이 None이면 프로필의 시간 제한, max_time_limit이 있으면 프로필의 시간 제한과 그중 작은 값
+    """
+    solver_profile = get_profile(profile)
+    if max_time_limit is not None:
+        time_limit = min(solver_profile.time_limit, max_time_limit)
+    elif time_limit is None:
+        time_limit = solver_profile.time_limit
+    if alternatives:
+        alternative_tolerance = DEFAULT_ALTERNATIVE_TOLERANCE if alternative_tolerance is None else alternative_tolerance
+        alternative_options = [alternatives, alternative_tolerance, alternative_min_distance]
+    else:
+        alternative_options = None
+    return make_cache_key(params, profile=solver_profile.name, alternatives=alternative_options, time_limit=time_limit)
+
+
+def lookup(params, profile=None, max_time_limit=None, alternatives=0, alternative_tolerance=None,
+           alternative_min_distance=None):
+    """계산 없이 캐시만 조회합니다. 인자는 cached_solve()와 같습니다. (profile이 None이면 기본 프로필)"""
+    return get_result_cache().get(result_key(
+        params, profile, max_time_limit=max_time_limit, alternatives=alternatives,
+        alternative_tolerance=alternative_tolerance, alternative_min_distance=alternative_min_distance,
+    ))
+
+
+def cached_solve(params, hint=None, warm_start=False, profile=None, max_time_limit=None, max_threads=None, record=True,
+                 alternatives=0, alternative_tolerance=None, alternative_min_distance=None, explain=False, **solver_kwargs):
+    """
+    캐시를 먼저 조회하고, 없으면 계산 후 저장합니다.
+    - hint           : 초기 해로 사용할 이전 스케줄
+    - warm_start     : hint가 없으면 같은 형태의 마지막 결과를 초기 해로 사용
+    - profile        : solver 프로필 이름 (None이면 기본 프로필)
+    - max_time_limit : 프로필의 시간 제한과 관계없이 적용할 상한 (초)
+    - max_threads    : 프로필의 num_search_workers와 관계없이 적용할 탐색 스레드 수 상한
+                       (admission_control이 예약한 스레드 수, SolverProfile.limited)
+    - record         : 결과를 이 프로세스의 지표(telemetry)에 반영. 프로세스 풀에서는
+                       False로 호출하고 결과를 받은 쪽에서 record_solve()를 호출합니다.
+    - alternatives   : 해를 찾은 뒤 같은 모델에서 추가로 찾을 대안 스케줄 수
+                       (ScheduleSolver.solveAlternatives, entry['alternatives'])
+    - explain        : CP-SAT가 해가 없다고 증명하면 충돌하는 제약조건/고정 근무를 찾음 (explain_infeasibility)
+    반환값: ({'schedule': {...} 또는 None, 'stats': {...}, 'telemetry': {...}}, 캐시 사용 여부)
+    사전 검사(precheck)에서 해가 없다고 판단하면 항상, CP-SAT가 증명하면 explain일 때
+    entry['conflicts']에 충돌하는 제약조건/고정 근무 목록이 포함됩니다.
+    """
+    solver_profile = get_profile(profile).limited(max_threads)
+
+    # 입력만으로 해가 없음이 분명하면 CP-SAT를 호출하지 않음
+    start = time.perf_counter()
+    conflicts = precheck(params)
+    if conflicts:
+        entry = {
+            'schedule': None,
+            'stats': {'status': 'INFEASIBLE', 'precheck': True, 'objective': None, 'best_bound': None,
+                      'wall_time': time.perf_counter() - start, 'solutions': 0, 'profile': solver_profile.name},
+            'telemetry': {},
+            'conflicts': conflicts,
+        }
+        if record:
+            telemetry.record_solve(entry, False)
+        return entry, False
+    if max_time_limit is not None:
+        solver_kwargs['time_limit'] = min(solver_profile.time_limit, max_time_limit)
+    if alternatives and alternative_tolerance is None:
+        alternative_tolerance = DEFAULT_ALTERNATIVE_TOLERANCE
+
+    cache = get_result_cache()
+    key = result_key(params, solver_profile.name, time_limit=solver_kwargs.get('time_limit'), alternatives=alternatives,
+                     alternative_tolerance=alternative_tolerance, alternative_min_distance=alternative_min_distance)
+    entry = cache.get(key)
+    if entry is not None:
+        if explain and entry['stats']['status'] == 'INFEASIBLE' and 'conflicts' not in entry:
+            # explain 없이 계산해 저장된 결과: 충돌 목록만 찾아 다시 저장
+            entry = _with_conflicts(entry, params, solver_kwargs.get('time_limit', solver_profile.time_limit))
+            cache.set(key, entry)
+        if record:
+            telemetry.record_solve(entry, True)
+        return entry, True
+
+    hint_key = make_hint_key(params)
+    if hint is None and warm_start:
+        hint = cache.get(hint_key)
+
+    solver_kwargs.setdefault('collect_presolve_stats', getattr(settings, 'SCHEDULE_TELEMETRY_PRESOLVE_STATS', False))
+    solver = build_solver(params, hint=hint, profile=solver_profile, **solver_kwargs)
+    schedule_result = solver.solve()
+    entry = {
+        'schedule': format_schedule(schedule_result) if schedule_result else None,
+        'stats': dict(solver.stats, warm_start=hint is not None),
+        'telemetry': solver.telemetry,
+    }
+    if alternatives and schedule_result:
+        start = time.perf_counter()
+        found = solver.solveAlternatives(
+            alternatives, alternative_tolerance, alternative_min_distance,
+            time_limit=min(solver.time_limit, getattr(settings, 'SCHEDULE_ALTERNATIVE_TIME_LIMIT', 2.0)),
+        )
+        entry['alternatives'] = [dict(item, schedule=format_schedule(item['schedule'])) for item in found]
+        entry['stats']['alternatives_seconds'] = time.perf_counter() - start
+    if explain and solver.status_name == 'INFEASIBLE':
+        # 충돌 설명은 계산의 남은 시간 안에서 실행
+        entry = _with_conflicts(entry, params, solver.time_limit - solver.stats['wall_time'])
+    if record:
+        telemetry.record_solve(entry, False)
+    # 사용자가 중간에 취소한 결과는 캐시하지 않음
+    if solver.status_name in CACHEABLE_STATUSES and not solver.cancelled:
+        cache.set(key, entry)
+    if entry['schedule']:
+        cache.set(hint_key, entry['schedule'])
+    return entry, False
+
+
+def _with_conflicts(entry, params, time_limit):
+    """entry에 충돌 목록(conflicts)과 걸린 시간(stats['explain_seconds'])을 더한 사본"""
+    start = time.perf_counter()
+    conflicts = explain_infeasibility(params, time_limit)
+    return dict(entry, conflicts=conflicts, stats=dict(entry['stats'], explain_seconds=time.perf_counter() - start))
+
+
+def explain_infeasibility(params, time_limit=None):
+    """
+    해가 없다고 증명된 입력에서 충돌하는 제약조건/고정 근무 목록을 가능한 한 줄여서 찾습니다 (시간 안에 판정하지 못한 항목은 남음).
+    시간 제한은 time_limit과 settings.SCHEDULE_EXPLAIN_TIME_LIMIT 중 작은 값입니다.
+    """
+    limit = getattr(settings, 'SCHEDULE_EXPLAIN_TIME_LIMIT', 5.0)
+    if time_limit is not None:
+        limit = min(limit, time_limit)
+    if limit <= 0:
+        return []
+    solver = build_solver(params, explain=True, time_limit=limit)
+    solver.solve()
+    return solver.conflicts or []
@@ -0,0 +1,32 @@
+"""
+기본 근무 종류 (OFF/DAY/NIGHT/VACATION)
+
+폼 검증, 사전 검사(precheck.py), 저장(storage.py)처럼 OR-Tools가 필요 없는 모듈이 rules.py 대신 사용합니다.
+"""
+
+class Duty:
+    def __init__(self, name, code, time, color, type='work'):
+        self.name = name
+        self.code = code
+        self.time = time
+        self.color = color
+        # work: 근무 시간에 포함, off: 휴무, leave: 고정 근무로만 배정 (plan.py)
+        self.type = type
+
+ALL_DUTIES = [
+    Duty("OFF", 0, 0, "#FF7B7B", "off"),
+    Duty("DAY", 1, 10, "#38AFFF"),
+    Duty("NIGHT", 2, 14, "#FFF064"),
+    Duty("VACATION", 3, 0, "#B9B9B9", "leave")
+]
+NUM_SHIFT = len(ALL_DUTIES)
+DUTIES_CODE = {duty.name: duty.code for duty in ALL_DUTIES}
+ALL_DUTIES_DICT = {duty.code: duty for duty in ALL_DUTIES}
+
+OFF = DUTIES_CODE["OFF"]
+DAY = DUTIES_CODE["DAY"]
+NIGHT = DUTIES_CODE["NIGHT"]
+VACATION = DUTIES_CODE["VACATION"]
+
+# 근무 시간에 포함되는 근무
+WORK_SHIFTS = [DAY, NIGHT]
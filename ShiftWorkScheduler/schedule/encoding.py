@@ -0,0 +1,133 @@
+"""
+스케줄 행렬 표현과 압축 응답 형식
+
+스케줄은 내부적으로 (근무자 × 날짜) uint8 근무 코드 행렬입니다. API 기본 응답은
+기존과 같은 {"worker_0": [codes...], ...} JSON이고, Accept 헤더로 다음 형식을 고를 수 있습니다.
+
+- application/vnd.shiftwork.schedule+json : schedule 값이 아래 packed 형식을 base64로 담은 객체
+      {"encoding": "sws1", "workers": W, "days": D, "bits": b, "data": "<base64>"}
+- application/vnd.shiftwork.schedule      : packed 형식 바이너리 (본문은 스케줄만, 나머지 값은
+                                            X-Schedule-Meta 헤더의 JSON)
+
+packed 형식 (sws1): b"SWS" + 버전(1) + bits(1) + workers(uint16 LE) + days(uint16 LE) + 본문.
+본문은 행렬을 행 우선으로 펼쳐 칸마다 bits비트(근무 종류 수를 담을 수 있는 최소 비트)씩
+큰 비트부터 채운 것입니다 (numpy.packbits).
+"""
+import base64
+import json
+import struct
+
+# numpy dtype 이름. numpy는 행렬을 다룰 때 불러옴 (기본 JSON 응답만 하는 웹 프로세스는 불러오지 않음)
+SCHEDULE_DTYPE = 'uint8'
+
+JSON = 'application/json'
+PACKED_JSON = 'application/vnd.shiftwork.schedule+json'
+PACKED_BINARY = 'application/vnd.shiftwork.schedule'
+MEDIA_TYPES = [JSON, PACKED_JSON, PACKED_BINARY]
+
+_MAGIC = b'SWS'
+_VERSION = 1
+_HEADER = struct.Struct('<3sBBHH')
+
+
+def schedule_to_matrix(schedule_data):
+    """{worker: [codes]} 또는 {"worker_N": [...]} → (근무자 × 날짜) uint8 행렬 (근무자 번호 순)"""
+    import numpy as np
+
+    rows = sorted(
+        (int(worker.rsplit('_', 1)[-1]) if isinstance(worker, str) else worker, codes)
+        for worker, codes in schedule_data.items()
+    )
+    return np.array([codes for _, codes in rows], dtype=SCHEDULE_DTYPE)
+
+
+def matrix_to_schedule(matrix):
+    """행렬 → API 형식 {"worker_0": [codes...], ...}"""
+    return {f"worker_{n}": codes for n, codes in enumerate(matrix.tolist())}
+
+
+def bits_for(matrix):
+    return max(1, int(matrix.max(initial=0)).bit_length())
+
+
+def pack_matrix(matrix):
+    """행렬 → sws1 바이트열"""
+    import numpy as np
+
+    matrix = np.asarray(matrix, dtype=SCHEDULE_DTYPE)
+    workers, days = matrix.shape
+    bits = bits_for(matrix)
+    # 칸마다 8비트로 펼친 뒤 하위 bits비트만 남겨 다시 묶음
+    cells = np.unpackbits(matrix.reshape(-1, 1), axis=1)[:, 8 - bits:]
+    return _HEADER.pack(_MAGIC, _VERSION, bits, workers, days) + np.packbits(cells).tobytes()
+
+
+def unpack_matrix(data):
+    """sws1 바이트열 → 행렬. 형식이 틀리면 ValueError"""
+    import numpy as np
+
+    magic, version, bits, workers, days = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("sws1 형식의 스케줄이 아닙니다.")
+    cells = np.unpackbits(np.frombuffer(data, dtype=np.uint8, offset=_HEADER.size), count=workers * days * bits)
+    cells = cells.reshape(-1, bits)
+    padded = np.zeros((workers * days, 8), dtype=np.uint8)
+    padded[:, 8 - bits:] = cells
+    return np.packbits(padded, axis=1).reshape(workers, days)
+
+
+def encode_packed(matrix):
+    """행렬 → PACKED_JSON 응답의 schedule 값"""
+    packed = pack_matrix(matrix)
+    _, _, bits, workers, days = _HEADER.unpack_from(packed)
+    return {'encoding': 'sws1', 'workers': workers, 'days': days, 'bits': bits,
+            'data': base64.b64encode(packed).decode('ascii')}
+
+
+def decode_packed(value):
+    """encode_packed()의 값 → 행렬"""
+    return unpack_matrix(base64.b64decode(value['data']))
+
+
+def preferred_type(request):
+    """Accept 헤더에 따른 응답 형식 (지정하지 않으면 JSON)"""
+    return request.get_preferred_type(MEDIA_TYPES) or JSON
+
+
+def encode_schedule(schedule_data, media_type):
+    """API 형식 스케줄을 media_type에 맞는 값으로 (JSON이면 그대로)"""
+    if schedule_data is None or media_type == JSON:
+        return schedule_data
+    return encode_packed(schedule_to_matrix(schedule_data))
+
+
+def schedule_response(request, data, status=200, container=None):
+    """
+    data['schedule']을 Accept 헤더에 맞춰 인코딩한 응답.
+    바이너리 형식은 스케줄이 있을 때만 사용하고, 나머지 값은 X-Schedule-Meta 헤더로 보냅니다.
+    container를 주면 data[container]['schedule']을 인코딩합니다. (바이너리 대신 PACKED_JSON)
+    """
+    from django.http import HttpResponse, JsonResponse
+
+    media_type = preferred_type(request)
+    target = data[container] if container else data
+    schedule_data = target.get('schedule')
+    if media_type != JSON and target.get('alternatives'):
+        # 대안 스케줄(alternatives)은 형식과 관계없이 PACKED_JSON 값으로
+        target['alternatives'] = [
+            dict(alternative, schedule=encode_schedule(alternative['schedule'], PACKED_JSON))
+            for alternative in target['alternatives']
+        ]
+    if media_type == PACKED_BINARY and schedule_data and not container:
+        response = HttpResponse(pack_matrix(schedule_to_matrix(schedule_data)), content_type=PACKED_BINARY, status=status)
+        meta = {key: value for key, value in data.items() if key != 'schedule'}
+        response['X-Schedule-Meta'] = json.dumps(meta, separators=(',', ':'))
+    elif media_type != JSON:
+        if 'schedule' in target:
+            target['schedule'] = encode_schedule(schedule_data, PACKED_JSON)
+        response = JsonResponse(data, status=status)
+        response['Content-Type'] = PACKED_JSON
+    else:
+        response = JsonResponse(data, status=status)
+    response['Vary'] = 'Accept'
+    return response
@@ -1,5 +1,79 @@
 from django import forms
 import json, ast
+from .plan import get_plan, rule_config_names
+from .profiles import profile_names
+from .duties import ALL_DUTIES_DICT
+from .precheck import check_assignments
+from .storage import ledger_offsets
+
+
+def _parse_literal(data, name):
+    """표준 JSON(쌍따옴표)을 먼저 시도하고, 실패하면 Python 리터럴(홑따옴표 등)로 파싱합니다."""
+    try:
+        return json.loads(data)
+    except json.JSONDecodeError:
+        try:
+            return ast.literal_eval(data)
+        except (ValueError, SyntaxError):
+            raise forms.ValidationError(f"잘못된 JSON 형식의 {name} 데이터입니다. (쌍따옴표와 홑따옴표 모두 파싱 실패)")
+
+
+def parse_assignments(data, name):
+    """
+    [{"worker": n, "day": d, "shift": s}, ...] 문자열을 {(n, d): s}로 변환합니다.
+    (day는 1-based 그대로 유지)
+    """
+    if not data:
+        return {} # solver는 빈 딕셔너리를 기대
+
+    parsed_data = _parse_literal(data, name)
+    if not isinstance(parsed_data, list):
+        raise forms.ValidationError(f"{name}는 딕셔너리(객체)의 리스트(배열) 형태여야 합니다.")
+
+    final_assignments = {}
+    try:
+        for item in parsed_data:
+            if not isinstance(item, dict):
+                raise ValueError(f"{name} 항목이 딕셔너리(객체)가 아닙니다.")
+
+            # get()을 사용해 안전하게 키에 접근
+            n = item.get('worker')
+            d = item.get('day')
+            s = item.get('shift')
+
+            # 키 존재 및 타입 검증
+            if n is None or d is None or s is None:
+                raise ValueError(f"항목에 'worker', 'day', 'shift' 키가 모두 필요합니다: {item}")
+
+            if not all(isinstance(val, int) for val in [n, d, s]):
+                raise ValueError(f"worker, day, shift 값은 모두 숫자여야 합니다: {item}")
+
+            # solve.py가 요구하는 튜플 key로 변환
+            final_assignments[(n, d)] = s
+
+        return final_assignments
+
+    except (ValueError, TypeError, SyntaxError) as e:
+        raise forms.ValidationError(f"{name} 데이터 처리 중 오류: {e}")
+
+
+def parse_schedule(data, name):
+    """
+    {"worker_0": [1, 2, 0, ...], ...} 형태의 스케줄을 파싱합니다.
+    solve() 결과와 같은 {0: [...]} 형태(숫자 key)도 허용합니다.
+    """
+    if not data:
+        return None
+
+    parsed_data = _parse_literal(data, name)
+    if not isinstance(parsed_data, dict):
+        raise forms.ValidationError(f"{name}는 근무자별 근무 코드 리스트의 딕셔너리(객체)여야 합니다.")
+
+    for worker, codes in parsed_data.items():
+        if not isinstance(codes, list) or not all(isinstance(code, int) for code in codes):
+            raise forms.ValidationError(f"근무 코드 리스트는 숫자만 포함해야 합니다: {worker}")
+    return parsed_data
+
 
 class ScheduleSettingsForm(forms.Form):
     num_workers = forms.IntegerField(
@@ -35,6 +109,75 @@ class ScheduleSettingsForm(forms.Form):
         empty_value="[]"
     )
 
+    # 이전 계산 결과를 초기 해로 사용 (warm start)
+    warm_start = forms.BooleanField(
+        required=False,
+        label="같은 설정의 마지막 결과를 초기 해로 사용"
+    )
+    hint_schedule = forms.CharField(
+        required=False,
+        label="초기 해 (e.g., {\"worker_0\": [1, 2, 0, ...]})"
+    )
+
+    # solver 프로필 (settings.SCHEDULE_SOLVER_PROFILES), 비워두면 기본 프로필
+    profile = forms.CharField(
+        required=False,
+        label="계산 프로필 (e.g., interactive, batch)"
+    )
+
+    # 설정 기반 근무 종류/규칙 (settings.SCHEDULE_RULE_CONFIGS), 비워두면 기본 규칙
+    rule_config = forms.CharField(
+        required=False,
+        label="규칙 설정 (e.g., evening)"
+    )
+
+    # 같은 모델에서 대안 스케줄을 추가로 찾음 (목적함수 허용 범위, 서로 다른 칸 수)
+    alternatives = forms.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=4,
+        label="추가로 찾을 대안 스케줄 수"
+    )
+    alternative_tolerance = forms.FloatField(
+        required=False,
+        min_value=0.0,
+        max_value=1.0,
+        label="대안 스케줄의 목적함수 허용 범위 (e.g., 0.05 = 5%)"
+    )
+    alternative_min_distance = forms.IntegerField(
+        required=False,
+        min_value=1,
+        label="대안 스케줄 간 최소 차이 (근무자-날짜 칸 수)"
+    )
+
+    # 해가 없다고 증명되면 충돌하는 제약조건/고정 근무를 찾아 conflicts로 반환 (계산 시간 안에서 추가 계산)
+    explain = forms.BooleanField(
+        required=False,
+        label="해가 없으면 충돌 원인 찾기"
+    )
+
+    # 응답에 모델 생성/계산 계측 정보(telemetry)를 포함
+    include_telemetry = forms.BooleanField(
+        required=False,
+        label="응답에 계측 정보 포함"
+    )
+
+    # 결과를 팀 스케줄로 저장 (storage.py). team을 주면 start_date도 필요
+    team = forms.CharField(
+        required=False,
+        max_length=64,
+        label="저장할 팀 이름"
+    )
+    start_date = forms.DateField(
+        required=False,
+        label="스케줄 시작 날짜 (e.g., 2026-11-01)"
+    )
+    # 팀의 지난 스케줄까지의 누적값(WorkerLedger)을 포함해 근무시간, 야간/주말/공휴일 근무를 맞춤
+    use_ledger = forms.BooleanField(
+        required=False,
+        label="팀의 누적 근무 기록으로 공정성 계산"
+    )
+
     def clean_holidays(self):
         """
         CharField로 받은 문자열(data)을 json.loads()로 파싱합니다.
@@ -62,48 +205,144 @@ class ScheduleSettingsForm(forms.Form):
             raise forms.ValidationError("공휴일 데이터 파싱 중 타입 오류가 발생했습니다.")
 
     def clean_fixed_assignments(self):
-        data = self.cleaned_data['fixed_assignments']
-        if not data:
-            return {} # solver는 빈 딕셔너리를 기대
-            
-        parsed_data = None
-        try:
-            # 1. 표준 JSON (쌍따옴표) 파싱 시도
-            parsed_data = json.loads(data)
-        except json.JSONDecodeError:
-            # 2. JSON 파싱 실패 시, Python 리터럴(홑따옴표 등) 파싱 시도
-            try:
-                parsed_data = ast.literal_eval(data)
-            except (ValueError, SyntaxError):
-                # 1, 2 모두 실패 시 에러 발생
-                raise forms.ValidationError("잘못된 JSON 형식의 고정 근무 데이터입니다. (쌍따옴표와 홑따옴표 모두 파싱 실패)")
+        return parse_assignments(self.cleaned_data['fixed_assignments'], "고정 근무")
 
-        if not isinstance(parsed_data, list):
-            raise forms.ValidationError("고정 근무는 딕셔너리(객체)의 리스트(배열) 형태여야 합니다.")
+    def clean_profile(self):
+        data = self.cleaned_data['profile']
+        if data and data not in profile_names():
+            raise forms.ValidationError(f"알 수 없는 계산 프로필입니다: {data}")
+        return data
 
-        final_fixed_assignments = {}
-        try:
-            for item in parsed_data:
-                if not isinstance(item, dict):
-                    raise ValueError("고정 근무 항목이 딕셔너리(객체)가 아닙니다.")
-
-                # get()을 사용해 안전하게 키에 접근
-                n = item.get('worker')
-                d = item.get('day')
-                s = item.get('shift')
-                
-                # 키 존재 및 타입 검증
-                if n is None or d is None or s is None:
-                    raise ValueError(f"항목에 'worker', 'day', 'shift' 키가 모두 필요합니다: {item}")
-                
-                if not all(isinstance(val, int) for val in [n, d, s]):
-                        raise ValueError(f"worker, day, shift 값은 모두 숫자여야 합니다: {item}")
-
-                # solve.py가 요구하는 튜플 key로 변환
-                final_fixed_assignments[(n, d)] = s
-
-            return final_fixed_assignments
-            
-        except (ValueError, TypeError, SyntaxError) as e:
-            # key 파싱 로직이 단순해졌으므로 에러 메시지도 단순화
-            raise forms.ValidationError(f"고정 근무 데이터 처리 중 오류: {e}")
\ No newline at end of file
+    def clean_rule_config(self):
+        data = self.cleaned_data['rule_config']
+        if data and data not in rule_config_names():
+            raise forms.ValidationError(f"알 수 없는 규칙 설정입니다: {data}")
+        return data
+
+    def clean_hint_schedule(self):
+        return parse_schedule(self.cleaned_data['hint_schedule'], "초기 해")
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start_date = cleaned_data.get('start_date')
+        if cleaned_data.get('team') and not start_date:
+            self.add_error('start_date', "팀 스케줄로 저장하려면 시작 날짜가 필요합니다.")
+        elif start_date and cleaned_data.get('start_day_of_week') not in (None, start_date.weekday()):
+            self.add_error('start_day_of_week', "시작 요일이 시작 날짜의 요일과 다릅니다.")
+        if cleaned_data.get('use_ledger'):
+            if not cleaned_data.get('team'):
+                self.add_error('use_ledger', "누적 근무 기록을 사용하려면 팀 이름이 필요합니다.")
+            elif cleaned_data.get('num_workers') is not None:
+                cleaned_data['ledger'] = ledger_offsets(cleaned_data['team'], cleaned_data['num_workers'])
+        return cleaned_data
+
+
+class RepairScheduleForm(ScheduleSettingsForm):
+    """기존 스케줄 중 변경된 고정 근무 주변만 다시 계산 (/api/solve_schedule/repair/)"""
+
+    schedule = forms.CharField(
+        label="기존 스케줄 (e.g., {\"worker_0\": [1, 2, 0, ...]})"
+    )
+    changes = forms.CharField(
+        label="변경된 고정 근무 (e.g., [{\"worker\": 2, \"day\": 20, \"shift\": 3}])"
+    )
+    window = forms.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=31,
+        initial=3,
+        label="변경일 앞뒤로 다시 계산할 일수"
+    )
+
+    # 부분 재계산은 기존 스케줄과의 차이만 최소화
+    use_ledger = None
+
+    def clean_schedule(self):
+        return parse_schedule(self.cleaned_data['schedule'], "기존 스케줄")
+
+    def clean_changes(self):
+        changes = parse_assignments(self.cleaned_data['changes'], "변경된 고정 근무")
+        if not changes:
+            raise forms.ValidationError("변경된 고정 근무가 하나 이상 필요합니다.")
+        return changes
+
+    def clean_window(self):
+        window = self.cleaned_data['window']
+        return 3 if window is None else window
+
+    def clean(self):
+        cleaned_data = super().clean()
+        schedule = cleaned_data.get('schedule')
+        num_workers = cleaned_data.get('num_workers')
+        num_days = cleaned_data.get('num_days')
+        if not schedule or num_workers is None or num_days is None:
+            return cleaned_data
+
+        duties = get_plan(cleaned_data['rule_config']).duties if cleaned_data.get('rule_config') else ALL_DUTIES_DICT
+        # 고정 근무와 변경된 고정 근무는 계산 전에 범위를 검사 (부분 재계산은 precheck 없이 바로 계산)
+        for field, name in (('fixed_assignments', "고정 근무"), ('changes', "변경된 고정 근무")):
+            for conflict in check_assignments(cleaned_data.get(field) or {}, num_workers, num_days, duties, name):
+                self.add_error(field, conflict['message'])
+
+        # 기존 스케줄은 모든 근무자의 모든 날짜를 포함해야 함
+        workers = sorted(int(str(worker).rsplit('_', 1)[-1]) for worker in schedule)
+        if workers != list(range(num_workers)):
+            self.add_error('schedule', "기존 스케줄의 근무자 수가 num_workers와 다릅니다.")
+        elif any(len(codes) != num_days for codes in schedule.values()):
+            self.add_error('schedule', "기존 스케줄의 일수가 num_days와 다릅니다.")
+        elif any(code not in duties for codes in schedule.values() for code in codes):
+            self.add_error('schedule', "기존 스케줄에 알 수 없는 근무 코드가 있습니다.")
+        return cleaned_data
+
+
+class HorizonSettingsForm(ScheduleSettingsForm):
+    """여러 달(분기, 1년) 스케줄 계산 (/api/horizon/). 한 달 단위 구간을 이어서 계산합니다."""
+
+    num_days = forms.IntegerField(
+        min_value=28,
+        max_value=366,
+        label="전체 기간의 일수"
+    )
+    window_days = forms.IntegerField(
+        required=False,
+        min_value=28,
+        max_value=31,
+        initial=28,
+        label="한 번에 계산할 일수"
+    )
+    overlap_days = forms.IntegerField(
+        required=False,
+        min_value=0,
+        max_value=14,
+        initial=7,
+        label="다음 구간과 겹쳐서 계산할 일수"
+    )
+
+
+class LargeRosterSettingsForm(ScheduleSettingsForm):
+    """
+    대규모 근무자(수백 명) 스케줄 계산 (/api/roster/). 근무자를 team_size명 안팎의 팀으로 나눠 계산한 뒤
+    LNS로 전체 근무자의 공정성을 개선합니다. 일일 근무 인원 규칙은 팀마다 적용됩니다.
+    """
+
+    num_workers = forms.IntegerField(
+        min_value=1,
+        max_value=1000,
+        label="근무자 수"
+    )
+    team_size = forms.IntegerField(
+        required=False,
+        min_value=5,
+        max_value=15,
+        initial=10,
+        label="팀 하나의 근무자 수"
+    )
+    lns_time = forms.FloatField(
+        required=False,
+        min_value=0,
+        max_value=600,
+        initial=30,
+        label="전체 공정성 개선(LNS) 시간 (초)"
+    )
+    # LNS의 공정성 평가(roster.FairnessEvaluator)는 이번 기간만 사용
+    use_ledger = None
@@ -0,0 +1,120 @@
+"""
+여러 달(분기, 1년) 스케줄 계산 (rolling horizon)
+
+전체 기간을 한 모델로 풀면 변수 수가 기간에 비례해 늘고 탐색 시간은 그보다 빠르게
+늘어나므로, window_days일짜리 구간을 차례로 풀어 이어 붙입니다.
+
+- 각 구간은 window_days일을 풀지만 앞쪽 window_days - overlap_days일만 확정하고,
+  나머지 overlap_days일은 다음 구간의 초기 해(hint)로만 사용합니다.
+- 확정된 마지막 날의 근무(previous_shifts)를 다음 구간에 넘겨 야간 후 휴식,
+  연속 OFF 금지가 구간 경계에서도 지켜지게 합니다.
+- 근무자별 누적 근무시간, 평일/공휴일 DAY 근무 수(carry_over)를 다음 구간의
+  setObjective에 넘겨 기간 전체의 공정성을 맞춥니다. 누적값 사용(use_ledger)이면 팀의 누적값
+  (params['ledger'])을 첫 구간부터 더하고, 야간/주말·공휴일 근무 수도 함께 넘깁니다.
+- 마지막 구간은 기간 끝에 맞춰 window_days일을 풀고, 이미 확정된 날짜는
+  addFrozenAssignments로 고정합니다.
+한 번에 하나의 구간 모델만 메모리에 있으므로 메모리와 시간은 기간 길이에 비례합니다.
+"""
+from .params import DEFAULT_OVERLAP_DAYS, DEFAULT_WINDOW_DAYS, horizon_options
+from .rules import ALL_DUTIES_DICT, DAY, NIGHT, addFrozenAssignments
+from .solve import ScheduleSolver, SolveContext, get_weekends, rule_set
+
+
+def _windows(num_days, window_days, overlap_days):
+    """(start, end, commit_end) 0-based 구간 목록. [start, commit_end)을 확정합니다."""
+    windows = []
+    step = max(1, window_days - overlap_days)
+    committed = 0
+    while committed < num_days:
+        start = committed
+        if start + window_days >= num_days:
+            # 마지막 구간은 기간 끝에 맞추고, 앞쪽의 확정된 날짜는 고정
+            start = max(0, num_days - window_days)
+            windows.append((start, num_days, num_days))
+            break
+        windows.append((start, start + window_days, start + step))
+        committed = start + step
+    return windows
+
+
+def _carry_over(schedule, until, is_holiday, duties=ALL_DUTIES_DICT, fairness_duty=DAY, night_duty=NIGHT, ledger=None):
+    """0-based until일 전까지 확정된 근무의 근무자별 누적값 (ledger: 기간 이전의 누적값 {"n": {key: 값}})"""
+    carry_over = {}
+    for n, codes in schedule.items():
+        committed = codes[:until]
+        values = {
+            'hours': sum(duties[code].time for code in committed),
+            'weekday_day': sum(1 for d, code in enumerate(committed) if code == fairness_duty and not is_holiday[d]),
+            'holiday_day': sum(1 for d, code in enumerate(committed) if code == fairness_duty and is_holiday[d]),
+            'night': sum(1 for code in committed if code == night_duty),
+            'weekend': sum(1 for d, code in enumerate(committed) if is_holiday[d] and duties[code].type == 'work'),
+        }
+        offsets = (ledger or {}).get(str(n), {})
+        carry_over[n] = {key: value + offsets.get(key, 0) for key, value in values.items()}
+    return carry_over
+
+
+def plan_horizon(params, window_days=DEFAULT_WINDOW_DAYS, overlap_days=DEFAULT_OVERLAP_DAYS, on_window=None, **solver_kwargs):
+    """
+    - params       : params_from_form() 형식의 설정. num_days는 전체 기간의 일수,
+                     holidays와 fixed_assignments의 day는 기간 전체 기준 1-based
+    - window_days  : 한 번에 계산할 일수 (월간 근무 조건이 이 구간마다 적용됨)
+    - overlap_days : 다음 구간과 겹쳐서 계산하는 일수
+    - on_window    : 구간 하나가 끝날 때마다 on_window(index, total, stats) 호출
+    반환값: (스케줄 {worker: [codes]} 또는 None, 구간별 stats 리스트)
+    """
+    num_workers = params['num_workers']
+    num_days = params['num_days']
+    window_days = min(window_days, num_days)
+    weekends = get_weekends(num_days, params['start_day_of_week'])
+    all_holidays = set(weekends) | {day - 1 for day in params['holidays']}
+    is_holiday = [d in all_holidays for d in range(num_days)]
+    fixed_assignments = {(item['worker'], item['day']): item['shift'] for item in params['fixed_assignments']}
+    plan, constraints, objective = rule_set(params)
+    carry_kwargs = {'duties': plan.duties, 'fairness_duty': plan.fairness_duty, 'night_duty': plan.codes.get('NIGHT')} if plan else {}
+    ledger = params.get('ledger')
+
+    schedule = {n: [] for n in range(num_workers)}
+    hint = {}
+    windows = _windows(num_days, window_days, overlap_days)
+    window_stats = []
+    for index, (start, end, commit_end) in enumerate(windows):
+        length = end - start
+        frozen_until = len(schedule[0])
+        # 이미 확정된 날짜(마지막 구간의 앞부분)는 기존 배정으로 고정
+        base_schedule = {n: codes[start:] for n, codes in schedule.items()} if frozen_until > start else None
+        solver = ScheduleSolver(
+            num_workers=num_workers,
+            num_days=length,
+            fixed_assignments={
+                (n, day - start): shift for (n, day), shift in fixed_assignments.items()
+                if start < day <= end
+            },
+            weekends=[d - start for d in weekends if start <= d < end],
+            holidays=[d - start + 1 for d in all_holidays - set(weekends) if start <= d < end],
+            max_monthly_hours=params['max_monthly_hours'],
+            constraints=constraints + ([addFrozenAssignments] if base_schedule else []),
+            objectiveFunc=objective,
+            hint=base_schedule or hint,
+            context=SolveContext(
+                base_schedule=base_schedule,
+                free_days=set(range(frozen_until - start, length)) if base_schedule else None,
+                previous_shifts={n: codes[start - 1] for n, codes in schedule.items()} if start else None,
+                carry_over=_carry_over(schedule, start, is_holiday, ledger=ledger, **carry_kwargs) if start or ledger else None,
+            ),
+            plan=plan,
+            **solver_kwargs
+        )
+        result = solver.solve()
+        stats = dict(solver.stats, window=index, start_day=start + 1, end_day=end, commit_end_day=commit_end)
+        window_stats.append(stats)
+        if on_window:
+            on_window(index, len(windows), stats)
+        if not result:
+            return None, window_stats
+
+        for n, codes in result.items():
+            schedule[n] = schedule[n][:start] + codes[:commit_end - start]
+        # 확정하지 않은 overlap 구간은 다음 구간의 초기 해로 사용
+        hint = {n: codes[commit_end - start:] for n, codes in result.items()}
+    return schedule, window_stats
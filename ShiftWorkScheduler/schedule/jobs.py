@@ -0,0 +1,443 @@
+"""
+비동기 스케줄 계산 작업 큐
+
+- submit_job(): SolveJob을 DB에 저장하고 프로세스 풀에 실행을 요청합니다.
+- 실제 계산은 별도 프로세스(run_job)에서 수행되며, 진행 상황과 결과는
+  SolveJob 레코드에 직접 기록됩니다. 작업 상태가 DB에 있으므로 서버를
+  재시작해도 대기 중이던 작업은 풀이 생성될 때 다시 실행됩니다. 실행 중이던 작업은 실행하던
+  프로세스가 종료됐거나 생존 신호(heartbeat_at)가 끊긴 경우에만 다시 실행합니다.
+- SCHEDULE_JOB_BACKEND = 'worker'이면 웹 프로세스는 작업을 DB에 저장만 하고,
+  별도로 실행한 `manage.py solver_worker`(run_worker)가 가져가 실행합니다.
+  이때 웹 프로세스는 계산 모듈(OR-Tools)을 불러오지 않습니다.
+"""
+import datetime
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from . import telemetry
+from .models import SolveJob
+from .precheck import no_schedule_message
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class JobQueueFull(Exception):
+    """대기열이 SCHEDULE_JOB_MAX_QUEUE를 초과했을 때 발생"""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _uses_worker():
+    """작업 큐를 manage.py solver_worker가 실행하는지 (SCHEDULE_JOB_BACKEND)"""
+    return _setting('SCHEDULE_JOB_BACKEND', 'pool') == 'worker'
+
+
+def preload_solver():
+    """
+    계산 모듈(OR-Tools 포함)을 미리 불러옵니다. gunicorn --preload처럼 master 프로세스에서 한 번
+    불러온 뒤 fork하면 worker 프로세스들이 같은 메모리 페이지를 공유하고 첫 계산 요청이 빨라집니다.
+    (settings.SCHEDULE_PRELOAD_SOLVER, wsgi.py/asgi.py)
+    """
+    from . import cache, horizon, repair, roster, solve, sweep  # noqa: F401
+
+
+def get_executor():
+    """
+    프로세스 풀을 처음 사용할 때 생성하고, 남아있던 작업을 다시 제출합니다.
+    (작업 큐를 solver_worker가 실행하면 일괄 계산/what-if 비교에만 사용)
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=_setting('SCHEDULE_JOB_MAX_WORKERS', 2),
+                initializer=_init_worker,
+            )
+            if not _uses_worker():
+                _requeue_pending(_executor)
+    return _executor
+
+
+def _requeue_pending(executor):
+    # 대기 중인 작업은 run_job()이 QUEUED → RUNNING으로 가져가므로 여러 프로세스가 제출해도 한 번만 실행됨
+    _requeue_stale()
+    for job_id in SolveJob.objects.filter(status=SolveJob.QUEUED).values_list('id', flat=True):
+        _dispatch(executor, job_id)
+
+
+def _process_owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _owner_alive(owner):
+    """같은 호스트의 프로세스면 실제로 살아있는지 확인. 다른 호스트면 알 수 없으므로 True"""
+    host, _, pid = owner.rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _requeue_stale():
+    """
+    실행하던 프로세스가 종료된 RUNNING 작업을 처음부터 다시 계산하도록 대기열에 넣습니다.
+    - 같은 호스트: owner의 pid가 없으면 바로
+    - 그 밖: 마지막 생존 신호(없으면 시작 시각)가 SCHEDULE_JOB_STALE_AFTER초보다 오래된 경우
+    다른 웹 프로세스나 solver_worker가 실행 중인 작업은 건드리지 않습니다.
+    """
+    cutoff = timezone.now() - datetime.timedelta(seconds=_setting('SCHEDULE_JOB_STALE_AFTER', 60.0))
+    stale = []
+    for job_id, owner, heartbeat_at, started_at in SolveJob.objects.filter(status=SolveJob.RUNNING).values_list(
+            'id', 'owner', 'heartbeat_at', 'started_at'):
+        last_seen = heartbeat_at or started_at
+        if not ((owner and not _owner_alive(owner)) or last_seen is None or last_seen < cutoff):
+            continue
+        # 조회한 뒤에 생존 신호를 보낸 작업은 제외
+        if SolveJob.objects.filter(pk=job_id, status=SolveJob.RUNNING, heartbeat_at=heartbeat_at).update(
+                status=SolveJob.QUEUED, started_at=None, owner='', heartbeat_at=None):
+            stale.append(job_id)
+    return stale
+
+
+def _dispatch(executor, job_id):
+    future = executor.submit(run_job, str(job_id))
+    future.add_done_callback(lambda f: _on_job_done(job_id, f))
+
+
+def _on_job_done(job_id, future):
+    if future.cancelled():
+        return
+    # 작업 프로세스가 비정상 종료된 경우(BrokenProcessPool 등)에만 여기서 실패 처리
+    error = future.exception()
+    if error is None:
+        # 작업 프로세스의 계산 결과를 이 프로세스의 지표에 반영
+        if future.result():
+            telemetry.record_solve(*future.result())
+        return
+    try:
+        SolveJob.objects.filter(pk=job_id, status__in=SolveJob.ACTIVE_STATUSES).update(
+            status=SolveJob.FAILED,
+            error=f'작업 실행 중 오류: {error}',
+            finished_at=timezone.now(),
+        )
+    finally:
+        connections.close_all()
+
+
+def submit_job(params, options=None, kind=SolveJob.MONTH):
+    """
+    params_from_form() 형식의 입력으로 작업을 생성하고 대기열에 넣습니다.
+    options는 solve_options()의 결과로, cached_solve()에 그대로 전달됩니다.
+    kind가 SolveJob.HORIZON이면 options는 horizon_options(), SolveJob.ROSTER이면 roster_options()의 결과입니다.
+    options['store']가 있으면 (storage_options()) 완료된 결과를 팀 스케줄로 저장합니다.
+    options['profile']이 없으면 SCHEDULE_JOB_PROFILE (계산 프로세스마다 스레드 1개인 throughput)을 사용합니다.
+    """
+    options = dict(options or {})
+    options['profile'] = options.get('profile') or _setting('SCHEDULE_JOB_PROFILE', 'throughput')
+    # 같은 요청의 결과가 캐시에 있으면 프로세스 풀을 거치지 않고 바로 완료 처리
+    # (solver_worker를 사용하면 캐시 조회도 worker의 cached_solve()가 함)
+    entry = None
+    if kind == SolveJob.MONTH and not _uses_worker():
+        from .cache import lookup
+
+        entry = lookup(
+            params, options.get('profile'), max_time_limit=_setting('SCHEDULE_JOB_TIMEOUT', 600.0),
+            alternatives=options.get('alternatives') or 0, alternative_tolerance=options.get('alternative_tolerance'),
+            alternative_min_distance=options.get('alternative_min_distance'),
+        )
+        # 충돌 설명을 요청했는데 캐시된 결과에 없으면 작업에서 찾음 (cached_solve)
+        if entry is not None and options.get('explain') and 'conflicts' not in entry and entry['stats']['status'] == 'INFEASIBLE':
+            entry = None
+    if entry is not None:
+        telemetry.record_cache(True)
+        job = SolveJob.objects.create(
+            params=params,
+            options=options,
+            **_job_result_fields(entry, cached=True),
+            started_at=timezone.now(),
+            finished_at=timezone.now(),
+        )
+        _store_result(job)
+        return job
+
+    executor = None if _uses_worker() else get_executor()
+    limit = _setting('SCHEDULE_JOB_MAX_WORKERS', 2) + _setting('SCHEDULE_JOB_MAX_QUEUE', 20)
+    if SolveJob.objects.filter(status__in=SolveJob.ACTIVE_STATUSES).count() >= limit:
+        telemetry.JOBS_REJECTED.inc()
+        raise JobQueueFull()
+    job = SolveJob.objects.create(params=params, options=options, kind=kind)
+    telemetry.JOBS_SUBMITTED.inc()
+    if executor is not None:
+        _dispatch(executor, job.pk)
+    return job
+
+
+def solve_in_pool(params, options=None):
+    """
+    DB에 작업을 만들지 않고 프로세스 풀에서 바로 cached_solve()를 실행합니다.
+    Future의 결과는 cached_solve()의 반환값 (entry, cached) 입니다.
+    """
+    return get_executor().submit(run_solve, params, options or {})
+
+
+def wait_for_job(job_id, timeout):
+    """작업이 끝나거나 timeout(초)이 지날 때까지 기다린 뒤 SolveJob을 반환합니다 (long-poll)."""
+    deadline = time.monotonic() + min(timeout, _setting('SCHEDULE_JOB_MAX_WAIT', 30))
+    job = SolveJob.objects.get(pk=job_id)
+    while not job.is_finished and time.monotonic() < deadline:
+        time.sleep(0.5)
+        job.refresh_from_db()
+    return job
+
+
+def _store_result(job):
+    """성공한 작업의 결과를 options['store']의 팀 스케줄로 저장"""
+    from .storage import store_schedule
+
+    store = job.options.get('store')
+    if store and job.status == SolveJob.SUCCEEDED:
+        store_schedule(store['team'], store['start_date'], job.params, job.result, job.progress, job=job)
+
+
+def _job_result_fields(entry, cached):
+    """cached_solve()의 결과를 SolveJob 필드 값으로 변환"""
+    if entry['schedule']:
+        progress = dict(entry['stats'], cached=cached)
+        if entry.get('alternatives'):
+            progress['alternatives'] = entry['alternatives']
+        return {'status': SolveJob.SUCCEEDED, 'result': entry['schedule'], 'progress': progress}
+    return {'status': SolveJob.FAILED, 'error': no_schedule_message(entry.get('conflicts')),
+            'progress': dict(entry['stats'], cached=cached, conflicts=entry.get('conflicts', []))}
+
+
+def run_worker(max_workers=None, poll_interval=None, requeue=True, once=False, stop_event=None):
+    """
+    manage.py solver_worker: 대기 중인 작업을 DB에서 가져와 이 프로세스의 프로세스 풀에서 실행합니다.
+    - requeue : 실행 중(RUNNING)으로 남았지만 실행하던 프로세스가 종료된 작업을 다시 대기열에 넣음
+                (_requeue_stale, 시작할 때와 SCHEDULE_JOB_STALE_AFTER초마다)
+    - once    : 대기 중인 작업이 모두 끝나면 종료
+    작업은 run_job()이 QUEUED → RUNNING으로 바꿔 가져가므로 worker를 여러 개 실행해도 한 번만 실행됩니다.
+    """
+    max_workers = max_workers or _setting('SCHEDULE_JOB_MAX_WORKERS', 2)
+    poll_interval = poll_interval or _setting('SCHEDULE_WORKER_POLL_INTERVAL', 1.0)
+    preload_solver()
+    stale_after = _setting('SCHEDULE_JOB_STALE_AFTER', 60.0)
+    next_requeue = time.monotonic()
+    # fork 전에 이 프로세스의 DB 연결을 닫음
+    connections.close_all()
+    running = {}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as executor:
+        while stop_event is None or not stop_event.is_set():
+            if requeue and time.monotonic() >= next_requeue:
+                _requeue_stale()
+                next_requeue = time.monotonic() + stale_after
+            for future in [future for future in running if future.done()]:
+                _on_job_done(running.pop(future), future)
+            free = max_workers - len(running)
+            if free > 0:
+                queued = (SolveJob.objects.filter(status=SolveJob.QUEUED)
+                          .exclude(pk__in=list(running.values()))
+                          .order_by('created_at').values_list('id', flat=True)[:free])
+                for job_id in queued:
+                    running[executor.submit(run_job, str(job_id))] = job_id
+            connections.close_all()
+            if once and not running:
+                return
+            time.sleep(poll_interval)
+
+
+# ---------------------------------------------------------------------------
+# 작업 프로세스에서 실행되는 코드
+# ---------------------------------------------------------------------------
+
+def _init_worker():
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    # fork로 상속받은 부모 프로세스의 DB 연결은 사용하지 않음
+    connections.close_all()
+
+
+class _Heartbeat:
+    """작업을 실행하는 동안 interval초마다 SolveJob.heartbeat_at을 갱신하는 스레드"""
+
+    def __init__(self, job_id, interval):
+        self.job_id = job_id
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                SolveJob.objects.filter(pk=self.job_id, status=SolveJob.RUNNING).update(heartbeat_at=timezone.now())
+        finally:
+            connections.close_all()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+
+def _make_progress_callback(job_id, interval):
+    """해를 찾을 때마다 진행 상황을 SolveJob.progress에 기록 (interval초 간격)"""
+    last_report = [0.0]
+
+    def report(monitor):
+        now = time.monotonic()
+        if now - last_report[0] < interval:
+            return
+        last_report[0] = now
+        SolveJob.objects.filter(pk=job_id).update(progress={
+            'solutions': monitor.solutions,
+            'objective': monitor.ObjectiveValue(),
+            'best_bound': monitor.BestObjectiveBound(),
+            'elapsed': monitor.WallTime(),
+        })
+
+    return report
+
+
+def _make_window_callback(job_id):
+    """여러 달 계산에서 구간 하나가 끝날 때마다 진행 상황을 기록"""
+    def report(index, total, stats):
+        SolveJob.objects.filter(pk=job_id).update(progress={
+            'windows_done': index + 1,
+            'windows_total': total,
+            'last_window': stats,
+        })
+
+    return report
+
+
+def _run_horizon(job, options):
+    """SolveJob.HORIZON 작업: 구간마다 프로필의 time_limit (최대 SCHEDULE_HORIZON_WINDOW_TIME_LIMIT초)"""
+    from .horizon import plan_horizon
+    from .profiles import get_profile
+    from .params import format_schedule
+
+    options = dict(options)
+    profile = get_profile(options.pop('profile', None))
+    schedule_result, window_stats = plan_horizon(
+        job.params,
+        **options,
+        profile=profile,
+        time_limit=min(profile.time_limit, _setting('SCHEDULE_HORIZON_WINDOW_TIME_LIMIT', 10.0)),
+        on_window=_make_window_callback(job.pk),
+    )
+    progress = {'windows_done': len(window_stats), 'windows_total': len(window_stats), 'windows': window_stats}
+    if schedule_result:
+        return {'status': SolveJob.SUCCEEDED, 'result': format_schedule(schedule_result), 'progress': progress}
+    failed = window_stats[-1]
+    return {'status': SolveJob.FAILED, 'progress': progress,
+            'error': f"{failed['start_day']}~{failed['end_day']}일 구간에서 해결 가능한 스케줄을 찾지 못했습니다."}
+
+
+def _make_roster_callback(job_id):
+    """대규모 근무자 계산에서 1단계가 끝날 때와 LNS로 해가 좋아질 때마다 진행 상황을 기록"""
+    def report(stats):
+        SolveJob.objects.filter(pk=job_id).update(progress=stats)
+
+    return report
+
+
+def _run_roster(job, options):
+    """
+    SolveJob.ROSTER 작업: 팀별 계산은 팀마다 프로필의 time_limit (최대 SCHEDULE_ROSTER_TEAM_TIME_LIMIT초),
+    LNS는 options['lns_time']초 (최대 SCHEDULE_ROSTER_MAX_LNS_TIME초)
+    """
+    from .profiles import get_profile
+    from .roster import plan_roster
+    from .params import format_schedule
+
+    options = dict(options)
+    profile = get_profile(options.pop('profile', None))
+    options['lns_time'] = min(options['lns_time'], _setting('SCHEDULE_ROSTER_MAX_LNS_TIME', 120.0))
+    schedule_result, stats = plan_roster(
+        job.params,
+        **options,
+        profile=profile,
+        team_time_limit=min(profile.time_limit, _setting('SCHEDULE_ROSTER_TEAM_TIME_LIMIT', 10.0)),
+        lns_iteration_time=_setting('SCHEDULE_ROSTER_LNS_ITERATION_TIME', 1.0),
+        max_workers=_setting('SCHEDULE_ROSTER_MAX_WORKERS', 1),
+        on_progress=_make_roster_callback(job.pk),
+    )
+    if schedule_result:
+        return {'status': SolveJob.SUCCEEDED, 'result': format_schedule(schedule_result), 'progress': stats}
+    workers = ', '.join(f"{team['workers'][0]}~{team['workers'][1]}" for team in stats['failed_teams'])
+    return {'status': SolveJob.FAILED, 'progress': stats,
+            'error': f"근무자 {workers}번 팀에서 해결 가능한 스케줄을 찾지 못했습니다."}
+
+
+def run_solve(params, options):
+    from .cache import cached_solve
+
+    try:
+        return cached_solve(params, max_time_limit=_setting('SCHEDULE_JOB_TIMEOUT', 600.0), record=False, **options)
+    finally:
+        connections.close_all()
+
+
+def run_job(job_id):
+    from .cache import cached_solve
+
+    try:
+        # 다른 프로세스가 이미 가져간 작업이면 건너뜀
+        now = timezone.now()
+        claimed = SolveJob.objects.filter(pk=job_id, status=SolveJob.QUEUED).update(
+            status=SolveJob.RUNNING, started_at=now, owner=_process_owner(), heartbeat_at=now,
+        )
+        if not claimed:
+            return None
+        job = SolveJob.objects.get(pk=job_id)
+        callback = _make_progress_callback(job_id, _setting('SCHEDULE_JOB_PROGRESS_INTERVAL', 1.0))
+        outcome = None
+        options = {key: value for key, value in job.options.items() if key != 'store'}
+        try:
+            with _Heartbeat(job_id, _setting('SCHEDULE_JOB_HEARTBEAT_INTERVAL', 10.0)):
+                if job.kind == SolveJob.HORIZON:
+                    fields = _run_horizon(job, options)
+                elif job.kind == SolveJob.ROSTER:
+                    fields = _run_roster(job, options)
+                else:
+                    entry, cached = cached_solve(
+                        job.params,
+                        **options,
+                        max_time_limit=_setting('SCHEDULE_JOB_TIMEOUT', 600.0),
+                        solution_callback=callback,
+                        record=False,
+                    )
+                    outcome = (entry, cached)
+                    fields = _job_result_fields(entry, cached)
+        except Exception as e:
+            job.status = SolveJob.FAILED
+            job.error = f'서버 오류: {str(e)}'
+        else:
+            for field, value in fields.items():
+                setattr(job, field, value)
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'progress', 'result', 'error', 'finished_at'])
+        _store_result(job)
+        return outcome
+    finally:
+        connections.close_all()
@@ -0,0 +1,30 @@
+"""
+    python manage.py solver_worker [--workers N] [--poll SECONDS] [--no-requeue] [--once]
+
+작업 큐(/api/jobs/, /api/horizon/, /api/roster/)를 웹 프로세스와 별도로 실행합니다.
+settings.SCHEDULE_JOB_BACKEND = 'worker'로 설정하면 웹 프로세스는 작업을 저장만 합니다.
+"""
+from django.core.management.base import BaseCommand
+
+from schedule.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "대기 중인 스케줄 계산 작업을 DB에서 가져와 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None,
+                            help="동시에 실행할 계산 프로세스 수 (기본: SCHEDULE_JOB_MAX_WORKERS)")
+        parser.add_argument('--poll', type=float, default=None,
+                            help="대기열 확인 간격 (초, 기본: SCHEDULE_WORKER_POLL_INTERVAL)")
+        parser.add_argument('--no-requeue', action='store_true',
+                            help="실행하던 프로세스가 종료된 작업을 다시 대기열에 넣지 않음")
+        parser.add_argument('--once', action='store_true', help="대기 중인 작업이 모두 끝나면 종료")
+
+    def handle(self, *args, **options):
+        self.stdout.write("solver worker 시작")
+        try:
+            run_worker(max_workers=options['workers'], poll_interval=options['poll'],
+                       requeue=not options['no_requeue'], once=options['once'])
+        except KeyboardInterrupt:
+            self.stdout.write("solver worker 종료")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solvejob',
+            name='options',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0002_solvejob_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solvejob',
+            name='kind',
+            field=models.CharField(choices=[('month', '한 달'), ('horizon', '여러 달')], default='month', max_length=16),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0004_team_worker_solverun_assignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solverun',
+            name='schedule',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
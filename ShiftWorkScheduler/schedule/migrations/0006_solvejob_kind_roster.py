@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0005_solverun_schedule'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='solvejob',
+            name='kind',
+            field=models.CharField(choices=[('month', '한 달'), ('horizon', '여러 달'), ('roster', '대규모 근무자')], default='month', max_length=16),
+        ),
+    ]
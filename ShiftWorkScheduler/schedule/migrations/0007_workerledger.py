@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_ledgers(apps, schema_editor):
+    """이미 저장된 배정으로 근무자별 누적값을 만듭니다."""
+    from schedule.storage import _ledger_counts
+
+    Assignment = apps.get_model('schedule', 'Assignment')
+    SolveRun = apps.get_model('schedule', 'SolveRun')
+    WorkerLedger = apps.get_model('schedule', 'WorkerLedger')
+    cells_by_run = {}
+    for run_id, worker_id, date, shift in Assignment.objects.values_list('run_id', 'worker_id', 'date', 'shift'):
+        cells_by_run.setdefault(run_id, []).append((worker_id, date, shift))
+    counts = {}
+    for run_id, params, start_date in SolveRun.objects.filter(pk__in=list(cells_by_run)).values_list('pk', 'params', 'start_date'):
+        _ledger_counts(cells_by_run[run_id], params, start_date, counts)
+    WorkerLedger.objects.bulk_create([WorkerLedger(worker_id=worker_id, **row) for worker_id, row in counts.items()])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0006_solvejob_kind_roster'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hours', models.PositiveIntegerField(default=0)),
+                ('night_count', models.PositiveIntegerField(default=0)),
+                ('weekend_count', models.PositiveIntegerField(default=0)),
+                ('holiday_count', models.PositiveIntegerField(default=0)),
+                ('weekday_day', models.PositiveIntegerField(default=0)),
+                ('holiday_day', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('worker', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='ledger', to='schedule.worker')),
+            ],
+        ),
+        migrations.RunPython(build_ledgers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedule', '0007_workerledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solvejob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solvejob',
+            name='owner',
+            field=models.CharField(blank=True, max_length=128),
+        ),
+    ]
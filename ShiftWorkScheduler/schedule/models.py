@@ -1,3 +1,181 @@
+import uuid
+
 from django.db import models
 
-# Create your models here.
+
+class SolveJob(models.Model):
+    """비동기 스케줄 계산 작업 (/api/jobs/)"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "대기"),
+        (RUNNING, "실행 중"),
+        (SUCCEEDED, "완료"),
+        (FAILED, "실패"),
+    ]
+    ACTIVE_STATUSES = (QUEUED, RUNNING)
+
+    # 한 달 계산(cached_solve) / 여러 달 계산(horizon.plan_horizon) / 대규모 근무자(roster.plan_roster)
+    MONTH = "month"
+    HORIZON = "horizon"
+    ROSTER = "roster"
+    KIND_CHOICES = [
+        (MONTH, "한 달"),
+        (HORIZON, "여러 달"),
+        (ROSTER, "대규모 근무자"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES, default=MONTH)
+    # params_from_form()으로 정규화한 입력값
+    params = models.JSONField()
+    # solve_options()로 만든 계산 옵션 (warm start 등)
+    options = models.JSONField(default=dict, blank=True)
+    # 진행 상황: 발견한 해의 수, 현재 목적함수 값, 경과 시간
+    progress = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # 실행 중인 프로세스 ("호스트:pid")와 마지막 생존 신호. 오래된 RUNNING 작업만 다시 대기열에 넣음 (jobs._requeue_stale)
+    owner = models.CharField(max_length=128, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"SolveJob {self.id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status not in self.ACTIVE_STATUSES
+
+    def to_dict(self):
+        data = {
+            'job_id': str(self.id),
+            'status': self.status,
+            'kind': self.kind,
+            'progress': self.progress,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if self.status == self.SUCCEEDED:
+            data['schedule'] = self.result
+        elif self.status == self.FAILED:
+            data['message'] = self.error
+        return data
+
+
+class Team(models.Model):
+    """근무자 그룹. 저장된 스케줄은 팀 단위로 조회합니다."""
+
+    name = models.CharField(max_length=64, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class Worker(models.Model):
+    """팀의 근무자. index는 계산에 사용하는 근무자 번호 (0부터)"""
+
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="workers")
+    index = models.PositiveSmallIntegerField()
+    name = models.CharField(max_length=64, blank=True)
+
+    class Meta:
+        ordering = ["team", "index"]
+        constraints = [
+            models.UniqueConstraint(fields=["team", "index"], name="unique_worker_index"),
+        ]
+
+    def __str__(self):
+        return self.name or f"{self.team} worker_{self.index}"
+
+
+class SolveRun(models.Model):
+    """팀의 스케줄 계산 결과 하나 (start_date부터 num_days일)"""
+
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="runs")
+    job = models.ForeignKey(SolveJob, on_delete=models.SET_NULL, null=True, blank=True, related_name="runs")
+    start_date = models.DateField()
+    num_days = models.PositiveSmallIntegerField()
+    params = models.JSONField()
+    stats = models.JSONField(default=dict, blank=True)
+    # 저장 시점의 전체 스케줄 (encoding.pack_matrix, 근무자·날짜 칸마다 몇 비트)
+    schedule = models.BinaryField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["team", "start_date"]),
+        ]
+
+    def __str__(self):
+        return f"SolveRun {self.pk} ({self.team}, {self.start_date})"
+
+    def to_dict(self):
+        return {
+            'run_id': self.pk,
+            'team': self.team.name,
+            'job_id': str(self.job_id) if self.job_id else None,
+            'start_date': self.start_date.isoformat(),
+            'num_days': self.num_days,
+            'stats': self.stats,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+class Assignment(models.Model):
+    """
+    (근무자, 날짜)의 근무 배정. 같은 팀의 같은 날짜는 마지막으로 저장한 계산 결과만 남깁니다.
+    team과 hours는 조회용으로 중복 저장합니다. ((team, date) 인덱스, 월간 근무시간 합계)
+    """
+
+    run = models.ForeignKey(SolveRun, on_delete=models.CASCADE, related_name="assignments")
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="assignments")
+    worker = models.ForeignKey(Worker, on_delete=models.CASCADE, related_name="assignments")
+    date = models.DateField()
+    shift = models.PositiveSmallIntegerField()
+    hours = models.PositiveSmallIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["team", "date"]),
+            models.Index(fields=["worker", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.worker} {self.date} {self.shift}"
+
+
+class WorkerLedger(models.Model):
+    """
+    근무자의 누적 근무 기록 (저장된 모든 스케줄의 합계). storage.store_schedule()이 배정을 저장/교체할 때
+    바뀐 칸의 차이만 더하므로, 여러 달의 공정성 계산(use_ledger)은 Assignment 전체가 아니라 근무자 수만큼만 읽습니다.
+    """
+
+    worker = models.OneToOneField(Worker, on_delete=models.CASCADE, related_name="ledger")
+    hours = models.PositiveIntegerField(default=0)
+    night_count = models.PositiveIntegerField(default=0)
+    # 주말(토/일) 근무, 주말이 아닌 공휴일 근무 (근무 시간에 포함되는 근무만)
+    weekend_count = models.PositiveIntegerField(default=0)
+    holiday_count = models.PositiveIntegerField(default=0)
+    # 목적함수 근무(fairness_duty)의 평일/공휴일(주말 포함) 횟수 (rules.balanceObjective의 carry_over)
+    weekday_day = models.PositiveIntegerField(default=0)
+    holiday_day = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.worker} ledger"
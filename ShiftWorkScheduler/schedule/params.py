@@ -0,0 +1,95 @@
+"""
+요청 입력을 계산 입력(params)과 옵션으로 변환하는 함수
+
+OR-Tools(solve.py, rules.py)를 import하지 않으므로 웹 프로세스는 URLconf를 불러올 때 계산 모듈을
+불러오지 않습니다. 계산 모듈은 계산하는 view 또는 작업 프로세스에서 처음 사용할 때 불러옵니다.
+(solve.py, horizon.py, roster.py는 이 모듈의 함수를 그대로 다시 export합니다.)
+"""
+
+# 여러 달 계산 (horizon.py)
+DEFAULT_WINDOW_DAYS = 28
+DEFAULT_OVERLAP_DAYS = 7
+
+# 대규모 근무자 (roster.py)
+DEFAULT_TEAM_SIZE = 10
+DEFAULT_LNS_TIME = 30.0
+
+
+def normalize_schedule(schedule_data):
+    """{0: [...]} 또는 API 형식 {"worker_0": [...]}을 {0: [...]}로 변환합니다."""
+    normalized = {}
+    for worker, codes in schedule_data.items():
+        if isinstance(worker, str):
+            worker = int(worker.rsplit('_', 1)[-1])
+        normalized[worker] = list(codes)
+    return normalized
+
+
+def get_weekends(num_days, start_day_of_week):
+    """토요일(5), 일요일(6)에 해당하는 0-based 날짜 목록"""
+    return [
+        d for d in range(num_days)
+        if (d + start_day_of_week) % 7 == 5 or
+           (d + start_day_of_week) % 7 == 6
+    ]
+
+
+def params_from_form(data):
+    """
+    ScheduleSettingsForm.cleaned_data를 JSON으로 저장 가능한 dict로 변환합니다.
+    - fixed_assignments: {(n, d): s} -> [{"worker": n, "day": d, "shift": s}, ...]
+    """
+    params = {
+        'num_workers': data['num_workers'],
+        'num_days': data['num_days'],
+        'start_day_of_week': data['start_day_of_week'],
+        'max_monthly_hours': data['max_monthly_hours'],
+        'holidays': list(data['holidays']),
+        'fixed_assignments': [
+            {'worker': n, 'day': d, 'shift': s}
+            for (n, d), s in sorted((data['fixed_assignments'] or {}).items())
+        ],
+    }
+    # 설정 기반 규칙 (plan.py). 없으면 DEFAULT_CONSTRAINTS/setObjective
+    if data.get('rule_config'):
+        params['rule_config'] = data['rule_config']
+    # 팀의 누적값 (use_ledger, storage.ledger_offsets). 있으면 rules.balanceLedgerObjective
+    if data.get('ledger') is not None:
+        params['ledger'] = data['ledger']
+    return params
+
+
+def solve_options(data):
+    """ScheduleSettingsForm.cleaned_data 중 계산 방식에 관한 옵션 (캐시 키에는 포함되지 않음)"""
+    return {
+        'hint': data.get('hint_schedule'),
+        'warm_start': bool(data.get('warm_start')),
+        'profile': data.get('profile') or None,
+        'alternatives': data.get('alternatives') or 0,
+        'alternative_tolerance': data.get('alternative_tolerance'),
+        'alternative_min_distance': data.get('alternative_min_distance'),
+        'explain': bool(data.get('explain')),
+    }
+
+
+def format_schedule(schedule_data):
+    """solve()의 결과를 API 응답 형식 {"worker_0": [codes...], ...}으로 변환합니다."""
+    return {f"worker_{worker}": list(codes) for worker, codes in schedule_data.items()}
+
+
+def horizon_options(data):
+    """HorizonSettingsForm.cleaned_data 중 plan_horizon()에 전달할 옵션"""
+    return {
+        'window_days': data.get('window_days') or DEFAULT_WINDOW_DAYS,
+        'overlap_days': DEFAULT_OVERLAP_DAYS if data.get('overlap_days') is None else data['overlap_days'],
+        'profile': data.get('profile') or None,
+    }
+
+
+def roster_options(data):
+    """LargeRosterSettingsForm.cleaned_data 중 plan_roster()에 전달할 옵션"""
+    return {
+        'team_size': data.get('team_size') or DEFAULT_TEAM_SIZE,
+        'lns_time': DEFAULT_LNS_TIME if data.get('lns_time') is None else data['lns_time'],
+        'profile': data.get('profile') or None,
+    }
@@ -0,0 +1,261 @@
+"""
+설정 기반 근무 종류와 규칙 (rule plan)
+
+rules.py의 기본 근무 종류(OFF/DAY/NIGHT/VACATION)와 DEFAULT_CONSTRAINTS 대신, 근무 종류와
+규칙을 설정(dict 또는 JSON 파일 경로)으로 정의할 수 있습니다. 설정은 한 번만 검사해
+RulePlan(근무 종류 표 + 인자를 붙인 제약조건/목적함수 목록)으로 만들고, 설정의 해시
+(fingerprint)별로 프로세스 안에 저장해 요청마다 다시 해석하지 않습니다.
+
+    {
+        "duties": [                                    # 근무 코드는 목록 순서 (0부터)
+            {"name": "OFF", "hours": 0, "type": "off"},
+            {"name": "DAY", "hours": 10, "type": "work", "color": "#38AFFF"},
+            ...
+        ],
+        "coverage": [{"duty": "DAY", "min": 1, "max": 2, "min_available": 3}],  # 날짜별 인원
+        "rest": [{"after": "NIGHT", "next": "OFF", "min_available": 2}],       # 다음 날 근무
+        "no_consecutive": ["OFF"],                                              # 연속 금지
+        "workload": {"min_work_days": 15, "min_hours": 160, "min_counts": {"NIGHT": 1}},
+        "objective": {"duty": "DAY", "weights": {"hours": 1, "weekday": 8, "holiday": 3, "total_hours": 1}}
+    }
+
+- type: work(근무 시간/근무일에 포함), off, leave(고정 근무로만 배정, 근무 가능 인원에서 제외)
+- min_available: 그날 근무 가능 인원이 이 값 이상일 때만 적용
+- 최대 근무 시간은 요청의 max_monthly_hours, objective가 null이면 목적함수 없이 실행 가능한 해만 찾음
+
+settings.SCHEDULE_RULE_CONFIGS로 이름을 붙여 등록하고, 요청의 rule_config 값으로 선택합니다.
+rule_config가 없는 요청은 기존 DEFAULT_CONSTRAINTS/setObjective를 그대로 사용합니다.
+"""
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from .duties import Duty
+
+DUTY_TYPES = ('work', 'off', 'leave')
+DEFAULT_COLOR = '#B9B9B9'
+CONFIG_KEYS = ('duties', 'coverage', 'rest', 'no_consecutive', 'workload', 'objective')
+OBJECTIVE_WEIGHTS = {'hours': 1, 'weekday': 8, 'holiday': 3, 'total_hours': 1}
+
+# DEFAULT_CONSTRAINTS/setObjective와 같은 규칙의 설정 (새 설정을 만들 때의 출발점)
+DEFAULT_RULE_CONFIG = {
+    'duties': [
+        {'name': 'OFF', 'hours': 0, 'type': 'off', 'color': '#FF7B7B'},
+        {'name': 'DAY', 'hours': 10, 'type': 'work', 'color': '#38AFFF'},
+        {'name': 'NIGHT', 'hours': 14, 'type': 'work', 'color': '#FFF064'},
+        {'name': 'VACATION', 'hours': 0, 'type': 'leave', 'color': '#B9B9B9'},
+    ],
+    'coverage': [
+        {'duty': 'DAY', 'min': 1, 'min_available': 3},
+        {'duty': 'NIGHT', 'min': 1, 'max': 1},
+    ],
+    'rest': [{'after': 'NIGHT', 'next': 'OFF', 'min_available': 2}],
+    'no_consecutive': ['OFF'],
+    'workload': {'min_work_days': 15, 'min_hours': 160, 'min_counts': {'NIGHT': 1}},
+    'objective': {'duty': 'DAY', 'weights': OBJECTIVE_WEIGHTS},
+}
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+class RuleConfigError(ValueError):
+    pass
+
+
+class BoundRule:
+    """인자를 붙인 rules.py 함수. ScheduleSolver가 rule(solver)로 호출하고 __name__으로 계측합니다."""
+
+    def __init__(self, func, label=None, **kwargs):
+        self.func = func
+        self.kwargs = kwargs
+        self.__name__ = f"{func.__name__}[{label}]" if label else func.__name__
+        self.__module__ = func.__module__
+        self.__qualname__ = self.__name__
+
+    def __call__(self, solver):
+        return self.func(solver, **self.kwargs)
+
+    def __repr__(self):
+        return f"<BoundRule {self.__name__}>"
+
+
+class RulePlan:
+    def __init__(self, duties, constraints, objective, fairness_duty, fingerprint):
+        self.duties = {duty.code: duty for duty in duties}
+        self.codes = {duty.name: duty.code for duty in duties}
+        self.work_codes = [duty.code for duty in duties if duty.type == 'work']
+        self.leave_codes = [duty.code for duty in duties if duty.type == 'leave']
+        self.constraints = constraints
+        self.objective = objective
+        # 목적함수가 평일/공휴일 근무 수를 맞추는 근무 (horizon.py의 carry_over)
+        self.fairness_duty = fairness_duty
+        self.fingerprint = fingerprint
+
+    def to_dict(self):
+        return {
+            'fingerprint': self.fingerprint,
+            'duties': [
+                {'code': code, 'name': duty.name, 'hours': duty.time, 'type': duty.type, 'color': duty.color}
+                for code, duty in self.duties.items()
+            ],
+            'constraints': [constraint.__name__ for constraint in self.constraints],
+            'objective': self.objective.__name__ if self.objective else None,
+        }
+
+
+def fingerprint(config):
+    encoded = json.dumps(config, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def _load(config):
+    if isinstance(config, (str, Path)):
+        try:
+            with open(config, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise RuleConfigError(f"규칙 설정 파일을 읽을 수 없습니다: {config} ({e})")
+    if not isinstance(config, dict):
+        raise RuleConfigError("규칙 설정은 dict 또는 JSON 파일 경로여야 합니다.")
+    return config
+
+
+def _count(value, name, minimum=0):
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+        raise RuleConfigError(f"{name}은(는) {minimum} 이상의 정수여야 합니다: {value!r}")
+    return value
+
+
+def _parse_duties(items):
+    if not isinstance(items, list) or not items:
+        raise RuleConfigError("duties는 근무 종류의 목록이어야 합니다.")
+    if len(items) > 255:
+        raise RuleConfigError("근무 종류는 255개까지 정의할 수 있습니다.")
+    duties = []
+    for code, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get('name'), str) or not item['name']:
+            raise RuleConfigError(f"근무 종류 {code}에 이름(name)이 필요합니다.")
+        if item['name'] in (duty.name for duty in duties):
+            raise RuleConfigError(f"근무 종류 이름이 중복됩니다: {item['name']}")
+        if item.get('type') not in DUTY_TYPES:
+            raise RuleConfigError(f"근무 종류 {item['name']}의 type은 {', '.join(DUTY_TYPES)} 중 하나여야 합니다.")
+        hours = _count(item.get('hours', 0), f"{item['name']}.hours")
+        duties.append(Duty(item['name'], code, hours, item.get('color', DEFAULT_COLOR), item['type']))
+    if not any(duty.type == 'work' for duty in duties):
+        raise RuleConfigError("type이 work인 근무 종류가 하나 이상 필요합니다.")
+    return duties
+
+
+def _compile(config, key):
+    # rules.py(OR-Tools)는 설정을 처음 해석할 때 불러옴 (폼 검증만 하는 웹 프로세스는 불러오지 않음)
+    from . import rules
+
+    unknown = set(config) - set(CONFIG_KEYS)
+    if unknown:
+        raise RuleConfigError(f"알 수 없는 규칙 설정 항목입니다: {', '.join(sorted(unknown))}")
+    duties = _parse_duties(config.get('duties'))
+    codes = {duty.name: duty.code for duty in duties}
+
+    def code(name, where):
+        if name not in codes:
+            raise RuleConfigError(f"{where}: 알 수 없는 근무 종류입니다: {name!r}")
+        return codes[name]
+
+    def items(name, kind=list, item_kind=dict):
+        value = config.get(name) or kind()
+        if not isinstance(value, kind) or (kind is list and not all(isinstance(item, item_kind) for item in value)):
+            raise RuleConfigError(f"{name}의 형식이 올바르지 않습니다.")
+        return value
+
+    constraints = [rules.addExactlyOne]
+    for item in items('coverage'):
+        duty = code(item.get('duty'), 'coverage')
+        minimum = _count(item.get('min', 0), 'coverage.min')
+        maximum = item.get('max')
+        if maximum is not None and _count(maximum, 'coverage.max') < minimum:
+            raise RuleConfigError(f"coverage {item['duty']}: max가 min보다 작습니다.")
+        constraints.append(BoundRule(
+            rules.addCoverage, item['duty'], duty=duty, minimum=minimum, maximum=maximum,
+            min_available=_count(item.get('min_available', 0), 'coverage.min_available'),
+        ))
+    for item in items('rest'):
+        after, next_duty = code(item.get('after'), 'rest.after'), code(item.get('next'), 'rest.next')
+        constraints.append(BoundRule(
+            rules.addRestAfter, f"{item['after']}->{item['next']}", after=after, next_duty=next_duty,
+            min_available=_count(item.get('min_available', 0), 'rest.min_available'),
+        ))
+    constraints.append(rules.addFixedAssignments)
+    for duty in duties:
+        if duty.type == 'leave':
+            constraints.append(BoundRule(rules.addOnlyWhenFixed, duty.name, duty=duty.code))
+    for name in items('no_consecutive', item_kind=str):
+        constraints.append(BoundRule(rules.addNoConsecutive, name, duty=code(name, 'no_consecutive')))
+
+    workload = items('workload', dict)
+    constraints.append(BoundRule(
+        rules.addWorkload,
+        min_work_days=_count(workload.get('min_work_days', 0), 'workload.min_work_days'),
+        min_hours=_count(workload.get('min_hours', 0), 'workload.min_hours'),
+        min_counts={code(name, 'workload.min_counts'): _count(value, f'min_counts.{name}')
+                    for name, value in (workload.get('min_counts') or {}).items()},
+        max_counts={code(name, 'workload.max_counts'): _count(value, f'max_counts.{name}')
+                    for name, value in (workload.get('max_counts') or {}).items()},
+    ))
+
+    objective = None
+    fairness_duty = None
+    if config.get('objective', {}) is not None:
+        objective_config = items('objective', dict)
+        work_codes = [duty.code for duty in duties if duty.type == 'work']
+        fairness_duty = code(objective_config['duty'], 'objective') if 'duty' in objective_config else work_codes[0]
+        weights = dict(OBJECTIVE_WEIGHTS, **(objective_config.get('weights') or {}))
+        if set(weights) != set(OBJECTIVE_WEIGHTS):
+            raise RuleConfigError(f"objective.weights는 {', '.join(OBJECTIVE_WEIGHTS)} 중에서 지정해야 합니다.")
+        objective = BoundRule(
+            rules.balanceObjective, duty=fairness_duty,
+            hours_weight=_count(weights['hours'], 'weights.hours'),
+            weekday_weight=_count(weights['weekday'], 'weights.weekday'),
+            holiday_weight=_count(weights['holiday'], 'weights.holiday'),
+            total_hours_weight=_count(weights['total_hours'], 'weights.total_hours'),
+        )
+    return RulePlan(duties, constraints, objective, fairness_duty, key)
+
+
+def compile_plan(config):
+    """규칙 설정(dict 또는 JSON 파일 경로) → RulePlan. 같은 설정은 한 번만 검사/변환합니다."""
+    config = _load(config)
+    key = fingerprint(config)
+    with _plans_lock:
+        plan = _plans.get(key)
+    if plan is None:
+        plan = _compile(config, key)
+        with _plans_lock:
+            plan = _plans.setdefault(key, plan)
+    return plan
+
+
+def _configured_rule_configs():
+    from django.conf import settings
+    if not settings.configured:
+        return {}
+    return getattr(settings, 'SCHEDULE_RULE_CONFIGS', {})
+
+
+def rule_config_names():
+    return list(_configured_rule_configs())
+
+
+def get_plan(name):
+    """settings.SCHEDULE_RULE_CONFIGS의 이름으로 RulePlan을 찾습니다."""
+    configs = _configured_rule_configs()
+    if name not in configs:
+        raise KeyError(f"알 수 없는 규칙 설정입니다: {name}")
+    return compile_plan(configs[name])
+
+
+def plan_for(params):
+    """params_from_form() 형식 입력의 RulePlan (rule_config가 없으면 None: 기본 규칙)"""
+    name = params.get('rule_config')
+    return get_plan(name) if name else None
@@ -0,0 +1,126 @@
+"""
+CP-SAT 호출 전 입력 사전 검사 (infeasibility pre-check)
+
+고정 근무와 설정값만으로 해가 없음이 분명한 경우를 CP-SAT 없이 찾아냅니다.
+모두 제약조건(rules.py)의 필요조건이므로 여기서 걸리면 계산할 필요가 없고,
+통과했다고 해가 있다는 보장은 없습니다. (그 경우는 ScheduleSolver(explain=True)가
+충돌하는 제약조건/고정 근무를 찾습니다.)
+
+충돌 항목 형식: {'rule': 제약조건 함수 이름, 'message': ..., 'worker': n, 'day': d(1-based)}
+
+설정 기반 규칙(rule_config, plan.py)을 사용하는 입력은 범위/근무 코드만 검사합니다.
+"""
+from .plan import plan_for
+from .duties import ALL_DUTIES_DICT, DAY, NIGHT, OFF, VACATION
+
+MIN_WORK_DAYS = 15
+MIN_MONTHLY_HOURS = 160
+MAX_SHIFT_HOURS = max(ALL_DUTIES_DICT[code].time for code in (DAY, NIGHT))
+
+
+def _conflict(rule, message, worker=None, day=None):
+    conflict = {'rule': rule, 'message': message}
+    if worker is not None:
+        conflict['worker'] = worker
+    if day is not None:
+        conflict['day'] = day
+    return conflict
+
+
+def no_schedule_message(conflicts):
+    """해가 없을 때 응답/작업 오류 메시지"""
+    if not conflicts:
+        return '해결 가능한 스케줄을 찾지 못했습니다.'
+    return '해결 가능한 스케줄이 없습니다: ' + '; '.join(conflict['message'] for conflict in conflicts)
+
+
+def check_assignments(assignments, num_workers, num_days, duties=ALL_DUTIES_DICT, name="고정 근무"):
+    """{(worker, 1-based day): shift}의 근무자 번호, 날짜, 근무 코드 범위 검사. 반환값: 충돌 목록"""
+    conflicts = []
+    for (n, d), s in assignments.items():
+        if not 0 <= n < num_workers:
+            conflicts.append(_conflict('input', f"{name}의 근무자 번호가 범위를 벗어났습니다: {n}", n, d))
+        if not 1 <= d <= num_days:
+            conflicts.append(_conflict('input', f"{name}의 날짜가 범위를 벗어났습니다: {d}", n, d))
+        if s not in duties:
+            conflicts.append(_conflict('input', f"알 수 없는 근무 코드입니다: {s}", n, d))
+    return conflicts
+
+
+def _check_input(params, duties=ALL_DUTIES_DICT):
+    return check_assignments(
+        {(item['worker'], item['day']): item['shift'] for item in params['fixed_assignments']},
+        params['num_workers'], params['num_days'], duties,
+    )
+
+
+def precheck(params):
+    """params_from_form() 형식의 입력을 검사해 충돌 목록을 반환합니다. (빈 리스트면 통과)"""
+    plan = plan_for(params)
+    if plan:
+        return _check_input(params, plan.duties)
+    conflicts = _check_input(params)
+    if conflicts:
+        return conflicts
+
+    num_workers, num_days = params['num_workers'], params['num_days']
+    max_hours = params['max_monthly_hours']
+    # fixed[n][d]: 0-based 날짜의 고정 근무 코드 (없으면 None)
+    fixed = [[None] * num_days for _ in range(num_workers)]
+    for item in params['fixed_assignments']:
+        fixed[item['worker']][item['day'] - 1] = item['shift']
+
+    if max_hours < MIN_MONTHLY_HOURS:
+        conflicts.append(_conflict(
+            'addMonthlyWorkConstraints',
+            f"최대 근무 시간({max_hours}시간)이 최소 근무 시간({MIN_MONTHLY_HOURS}시간)보다 작습니다."))
+
+    # 날짜별: 야간 근무 정확히 1명, 3명 이상 가능하면 주간 근무 1명 이상
+    available = []
+    for d in range(num_days):
+        codes = [fixed[n][d] for n in range(num_workers)]
+        available.append(sum(code != VACATION for code in codes))
+        nights = codes.count(NIGHT)
+        if nights > 1:
+            conflicts.append(_conflict(
+                'addDailyShiftRequirements', f"{d + 1}일에 야간 근무가 {nights}명 고정되어 있습니다.", day=d + 1))
+        elif nights == 0 and all(code is not None for code in codes):
+            conflicts.append(_conflict(
+                'addDailyShiftRequirements', f"{d + 1}일에 야간 근무를 할 수 있는 근무자가 없습니다.", day=d + 1))
+        if available[d] >= 3 and all(code is not None and code != DAY for code in codes):
+            conflicts.append(_conflict(
+                'addDailyShiftRequirements', f"{d + 1}일에 주간 근무를 할 수 있는 근무자가 없습니다.", day=d + 1))
+
+    for n in range(num_workers):
+        codes = fixed[n]
+        # 근무자별: 근무일 15일 이상, 근무 시간 160시간 이상 max_monthly_hours 이하, 야간 1회 이상
+        workable = sum(code in (None, DAY, NIGHT) for code in codes)
+        if workable < MIN_WORK_DAYS:
+            conflicts.append(_conflict(
+                'addMonthlyWorkConstraints',
+                f"근무자 {n}은 고정된 OFF/휴가로 근무 가능한 날이 {workable}일뿐입니다. (최소 {MIN_WORK_DAYS}일)", n))
+        elif workable * MAX_SHIFT_HOURS < MIN_MONTHLY_HOURS:
+            conflicts.append(_conflict(
+                'addMonthlyWorkConstraints',
+                f"근무자 {n}은 근무 가능한 날이 {workable}일이라 {MIN_MONTHLY_HOURS}시간을 채울 수 없습니다.", n))
+        fixed_hours = sum(ALL_DUTIES_DICT[code].time for code in codes if code is not None)
+        if fixed_hours > max_hours:
+            conflicts.append(_conflict(
+                'addMonthlyWorkConstraints',
+                f"근무자 {n}의 고정 근무 시간({fixed_hours}시간)이 최대 근무 시간({max_hours}시간)을 넘습니다.", n))
+        if all(code is not None and code != NIGHT for code in codes):
+            conflicts.append(_conflict(
+                'addMonthlyWorkConstraints', f"근무자 {n}이 야간 근무를 할 수 있는 날이 없습니다.", n))
+
+        # 근무자별 연속된 날: 연속 OFF 금지, 야간 근무 다음 날 OFF (다음 날 2명 이상 가능할 때)
+        for d in range(num_days - 1):
+            today, tomorrow = codes[d], codes[d + 1]
+            if today == OFF and tomorrow == OFF:
+                conflicts.append(_conflict(
+                    'addNoConsecutiveOffDays', f"근무자 {n}의 {d + 1}일, {d + 2}일이 모두 OFF로 고정되어 있습니다.", n, d + 1))
+            if today == NIGHT and tomorrow not in (None, OFF) and available[d + 1] >= 2:
+                conflicts.append(_conflict(
+                    'addNightShiftRestRequirement',
+                    f"근무자 {n}은 {d + 1}일 야간 근무 다음 날 OFF여야 하지만 {ALL_DUTIES_DICT[tomorrow].name}로 고정되어 있습니다.",
+                    n, d + 2))
+    return conflicts
@@ -0,0 +1,113 @@
+"""
+CP-SAT 탐색 프로필
+
+프로필은 CpSolver 파라미터 묶음입니다.
+- num_search_workers : 병렬 탐색 스레드 수 (0이면 코어 수에 맞춰 자동)
+- time_limit         : 최대 계산 시간 (초)
+- relative_gap_limit : 목적함수 값과 하한의 상대 차이가 이 값 이하이면 종료
+- stall_time         : 이 시간(초) 동안 목적함수 값이 개선되지 않으면 종료 (None이면 사용 안 함)
+- symmetry_breaking  : 입력이 같은 근무자끼리 사전순 정렬 제약을 추가 (rules.addSymmetryBreaking)
+- objective_stages   : [[항목, 시간(초)], ...]을 주면 가중합 대신 목적함수 항목을 순서대로 하나씩
+                       최소화하고, 찾은 값을 제약조건으로 고정한 뒤 다음 항목으로 넘어감 (계층형 목적함수)
+                       항목: weekday, holiday, hours, total_hours (rules.balanceObjective)
+
+기본 프로필은 DEFAULT_PROFILES에만 정의합니다. settings.SCHEDULE_SOLVER_PROFILES에는 바꿀 항목이나
+새 프로필만 적고 (이름이 같으면 적은 항목만 기본값 대신 사용), settings.SCHEDULE_SOLVER_DEFAULT_PROFILE로
+기본 프로필을 지정합니다.
+"""
+import copy
+
+
+class SolverProfile:
+    def __init__(self, name, num_search_workers=0, time_limit=10.0, relative_gap_limit=0.0, stall_time=None,
+                 symmetry_breaking=False, objective_stages=None):
+        self.name = name
+        self.num_search_workers = num_search_workers
+        self.time_limit = time_limit
+        self.relative_gap_limit = relative_gap_limit
+        self.stall_time = stall_time
+        self.symmetry_breaking = symmetry_breaking
+        self.objective_stages = [tuple(stage) for stage in objective_stages] if objective_stages else None
+
+    def apply(self, parameters):
+        """CpSolver.parameters에 프로필 값을 반영"""
+        parameters.num_workers = self.num_search_workers
+        parameters.max_time_in_seconds = self.time_limit
+        parameters.relative_gap_limit = self.relative_gap_limit
+
+    def limited(self, max_threads):
+        """탐색 스레드를 max_threads개 이하로 줄인 사본 (num_search_workers=0이면 max_threads개, max_threads가 없으면 그대로)"""
+        if not max_threads:
+            return self
+        profile = copy.copy(self)
+        profile.num_search_workers = min(self.num_search_workers or max_threads, max_threads)
+        return profile
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'num_search_workers': self.num_search_workers,
+            'time_limit': self.time_limit,
+            'relative_gap_limit': self.relative_gap_limit,
+            'stall_time': self.stall_time,
+            'symmetry_breaking': self.symmetry_breaking,
+            'objective_stages': [list(stage) for stage in self.objective_stages] if self.objective_stages else None,
+        }
+
+
+DEFAULT_PROFILES = {
+    # 화면에서 바로 결과를 기다리는 요청
+    'interactive': {
+        'num_search_workers': 8,
+        'time_limit': 10.0,
+        'relative_gap_limit': 0.01,
+        'stall_time': 3.0,
+    },
+    # 야간 일괄 계산: 모든 코어 사용, 최적해 증명까지 충분한 시간
+    'batch': {
+        'num_search_workers': 0,
+        'time_limit': 600.0,
+        'relative_gap_limit': 0.0,
+        'stall_time': 120.0,
+    },
+    # 여러 계산을 프로세스마다 하나씩 동시에 실행 (일괄 계산): 스레드 1개
+    'throughput': {
+        'num_search_workers': 1,
+        'time_limit': 10.0,
+        'relative_gap_limit': 0.01,
+        'stall_time': 3.0,
+    },
+    # 공정성 항목을 우선순위대로: 평일 DAY 편차 → 공휴일 DAY 편차 → 근무시간 편차 → 총 근무시간
+    'fair': {
+        'num_search_workers': 8,
+        'time_limit': 10.0,
+        'relative_gap_limit': 0.0,
+        'stall_time': 2.0,
+        'objective_stages': [['weekday', 3.0], ['holiday', 2.0], ['hours', 3.0], ['total_hours', 2.0]],
+    },
+}
+DEFAULT_PROFILE_NAME = 'interactive'
+
+
+def _configured_profiles():
+    """DEFAULT_PROFILES에 settings.SCHEDULE_SOLVER_PROFILES의 값을 덮어쓴 프로필과 기본 프로필 이름"""
+    from django.conf import settings
+    if not settings.configured:
+        return DEFAULT_PROFILES, DEFAULT_PROFILE_NAME
+    overrides = getattr(settings, 'SCHEDULE_SOLVER_PROFILES', {})
+    profiles = {name: dict(DEFAULT_PROFILES.get(name, {}), **overrides.get(name, {}))
+                for name in {**DEFAULT_PROFILES, **overrides}}
+    return profiles, getattr(settings, 'SCHEDULE_SOLVER_DEFAULT_PROFILE', DEFAULT_PROFILE_NAME)
+
+
+def profile_names():
+    return list(_configured_profiles()[0])
+
+
+def get_profile(name=None):
+    """이름으로 SolverProfile을 찾습니다. name이 없으면 기본 프로필을 반환합니다."""
+    profiles, default_name = _configured_profiles()
+    name = name or default_name
+    if name not in profiles:
+        raise KeyError(f"알 수 없는 solver 프로필입니다: {name}")
+    return SolverProfile(name, **profiles[name])
@@ -0,0 +1,73 @@
+"""
+부분 재계산 (schedule repair)
+
+이미 확정된 스케줄에서 고정 근무가 바뀌었을 때(예: 20일 병가), 변경된 날짜 앞뒤
+window일만 다시 계산하고 나머지 날짜는 기존 배정으로 고정합니다. 고정된 날짜도 모델에
+남아 있으므로 경계에서의 야간 후 휴식(addNightShiftRestRequirement), 연속 OFF 금지
+(addNoConsecutiveOffDays), 월간 근무시간 조건이 그대로 적용되고, CP-SAT presolve가
+고정된 변수를 제거해 실제 탐색은 window 안의 작은 문제만 풉니다.
+목적함수는 기존 스케줄과 달라지는 배정 수의 최소화입니다.
+"""
+from .solve import ScheduleSolver, SolveContext, get_weekends, normalize_schedule, rule_set
+from .rules import addFrozenAssignments, minimizeChanges
+
+DEFAULT_REPAIR_TIME_LIMIT = 1.0
+
+
+def _free_days(changed_days, window, num_days):
+    """변경된 0-based 날짜들의 앞뒤 window일 (0-based 집합)"""
+    return {
+        d for day in changed_days
+        for d in range(max(0, day - window), min(num_days, day + window + 1))
+    }
+
+
+def repair_schedule(params, schedule, changes, window=3, time_limit=DEFAULT_REPAIR_TIME_LIMIT, expand=True, **solver_kwargs):
+    """
+    - params   : params_from_form() 형식의 설정 (기존 고정 근무 포함)
+    - schedule : 기존 스케줄 {worker: [codes]} 또는 {"worker_N": [...]}
+    - changes  : 새로 바뀐 고정 근무 {(worker, 1-based day): shift}
+    - window   : 변경일 앞뒤로 다시 계산할 일수
+    - expand   : window 안에서 해가 없으면 window를 두 배씩 넓혀 다시 시도 (최대 한 달 전체)
+    반환값: (ScheduleSolver, 새 스케줄 또는 None)
+    """
+    num_days = params['num_days']
+    base_schedule = normalize_schedule(schedule)
+    fixed_assignments = {(item['worker'], item['day']): item['shift'] for item in params['fixed_assignments']}
+    fixed_assignments.update(changes)
+    changed_days = {day - 1 for (_, day) in changes}
+    plan, constraints, _ = rule_set(params)
+
+    while True:
+        free_days = _free_days(changed_days, window, num_days)
+        solver = ScheduleSolver(
+            num_workers=params['num_workers'],
+            num_days=num_days,
+            fixed_assignments=fixed_assignments,
+            weekends=get_weekends(num_days, params['start_day_of_week']),
+            holidays=params['holidays'],
+            max_monthly_hours=params['max_monthly_hours'],
+            constraints=constraints + [addFrozenAssignments],
+            objectiveFunc=minimizeChanges,
+            time_limit=time_limit,
+            hint=base_schedule,
+            context=SolveContext(base_schedule=base_schedule, free_days=free_days),
+            plan=plan,
+            **solver_kwargs
+        )
+        result = solver.solve()
+        if result or not expand or len(free_days) == num_days:
+            solver.stats['window'] = window
+            return solver, result
+        window = max(1, window * 2)
+
+
+def diff_schedules(before, after):
+    """두 스케줄에서 달라진 배정 목록 (day는 1-based)"""
+    before = normalize_schedule(before)
+    return [
+        {'worker': n, 'day': d + 1, 'from': before[n][d], 'to': code}
+        for n, codes in after.items()
+        for d, code in enumerate(codes)
+        if before[n][d] != code
+    ]
@@ -0,0 +1,226 @@
+"""
+대규모 근무자(수백 명) 스케줄 계산 (팀 분할 + LNS)
+
+근무자 전체를 한 모델로 풀면 변수 수가 근무자 수에 비례해 늘고 탐색은 그보다 훨씬 느려지므로,
+근무자를 team_size명 안팎의 팀(병동 단위)으로 나눠 계산합니다.
+
+1. 팀 분할: 근무자 번호 순서대로 크기가 비슷한 팀으로 나누고, 팀마다 기존 월간 모델
+   (제약조건, 목적함수 그대로)을 여러 프로세스에서 동시에 풉니다. 일일 근무 인원
+   (addDailyShiftRequirements 등)과 야간 후 휴식은 팀마다 적용됩니다.
+2. LNS (large neighbourhood search): 팀 하나에서 임의의 근무자 free_workers명 × 연속된
+   free_days일만 다시 계산하고 나머지 칸은 현재 배정으로 고정합니다. 목적함수는 팀 밖 근무자의
+   값 범위(outside)를 포함한 전체 근무자 기준의 공정성(rules.balanceObjective)이므로, 더 좋아지면
+   받아들이고 아니면 버립니다. 절반은 전체 편차를 만드는 근무자(최대/최소)가 속한 팀을 고릅니다.
+   제약조건은 모두 다시 적용하므로 근무 인원 등 규칙은 항상 지켜집니다.
+"""
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .params import DEFAULT_LNS_TIME, DEFAULT_TEAM_SIZE, roster_options
+from .rules import ALL_DUTIES_DICT, DAY
+from .solve import SolveContext, build_solver, get_weekends, rule_set
+
+DEFAULT_LNS_ITERATION_TIME = 1.0
+DEFAULT_FREE_WORKERS = 6
+DEFAULT_FREE_DAYS = 14
+# rules.balanceObjective의 기본 가중치
+DEFAULT_WEIGHTS = {'hours_weight': 1, 'weekday_weight': 8, 'holiday_weight': 3, 'total_hours_weight': 1}
+
+
+def partition_teams(num_workers, team_size):
+    """근무자 번호 순서대로 나눈 팀 목록. 팀 크기 차이는 최대 1명"""
+    count = max(1, math.ceil(num_workers / team_size))
+    base, extra = divmod(num_workers, count)
+    teams = []
+    start = 0
+    for t in range(count):
+        size = base + (t < extra)
+        teams.append(list(range(start, start + size)))
+        start += size
+    return teams
+
+
+def team_params(params, team, fixed_assignments=None):
+    """팀 근무자만의 params. fixed_assignments {(global n, 1-based day): s}를 주면 그것을 사용"""
+    local = {n: i for i, n in enumerate(team)}
+    if fixed_assignments is None:
+        fixed_assignments = {(item['worker'], item['day']): item['shift'] for item in params['fixed_assignments']}
+    return dict(
+        params,
+        num_workers=len(team),
+        fixed_assignments=[
+            {'worker': local[n], 'day': d, 'shift': s}
+            for (n, d), s in sorted(fixed_assignments.items()) if n in local
+        ],
+    )
+
+
+def _solve_team(params, profile, time_limit):
+    """프로세스 풀에서 팀 하나를 계산. 반환값: (근무 코드 행렬 또는 None, stats)"""
+    solver = build_solver(params, profile=profile, time_limit=time_limit)
+    solver.solve()
+    return solver.schedule_matrix, solver.stats
+
+
+class FairnessEvaluator:
+    """근무 코드 행렬의 근무자별 공정성 값과 목적함수 값 (rules.balanceObjective와 같은 계산)"""
+
+    def __init__(self, params, duties, fairness_duty, weights):
+        num_days = params['num_days']
+        holidays = set(get_weekends(num_days, params['start_day_of_week'])) | {d - 1 for d in params['holidays']}
+        self.is_holiday = np.array([d in holidays for d in range(num_days)])
+        self.hours = np.zeros(max(duties) + 1, dtype=np.int64)
+        for code, duty in duties.items():
+            if duty.type == 'work':
+                self.hours[code] = duty.time
+        self.fairness_duty = fairness_duty
+        self.weights = weights
+
+    def values(self, matrix):
+        """{'hours', 'weekday_day', 'holiday_day'}: 근무자별 배열"""
+        duty = matrix == self.fairness_duty
+        return {
+            'hours': self.hours[matrix].sum(axis=1),
+            'weekday_day': duty[:, ~self.is_holiday].sum(axis=1),
+            'holiday_day': duty[:, self.is_holiday].sum(axis=1),
+        }
+
+    def terms(self, matrix):
+        values = self.values(matrix)
+        spread = {key: int(value.max() - value.min()) for key, value in values.items()}
+        return {'hours': spread['hours'], 'weekday': spread['weekday_day'], 'holiday': spread['holiday_day'],
+                'total_hours': int(values['hours'].sum())}
+
+    def objective(self, matrix):
+        terms = self.terms(matrix)
+        return (terms['hours'] * self.weights['hours_weight'] + terms['weekday'] * self.weights['weekday_weight']
+                + terms['holiday'] * self.weights['holiday_weight']
+                + terms['total_hours'] * self.weights['total_hours_weight'])
+
+    def outside(self, matrix, workers):
+        """workers를 제외한 근무자들의 값 범위와 총 근무시간 (SolveContext(outside=...))"""
+        mask = np.ones(matrix.shape[0], dtype=bool)
+        mask[workers] = False
+        if not mask.any():
+            return None
+        values = {key: value[mask] for key, value in self.values(matrix).items()}
+        outside = {key: (int(value.min()), int(value.max())) for key, value in values.items()}
+        outside['total_hours'] = int(values['hours'].sum())
+        return outside
+
+    def extreme_workers(self, matrix):
+        """각 편차의 최대/최소 근무자 번호"""
+        return [int(index) for value in self.values(matrix).values() for index in (value.argmax(), value.argmin())]
+
+
+def fairness_evaluator(params):
+    """params의 규칙(기본 규칙 또는 rule_config)에 맞춘 (FairnessEvaluator, 목적함수 또는 None)"""
+    plan, _, objective = rule_set(params)
+    duties = plan.duties if plan else ALL_DUTIES_DICT
+    fairness_duty = plan.fairness_duty if plan else DAY
+    weights = dict(DEFAULT_WEIGHTS, **{key: value for key, value in (getattr(objective, 'kwargs', None) or {}).items()
+                                       if key in DEFAULT_WEIGHTS})
+    return FairnessEvaluator(params, duties, fairness_duty, weights), objective
+
+
+def _solve_teams(params, teams, profile, time_limit, max_workers):
+    """1단계: 팀마다 독립적으로 계산 (max_workers개 프로세스)"""
+    jobs = [(team_params(params, team), profile, time_limit) for team in teams]
+    if max_workers <= 1 or len(teams) == 1:
+        return [_solve_team(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(teams))) as executor:
+        return list(executor.map(_solve_team, *zip(*jobs)))
+
+
+def plan_roster(params, team_size=DEFAULT_TEAM_SIZE, lns_time=DEFAULT_LNS_TIME,
+                lns_iteration_time=DEFAULT_LNS_ITERATION_TIME, free_workers=DEFAULT_FREE_WORKERS,
+                free_days=DEFAULT_FREE_DAYS, profile=None, team_time_limit=None, max_workers=1, seed=0,
+                on_progress=None):
+    """
+    - params             : params_from_form() 형식의 설정 (num_workers는 전체 근무자 수)
+    - team_size          : 팀 하나의 근무자 수 (팀마다 일일 근무 인원 규칙 적용)
+    - lns_time           : 2단계(LNS) 전체 시간 (초, 0이면 1단계 결과를 그대로 반환)
+    - lns_iteration_time : LNS 한 번의 계산 시간 (초)
+    - free_workers, free_days : LNS 한 번에 다시 계산할 팀 근무자 수와 연속 일수
+    - team_time_limit    : 1단계 팀 하나의 계산 시간 (None이면 프로필의 time_limit)
+    - max_workers        : 1단계에서 동시에 실행할 프로세스 수
+    - on_progress        : 1단계가 끝날 때와 LNS에서 해가 좋아질 때마다 on_progress(stats) 호출
+    반환값: (스케줄 {worker: [codes]} 또는 None, stats)
+    """
+    start = time.monotonic()
+    evaluator, objective = fairness_evaluator(params)
+    fixed_assignments = {(item['worker'], item['day']): item['shift'] for item in params['fixed_assignments']}
+    teams = partition_teams(params['num_workers'], team_size)
+    team_of = {n: t for t, team in enumerate(teams) for n in team}
+
+    # 1단계: 팀별 계산
+    results = _solve_teams(params, teams, profile,
+                           team_time_limit if team_time_limit is not None else (profile.time_limit if profile else None),
+                           max_workers)
+    stats = {
+        'teams': len(teams),
+        'team_sizes': sorted({len(team) for team in teams}),
+        'team_status': [team_stats['status'] for _, team_stats in results],
+        'phase1_seconds': time.monotonic() - start,
+    }
+    failed = [t for t, (matrix, _) in enumerate(results) if matrix is None]
+    if failed:
+        stats['failed_teams'] = [{'team': t, 'workers': [teams[t][0], teams[t][-1]]} for t in failed]
+        stats['wall_time'] = time.monotonic() - start
+        return None, stats
+
+    matrix = np.concatenate([team_matrix for team_matrix, _ in results])
+    current = evaluator.objective(matrix)
+    stats.update(phase1_objective=current, objective=current, lns_iterations=0, lns_improvements=0,
+                 trajectory=[(round(time.monotonic() - start, 3), current)])
+    if on_progress:
+        on_progress(dict(stats))
+
+    # 2단계: LNS
+    rng = random.Random(seed)
+    num_days = params['num_days']
+    free_days = min(free_days, num_days)
+    lns_end = time.monotonic() + lns_time
+    while objective is not None and time.monotonic() < lns_end:
+        if rng.random() < 0.5:
+            t = team_of[rng.choice(evaluator.extreme_workers(matrix))]
+        else:
+            t = rng.randrange(len(teams))
+        team = teams[t]
+        freed = rng.sample(team, min(free_workers, len(team)))
+        first = rng.randrange(num_days - free_days + 1)
+        window = range(first, first + free_days)
+
+        # 고정 근무와 다시 계산하지 않는 칸은 현재 배정으로 고정
+        fixed = {(n, d + 1): int(matrix[n, d]) for n in team for d in range(num_days)
+                 if n not in freed or d not in window}
+        fixed.update({(n, d): s for (n, d), s in fixed_assignments.items() if team_of.get(n) == t})
+        solver = build_solver(
+            team_params(params, team, fixed),
+            profile=profile,
+            time_limit=min(lns_iteration_time, max(0.01, lns_end - time.monotonic())),
+            hint={i: matrix[n].tolist() for i, n in enumerate(team)},
+            context=SolveContext(outside=evaluator.outside(matrix, team)),
+        )
+        solver.solve()
+        stats['lns_iterations'] += 1
+        if solver.schedule_matrix is None:
+            continue
+        candidate = matrix.copy()
+        candidate[team] = solver.schedule_matrix
+        value = evaluator.objective(candidate)
+        if value < current:
+            matrix, current = candidate, value
+            stats['lns_improvements'] += 1
+            stats['objective'] = current
+            stats['trajectory'].append((round(time.monotonic() - start, 3), current))
+            if on_progress:
+                on_progress(dict(stats))
+
+    stats['terms'] = evaluator.terms(matrix)
+    stats['wall_time'] = time.monotonic() - start
+    return dict(enumerate(matrix.tolist())), stats
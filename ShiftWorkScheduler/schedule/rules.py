@@ -1,126 +1,287 @@
+import numpy as np
 from ortools.sat.python import cp_model
 
-class Duty:
-    def __init__(self, name, code, time, color):
-        self.name = name
-        self.code = code
-        self.time = time
-        self.color = color
-
-ALL_DUTIES = [
-    Duty("OFF", 0, 0, "#FF7B7B"),
-    Duty("DAY", 1, 10, "#38AFFF"),
-    Duty("NIGHT", 2, 14, "#FFF064"),
-    Duty("VACATION", 3, 0, "#B9B9B9")
-]
-NUM_SHIFT = len(ALL_DUTIES)
-DUTIES_CODE = {duty.name: duty.code for duty in ALL_DUTIES}
-ALL_DUTIES_DICT = {duty.code: duty for duty in ALL_DUTIES}
-
-OFF = DUTIES_CODE["OFF"]
-DAY = DUTIES_CODE["DAY"]
-NIGHT = DUTIES_CODE["NIGHT"]
-VACATION = DUTIES_CODE["VACATION"]
+from .duties import (
+    ALL_DUTIES, ALL_DUTIES_DICT, DAY, DUTIES_CODE, NIGHT, NUM_SHIFT, OFF, VACATION, WORK_SHIFTS, Duty,
+)
+
+# 입력 presolve(ScheduleSolver.presolveValues)로 값이 정해진 변수는 self.true/self.false 상수입니다.
+# 제약조건은 이미 만족된 부분을 건너뛰고 남은 부분만 모델에 추가합니다.
+# 근무 가능 인원에 따라 적용하는 제약조건은 self.whenAvailable()의 enforcement literal 목록을 붙입니다.
+# (모델 템플릿(templates.py)을 만들 때는 요청마다 값을 정하는 리터럴, 아니면 [] 또는 None: 적용 안 함)
 
 # 제약조건 1: 하루에 한 가지 근무만 배정
 def addExactlyOne(self):
-    for n in self.all_workers:
-        for d in self.all_days:
-            self.model.AddExactlyOne(self.shifts[(n, d, s)] for s in self.all_shifts)
+    for day_shifts in self.shifts.reshape(-1, self.num_shifts).tolist():
+        literals = [var for var in day_shifts if var is not self.false]
+        if len(literals) == 1 and literals[0] is self.true:
+            continue
+        self.model.AddExactlyOne(literals)
 
-# 제약조건 2: 일일 근무 요구사항
+# 제약조건 2: 일일 근무 요구사항 (근무 가능 인원은 휴가 고정 근무로 정해지므로 계산 전에 판단)
 def addDailyShiftRequirements(self):
     for d in self.all_days:
-        available_workers = self.num_workers - sum(self.shifts[(n, d, VACATION)] for n in self.all_workers)
-        has_at_least_3_workers = self.model.NewBoolVar(f'has_at_least_3_workers_d{d}')
-        self.model.Add(available_workers >= 3).OnlyEnforceIf(has_at_least_3_workers)
-        self.model.Add(available_workers < 3).OnlyEnforceIf(has_at_least_3_workers.Not())
-        self.model.Add(sum(self.shifts[(n, d, DAY)] for n in self.all_workers) >= 1).OnlyEnforceIf(has_at_least_3_workers)
-        self.model.Add(sum(self.shifts[(n, d, NIGHT)] for n in self.all_workers) == 1)
-
-# 제약조건 3: 야간 근무 후 휴식 요구사항
+        enforce = self.whenAvailable(d, 3)
+        if enforce is not None:
+            self.model.Add(self.day_shift_count[d][DAY] >= 1).OnlyEnforceIf(enforce)
+        self.model.Add(self.day_shift_count[d][NIGHT] == 1)
+
+# 제약조건 3: 야간 근무 후 휴식 요구사항 (다음 날 근무 가능 인원이 2명 이상일 때)
 def addNightShiftRestRequirement(self):
     for d in range(self.num_days - 1):
-        available_workers_next_day = self.num_workers - sum(self.shifts[(n, d + 1, VACATION)] for n in self.all_workers)
-        has_at_least_2_workers_next_day = self.model.NewBoolVar(f'has_at_least_2_workers_d{d+1}')
-        self.model.Add(available_workers_next_day >= 2).OnlyEnforceIf(has_at_least_2_workers_next_day)
-        self.model.Add(available_workers_next_day < 2).OnlyEnforceIf(has_at_least_2_workers_next_day.Not())
+        enforce = self.whenAvailable(d + 1, 2)
+        if enforce is None:
+            continue
         for n in self.all_workers:
-            self.model.AddImplication(self.shifts[(n, d, NIGHT)], self.shifts[(n, d + 1, OFF)]).OnlyEnforceIf(has_at_least_2_workers_next_day)
+            night, off = self.shifts[n, d, NIGHT], self.shifts[n, d + 1, OFF]
+            if night is not self.false and off is not self.true:
+                self.model.AddImplication(night, off).OnlyEnforceIf(enforce)
+
+    # 이전 기간 마지막 날(previous_shifts)에 야간 근무였다면 첫날 OFF
+    enforce = self.whenAvailable(0, 2)
+    if enforce is not None:
+        off_first_day = [
+            self.shifts[n, 0, OFF] for n, code in (self.previous_shifts or {}).items()
+            if code == NIGHT and self.shifts[n, 0, OFF] is not self.true
+        ]
+        if off_first_day:
+            self.model.AddBoolAnd(off_first_day).OnlyEnforceIf(enforce)
 
 
 # 제약조건 4: 고정 근무 배정
 def addFixedAssignments(self):
     if self.fixed_assignments:
         for (n, d), s in self.fixed_assignments.items():
-            self.model.Add(self.shifts[(n, d, s)] == 1)
+            if self.shifts[n, d, s] is not self.true:
+                self.model.Add(self.shifts[n, d, s] == 1)
 
 # 제약조건 5: 휴가는 고정 근무가 아니라면 배정하지 말 것
 def addVacationRestrictions(self):
-    for n in self.all_workers:
-        for d in self.all_days:
-            if not self.fixed_assignments or (n, d) not in self.fixed_assignments:
-                self.model.Add(self.shifts[(n, d, VACATION)] == 0)
+    addOnlyWhenFixed(self, VACATION)
 
 # 제약조건 6: 연속 OFF 금지
 def addNoConsecutiveOffDays(self):
-    for n in self.all_workers:
-        for d in range(self.num_days - 1):
-            self.model.Add(self.shifts[(n, d, OFF)] + self.shifts[(n, d + 1, OFF)] <= 1)
+    off = self.shifts[:, :, OFF]
+    for today, tomorrow in zip(off[:, :-1].ravel().tolist(), off[:, 1:].ravel().tolist()):
+        if today is not self.false and tomorrow is not self.false:
+            self.model.AddAtMostOne([today, tomorrow])
+
+    # 이전 기간 마지막 날(previous_shifts)이 OFF였다면 첫날은 OFF 불가
+    off_before = [
+        self.shifts[n, 0, OFF].Not() for n, code in (self.previous_shifts or {}).items()
+        if code == OFF and self.shifts[n, 0, OFF] is not self.false
+    ]
+    if off_before:
+        self.model.AddBoolAnd(off_before)
 
 # 제약조건 7: 한 달 근무시간 160시간 초과, 최소 한 번 야간 근무, 근무일 15일 이상
 def addMonthlyWorkConstraints(self):
     for n in self.all_workers:
-        total_work_hours = cp_model.LinearExpr.Sum([
-            self.shifts[(n, d, s)] * ALL_DUTIES_DICT[s].time
-            for d in self.all_days for s in [DAY, NIGHT]
-        ])
-        total_work_days = cp_model.LinearExpr.Sum([
-            self.shifts[(n, d, s)]
-            for d in self.all_days for s in [DAY, NIGHT]
-        ])
-        self.model.Add(total_work_days >= 15)
-        self.model.Add(total_work_hours >= 160)
-        self.model.Add(total_work_hours <= self.max_monthly_hours)
-        self.model.Add(cp_model.LinearExpr.Sum([self.shifts[(n, d, NIGHT)] for d in self.all_days]) >= 1)
+        self.model.Add(self.worker_work_days[n] >= 15)
+        self.model.Add(self.worker_hours[n] >= 160)
+        self.model.Add(self.worker_hours[n] <= self.max_monthly_hours)
+        self.model.Add(self.worker_shift_count[n][NIGHT] >= 1)
+
+# 설정 기반 제약조건 (plan.py의 규칙 설정에서 인자를 붙여 사용)
+# 날짜별 근무 가능 인원(self.available_workers)이 min_available 이상인 날만 적용합니다.
+
+# 날짜별 duty 근무 인원 minimum 이상 maximum 이하
+def addCoverage(self, duty, minimum=0, maximum=None, min_available=0):
+    for d in self.all_days:
+        enforce = self.whenAvailable(d, min_available)
+        if enforce is None:
+            continue
+        if minimum:
+            self.model.Add(self.day_shift_count[d][duty] >= minimum).OnlyEnforceIf(enforce)
+        if maximum is not None:
+            self.model.Add(self.day_shift_count[d][duty] <= maximum).OnlyEnforceIf(enforce)
+
+# after 근무 다음 날은 next_duty (다음 날 근무 가능 인원이 min_available 이상일 때)
+def addRestAfter(self, after, next_duty, min_available=0):
+    for d in range(self.num_days - 1):
+        enforce = self.whenAvailable(d + 1, min_available)
+        if enforce is None:
+            continue
+        for n in self.all_workers:
+            today, tomorrow = self.shifts[n, d, after], self.shifts[n, d + 1, next_duty]
+            if today is not self.false and tomorrow is not self.true:
+                self.model.AddImplication(today, tomorrow).OnlyEnforceIf(enforce)
+
+    enforce = self.whenAvailable(0, min_available)
+    if enforce is not None:
+        first_day = [
+            self.shifts[n, 0, next_duty] for n, code in (self.previous_shifts or {}).items()
+            if code == after and self.shifts[n, 0, next_duty] is not self.true
+        ]
+        if first_day:
+            self.model.AddBoolAnd(first_day).OnlyEnforceIf(enforce)
+
+# duty 근무 연속 금지
+def addNoConsecutive(self, duty):
+    shifts = self.shifts[:, :, duty]
+    for today, tomorrow in zip(shifts[:, :-1].ravel().tolist(), shifts[:, 1:].ravel().tolist()):
+        if today is not self.false and tomorrow is not self.false:
+            self.model.AddAtMostOne([today, tomorrow])
+
+    before = [
+        self.shifts[n, 0, duty].Not() for n, code in (self.previous_shifts or {}).items()
+        if code == duty and self.shifts[n, 0, duty] is not self.false
+    ]
+    if before:
+        self.model.AddBoolAnd(before)
+
+# duty 근무는 고정 근무로만 배정 (휴가 등)
+def addOnlyWhenFixed(self, duty):
+    allowed = np.zeros((self.num_workers, self.num_days), dtype=bool)
+    for (n, d) in self.fixed_assignments or {}:
+        allowed[n, d] = True
+    forbidden = [var for var in self.shifts[:, :, duty][~allowed].tolist() if var is not self.false]
+    if forbidden:
+        self.model.AddBoolAnd([var.Not() for var in forbidden])
+
+# 근무자별 최소 근무일/근무시간, 최대 근무시간(max_monthly_hours), 근무 종류별 최소/최대 횟수
+def addWorkload(self, min_work_days=0, min_hours=0, min_counts=None, max_counts=None):
+    for n in self.all_workers:
+        if min_work_days:
+            self.model.Add(self.worker_work_days[n] >= min_work_days)
+        if min_hours:
+            self.model.Add(self.worker_hours[n] >= min_hours)
+        self.model.Add(self.worker_hours[n] <= self.max_monthly_hours)
+        for duty, count in (min_counts or {}).items():
+            self.model.Add(self.worker_shift_count[n][duty] >= count)
+        for duty, count in (max_counts or {}).items():
+            self.model.Add(self.worker_shift_count[n][duty] <= count)
+
+# 대칭 제거: 입력이 같은 근무자끼리는 스케줄을 서로 바꿔도 같은 해이므로, 같은 그룹 안에서
+# 앞 근무자의 근무 코드 열이 뒤 근무자보다 사전순으로 크거나 같은 해만 탐색
+def addSymmetryBreaking(self):
+    day_codes = [
+        [cp_model.LinearExpr.WeightedSum(self.shifts[n, d].tolist(), list(self.all_shifts)) for d in self.all_days]
+        for n in self.all_workers
+    ]
+    for group in self.interchangeableGroups():
+        for a, b in zip(group, group[1:]):
+            # equal: 두 근무자의 d일 전까지 근무가 모두 같음 (같으면 반드시 참, 첫날은 항상 적용)
+            equal = []
+            for d in self.all_days:
+                self.model.Add(day_codes[a][d] >= day_codes[b][d]).OnlyEnforceIf(equal)
+                if d == self.num_days - 1:
+                    break
+                next_equal = self.model.NewBoolVar(f'lex_n{a}_n{b}_d{d + 1}')
+                self.model.Add(day_codes[a][d] - day_codes[b][d] + next_equal >= 1).OnlyEnforceIf(equal)
+                equal = [next_equal]
+
+# 부분 재계산: 다시 계산할 날짜(free_days) 밖은 기존 스케줄(base_schedule)로 고정
+def addFrozenAssignments(self):
+    frozen = [
+        self.shifts[n, d, codes[d]]
+        for n, codes in self.base_schedule.items()
+        for d in self.all_days if d not in self.free_days and self.shifts[n, d, codes[d]] is not self.true
+    ]
+    if frozen:
+        self.model.AddBoolAnd(frozen)
 
 # 목적함수
 def setObjective(self):
-    worker_total_hours = []
-    worker_weekday_day_shifts = []
-    worker_holiday_day_shifts = []
+    balanceObjective(self)
+
+# 공정성 목적함수: 근무자 간 근무시간 차이, 평일/공휴일 duty 근무 수 차이와 총 근무시간의 가중합
+def balanceObjective(self, duty=DAY, hours_weight=1, weekday_weight=8, holiday_weight=3, total_hours_weight=1):
+    worker_total_hours = self.worker_hours
+    # 이전 기간까지의 누적값(carry_over)을 더해 기간 전체의 공정성을 맞춤
+    carry_over = self.carry_over or {}
+    def carried(n, key):
+        return carry_over.get(n, {}).get(key, 0)
+    max_carried = lambda key: max([carried(n, key) for n in self.all_workers] + [0])
+    # 대규모 근무자 모드(roster.py): 모델 밖 근무자들의 {key: (최소, 최대)}와 총 근무시간.
+    # 최대/최소에 상수로 포함해 전체 근무자 기준의 편차를 최소화
+    outside = self.outside or {}
+    extremes = lambda key: list(outside.get(key, ()))
     all_holidays = set(self.weekends) | set(self.holidays)
-    for n in self.all_workers:
-        total_hours = cp_model.LinearExpr.Sum([
-            self.shifts[(n, d, s)] * ALL_DUTIES_DICT[s].time for d in self.all_days for s in [DAY, NIGHT]
-        ])
-        worker_total_hours.append(total_hours)
-        weekday_days = cp_model.LinearExpr.Sum([
-            self.shifts[(n, d, DAY)] for d in self.all_days if d not in all_holidays
-        ])
-        worker_weekday_day_shifts.append(weekday_days)
-        holiday_days = cp_model.LinearExpr.Sum([
-            self.shifts[(n, d, DAY)] for d in self.all_days if d in all_holidays
-        ])
-        worker_holiday_day_shifts.append(holiday_days)
-        
-    max_h = self.model.NewIntVar(0, self.max_monthly_hours, 'max_hours')
-    min_h = self.model.NewIntVar(0, self.max_monthly_hours, 'min_hours')
-    self.model.AddMaxEquality(max_h, worker_total_hours)
-    self.model.AddMinEquality(min_h, worker_total_hours)
+    is_holiday = [d in all_holidays for d in self.all_days]
+    holiday_days = [d for d in self.all_days if is_holiday[d]]
+    weekday_days = [d for d in self.all_days if not is_holiday[d]]
+    worker_weekday_day_shifts = [
+        cp_model.LinearExpr.Sum(self.shifts[n, weekday_days, duty].tolist()) for n in self.all_workers
+    ]
+    worker_holiday_day_shifts = [
+        cp_model.LinearExpr.Sum(self.shifts[n, holiday_days, duty].tolist()) for n in self.all_workers
+    ]
+
+    balanced_hours = [worker_total_hours[n] + carried(n, 'hours') for n in self.all_workers]
+    balanced_weekday = [worker_weekday_day_shifts[n] + carried(n, 'weekday_day') for n in self.all_workers]
+    balanced_holiday = [worker_holiday_day_shifts[n] + carried(n, 'holiday_day') for n in self.all_workers]
+
+    upper = lambda limit, key: max([limit + max_carried(key)] + extremes(key))
+    max_h = self.model.NewIntVar(0, upper(self.max_monthly_hours, 'hours'), 'max_hours')
+    min_h = self.model.NewIntVar(0, upper(self.max_monthly_hours, 'hours'), 'min_hours')
+    self.model.AddMaxEquality(max_h, balanced_hours + extremes('hours'))
+    self.model.AddMinEquality(min_h, balanced_hours + extremes('hours'))
 
     hours_diff = max_h - min_h
-    max_wd = self.model.NewIntVar(0, self.num_days, 'max_weekday_days')
-    min_wd = self.model.NewIntVar(0, self.num_days, 'min_weekday_days')
-    self.model.AddMaxEquality(max_wd, worker_weekday_day_shifts)
-    self.model.AddMinEquality(min_wd, worker_weekday_day_shifts)
+    max_wd = self.model.NewIntVar(0, upper(self.num_days, 'weekday_day'), 'max_weekday_days')
+    min_wd = self.model.NewIntVar(0, upper(self.num_days, 'weekday_day'), 'min_weekday_days')
+    self.model.AddMaxEquality(max_wd, balanced_weekday + extremes('weekday_day'))
+    self.model.AddMinEquality(min_wd, balanced_weekday + extremes('weekday_day'))
 
     weekday_diff = max_wd - min_wd
-    max_hd = self.model.NewIntVar(0, self.num_days, 'max_holiday_days')
-    min_hd = self.model.NewIntVar(0, self.num_days, 'min_holiday_days')
-    self.model.AddMaxEquality(max_hd, worker_holiday_day_shifts)
-    self.model.AddMinEquality(min_hd, worker_holiday_day_shifts)
+    max_hd = self.model.NewIntVar(0, upper(self.num_days, 'holiday_day'), 'max_holiday_days')
+    min_hd = self.model.NewIntVar(0, upper(self.num_days, 'holiday_day'), 'min_holiday_days')
+    self.model.AddMaxEquality(max_hd, balanced_holiday + extremes('holiday_day'))
+    self.model.AddMinEquality(min_hd, balanced_holiday + extremes('holiday_day'))
 
     holiday_diff = max_hd - min_hd
-    total_hours_penalty = cp_model.LinearExpr.Sum(worker_total_hours)
-    self.model.Minimize(hours_diff * 1 + weekday_diff * 8 + holiday_diff * 3 + total_hours_penalty)
\ No newline at end of file
+    total_hours_penalty = cp_model.LinearExpr.Sum(worker_total_hours) + outside.get('total_hours', 0)
+    # 항목별 식 (profile.objective_stages로 항목을 우선순위대로 하나씩 최적화할 때 사용)
+    self.objective_terms = {
+        'weekday': weekday_diff,
+        'holiday': holiday_diff,
+        'hours': hours_diff,
+        'total_hours': total_hours_penalty,
+    }
+    self.objective_expression = (
+        hours_diff * hours_weight + weekday_diff * weekday_weight + holiday_diff * holiday_weight
+        + total_hours_penalty * total_hours_weight
+    )
+    self.model.Minimize(self.objective_expression)
+
+# 누적 공정성 목적함수 (use_ledger): balanceObjective에 야간 근무 수, 주말/공휴일 근무 수의 차이를 더함.
+# carry_over는 팀의 누적값(storage.ledger_offsets)이므로 지난달까지 많이 한 근무자에게 덜 배정됨
+def balanceLedgerObjective(self, duty=DAY, night_duty=NIGHT, night_weight=4, weekend_weight=4, **weights):
+    balanceObjective(self, duty=duty, **weights)
+    carry_over = self.carry_over or {}
+    def carried(n, key):
+        return carry_over.get(n, {}).get(key, 0)
+    max_carried = lambda key: max([carried(n, key) for n in self.all_workers] + [0])
+    all_holidays = set(self.weekends) | set(self.holidays)
+    holiday_days = [d for d in self.all_days if d in all_holidays]
+
+    balanced = {}
+    if night_duty is not None:
+        balanced['night'] = [
+            cp_model.LinearExpr.Sum(self.shifts[n, :, night_duty].tolist()) + carried(n, 'night')
+            for n in self.all_workers
+        ]
+    balanced['weekend'] = [
+        cp_model.LinearExpr.Sum(self.shifts[n, holiday_days][:, self.work_shifts].flatten().tolist()) + carried(n, 'weekend')
+        for n in self.all_workers
+    ]
+    weight = {'night': night_weight, 'weekend': weekend_weight}
+    for key, values in balanced.items():
+        upper = self.num_days + max_carried(key)
+        max_v = self.model.NewIntVar(0, upper, f'max_{key}')
+        min_v = self.model.NewIntVar(0, upper, f'min_{key}')
+        self.model.AddMaxEquality(max_v, values)
+        self.model.AddMinEquality(min_v, values)
+        self.objective_terms[key] = max_v - min_v
+        self.objective_expression += (max_v - min_v) * weight[key]
+    self.model.Minimize(self.objective_expression)
+
+# 부분 재계산 목적함수: 기존 스케줄과 달라지는 배정 수 최소화
+def minimizeChanges(self):
+    kept = [
+        self.shifts[n, d, codes[d]]
+        for n, codes in self.base_schedule.items()
+        for d in self.all_days if d in self.free_days
+    ]
+    self.model.Minimize(len(kept) - cp_model.LinearExpr.Sum(kept))
@@ -1,84 +1,751 @@
+import contextlib
+import copy
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+
+from .encoding import SCHEDULE_DTYPE
+from .params import format_schedule, get_weekends, normalize_schedule, params_from_form, solve_options
+from .plan import BoundRule, plan_for
+from .profiles import SolverProfile
 from .rules import *
+from .telemetry import parse_presolve_log
+from . import templates
+
+logger = logging.getLogger(__name__)
+
+# 기본 제약조건 목록 (views, jobs 에서 공통으로 사용)
+DEFAULT_CONSTRAINTS = [
+    addExactlyOne,
+    addDailyShiftRequirements,
+    addNightShiftRestRequirement,
+    addFixedAssignments,
+    addVacationRestrictions,
+    addNoConsecutiveOffDays,
+    addMonthlyWorkConstraints,
+]
+
+DEFAULT_TIME_LIMIT = 10.0
+
+# 충돌 집합 최소화: 항목 하나를 판정할 때의 worker 수와 최소 시간 (초)
+EXPLAIN_NUM_WORKERS = 4
+EXPLAIN_MIN_TRIAL_TIME = 0.2
+
+
+class SolutionMonitor(cp_model.CpSolverSolutionCallback):
+    """해를 찾을 때마다 목적함수 값/하한을 기록하고, 마지막으로 개선된 시점을 추적합니다."""
+
+    def __init__(self, schedule_solver, on_solution=None):
+        super().__init__()
+        self.schedule_solver = schedule_solver
+        self.on_solution = on_solution
+        self.solutions = 0
+        self.best_objective = None
+        self.last_improvement = time.monotonic()
+        self.time_to_best = None
+        # (경과 시간, 목적함수 값, 하한)
+        self.trajectory = []
+
+    def OnSolutionCallback(self):
+        self.solutions += 1
+        objective = self.ObjectiveValue()
+        if self.best_objective is None or objective < self.best_objective:
+            self.best_objective = objective
+            self.last_improvement = time.monotonic()
+            self.time_to_best = self.WallTime()
+        self.trajectory.append((self.WallTime(), objective, self.BestObjectiveBound()))
+        if self.on_solution:
+            self.on_solution(self)
+
+    def current_schedule(self):
+        """지금 찾은 해의 {worker: [codes]}"""
+        return self.schedule_solver.extract_schedule(self.Response())
+
+
+class SolveContext:
+    """
+    모델 밖에서 정해진 근무 정보. 한 달을 처음부터 계산하는 요청에는 필요 없습니다.
+    - base_schedule, free_days : 부분 재계산(repair.py, horizon.py). 기존 스케줄과 다시 계산할 0-based 날짜 집합
+    - previous_shifts          : 이전 기간 마지막 날의 근무 {worker: code} (horizon.py)
+    - carry_over               : 근무자별 누적값 {worker: {'hours', 'weekday_day', 'holiday_day', ...}}
+                                 (horizon.py, storage.ledger_offsets)
+    - outside                  : 대규모 근무자 모드(roster.py)에서 이 모델 밖 근무자들의 공정성 값 범위
+    """
+
+    def __init__(self, base_schedule=None, free_days=None, previous_shifts=None, carry_over=None, outside=None):
+        self.base_schedule = normalize_schedule(base_schedule) if base_schedule else None
+        self.free_days = set(free_days) if free_days is not None else None
+        self.previous_shifts = previous_shifts
+        self.carry_over = carry_over
+        self.outside = outside
+
+    def __bool__(self):
+        return bool(self.base_schedule or self.previous_shifts or self.carry_over or self.outside)
+
 
 class ScheduleSolver:
-    def __init__(self, num_workers, num_days, fixed_assignments=None, weekends=[], holidays=[], max_monthly_hours=200, constraints=[], objectiveFunc=None):
+    def __init__(self, num_workers, num_days, fixed_assignments=None, weekends=[], holidays=[], max_monthly_hours=200, constraints=[], objectiveFunc=None, time_limit=None, solution_callback=None, hint=None, profile=None, cancel_event=None, collect_presolve_stats=False, context=None, explain=False, plan=None, presolve=True, template_cache=None):
         self.num_workers = num_workers
         self.num_days = num_days
         self.all_workers = range(num_workers)
         self.all_days = range(num_days)
-        self.all_shifts = range(NUM_SHIFT)
+        # 근무 종류: plan(plan.py의 RulePlan)이 없으면 rules.py의 ALL_DUTIES
+        self.plan = plan
+        self.duties = plan.duties if plan else ALL_DUTIES_DICT
+        self.num_shifts = len(self.duties)
+        self.all_shifts = range(self.num_shifts)
+        self.work_shifts = plan.work_codes if plan else WORK_SHIFTS
+        self.leave_shifts = plan.leave_codes if plan else [VACATION]
         self.fixed_assignments = dict(map(lambda x: ((x[0][0], x[0][1] - 1), x[1]), fixed_assignments.items())) if fixed_assignments else {}
+        # 휴가(leave)는 고정 근무로만 배정되므로 날짜별 근무 가능 인원은 입력만으로 정해짐
+        self.available_workers = [num_workers] * num_days
+        for (n, d), s in self.fixed_assignments.items():
+            if s in self.leave_shifts and 0 <= d < num_days:
+                self.available_workers[d] -= 1
         self.weekends = weekends
         self.holidays = list(map(lambda x: x - 1, holidays))
         self.max_monthly_hours = max_monthly_hours
         self.constraints = constraints
         self.model = cp_model.CpModel()
-        self.shifts = {}
         self.objectiveFunc = objectiveFunc
+        # CpSolver 파라미터 (profiles.py). time_limit을 주면 프로필의 시간 제한보다 우선합니다.
+        self.profile = profile or SolverProfile('default', time_limit=DEFAULT_TIME_LIMIT)
+        self.time_limit = time_limit if time_limit is not None else self.profile.time_limit
+        # 해를 찾을 때마다 SolutionMonitor를 인자로 호출되는 함수
+        self.solution_callback = solution_callback
+        # 이전 계산 결과 {worker: [codes]} - CP-SAT 탐색 시작점(hint)으로 사용
+        self.hint = normalize_schedule(hint) if hint else None
+        # 모델 밖에서 정해진 근무 정보 (SolveContext). 제약조건 함수는 아래 속성으로 사용
+        self.context = context or SolveContext()
+        self.base_schedule = self.context.base_schedule
+        self.free_days = self.context.free_days if self.context.free_days is not None else set(self.all_days)
+        self.previous_shifts = self.context.previous_shifts
+        self.carry_over = self.context.carry_over
+        self.outside = self.context.outside
+        # set()되면 탐색을 중단 (스트리밍 응답에서 클라이언트가 연결을 끊은 경우 등)
+        self.cancel_event = cancel_event
+        self.status_name = None
+        self.stopped_by_stall = False
+        self.cancelled = False
+        self.built = False
+        self.stats = {}
+        # 마지막 계산 결과의 (근무자 × 날짜) 근무 코드 행렬 (encoding.py)
+        self.schedule_matrix = None
+        # CP-SAT 로그를 읽어 presolve 전/후 모델 크기를 telemetry에 기록
+        self.collect_presolve_stats = collect_presolve_stats
+        # 충돌 설명 모드: 제약조건 함수(고정 근무는 항목별)마다 assumption 리터럴을 붙여,
+        # 해가 없으면 충돌하는 최소 집합을 self.conflicts에 기록 (목적함수는 사용하지 않음)
+        self.explain = explain
+        self.assumptions = {}
+        self.conflicts = None
+        # 입력 presolve: 고정 근무 등 입력만으로 값이 정해지는 변수는 만들지 않고 상수(self.true/self.false)로
+        # 대체합니다. 충돌 설명 모드는 고정 근무마다 제약조건이 있어야 하므로 사용하지 않음
+        self.presolve = presolve and not explain
+        self.true = None
+        self.false = None
+        # 목적함수 항목별 식과 가중합 (rules.balanceObjective가 설정, profile.objective_stages에서 사용)
+        self.objective_terms = {}
+        self.objective_expression = None
+        # 모델 템플릿(templates.py): template_cache가 있으면 캐시된 템플릿을 복제해 사용.
+        # 템플릿을 만드는 중이면(templates.build_template) 근무 가능 인원 조건을 리터럴로 남겨 둠 {(날짜, 인원): 리터럴}
+        self.availability = None
+        self.template = None
+        # 제약조건 함수들이 추가한 제약조건 수 (템플릿을 복제했으면 템플릿의 값)
+        self.rule_constraints = None
+        # 모델 생성 단계별 시간과 추가된 변수/제약조건 수 (telemetry.py)
+        self.telemetry = {'rules': [], 'build_seconds': 0.0}
+
+        if template_cache is not None:
+            with self.measure('template'):
+                self.template, hit = template_cache.get(self)
+            if self.template is not None:
+                self.telemetry['model_template'] = 'hit' if hit else 'miss'
+                with self.measure('useTemplate'):
+                    self.useTemplate(self.template)
+                return
 
-        # 표현 : 근무자 n이 날 d에 근무 s를 하는가?
+        # 표현 : 근무자 n이 날 d에 근무 s를 하는가? (근무자 × 날짜 × 근무 배열, self.shifts[n, d, s])
+        with self.measure('variables'):
+            values = self.presolveValues() if self.presolve else None
+            self.createVariables(values)
+            if values is not None:
+                self.telemetry['input_presolve'] = {
+                    'variables_before': int(values.size),
+                    'variables_after': int((values < 0).sum()),
+                    'fixed': int((values == 1).sum()),
+                    'forbidden': int((values == 0).sum()),
+                }
+
+    def createVariables(self, values=None):
+        """근무 변수 배열(self.shifts)과 공용 식을 만듭니다. values(presolveValues())로 정해진 칸은 상수"""
+        if values is not None:
+            self.true, self.false = self.model.NewConstant(1), self.model.NewConstant(0)
+        constants = {0: self.false, 1: self.true}
+        self.shifts = np.array([
+            self.model.NewBoolVar(f'shift_n{n}_d{d}_s{s}') if values is None or values[n, d, s] < 0
+            else constants[int(values[n, d, s])]
+            for n in self.all_workers for d in self.all_days for s in self.all_shifts
+        ], dtype=object).reshape(self.num_workers, self.num_days, self.num_shifts)
+        # CpSolverResponse.solution에서 한 번에 값을 꺼내기 위한 변수 번호
+        self.shift_indices = np.array(
+            [var.Index() for var in self.shifts.ravel().tolist()], dtype=np.int64
+        ).reshape(self.shifts.shape)
+        self.addSharedExpressions()
+
+    def unreducedConstraintCount(self):
+        """입력 presolve 없이 같은 제약조건 함수로 만든 모델의 제약조건 수 (비교용으로 모델을 한 번 더 만듦)"""
+        twin = copy.copy(self)
+        twin.model = cp_model.CpModel()
+        twin.true = twin.false = None
+        twin.availability = None
+        twin.createVariables()
+        for constraint in self.constraints:
+            constraint(twin)
+        return len(twin.model.Proto().constraints)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        """블록 실행 시간과 그동안 모델에 추가된 변수/제약조건 수를 telemetry['rules']에 기록"""
+        proto = self.model.Proto()
+        variables, constraints = len(proto.variables), len(proto.constraints)
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        self.telemetry['rules'].append({
+            'rule': name,
+            'seconds': elapsed,
+            'variables': len(proto.variables) - variables,
+            'constraints': len(proto.constraints) - constraints,
+        })
+        self.telemetry['build_seconds'] += elapsed
+
+    def addSharedExpressions(self):
+        """여러 제약조건/목적함수가 함께 쓰는 근무자별, 날짜별 합계 식을 한 번만 만듭니다."""
+        work_vars = self.shifts[:, :, self.work_shifts]
+        work_hours = [self.duties[s].time for s in self.work_shifts] * self.num_days
+        # 근무자별 총 근무 시간 / 근무일 수 / 근무 종류별 횟수
+        self.worker_hours = [
+            cp_model.LinearExpr.WeightedSum(work_vars[n].ravel().tolist(), work_hours) for n in self.all_workers
+        ]
+        self.worker_work_days = [
+            cp_model.LinearExpr.Sum(work_vars[n].ravel().tolist()) for n in self.all_workers
+        ]
+        self.worker_shift_count = [
+            [cp_model.LinearExpr.Sum(self.shifts[n, :, s].tolist()) for s in self.all_shifts] for n in self.all_workers
+        ]
+        # 날짜별 근무 종류별 인원 수
+        self.day_shift_count = [
+            [cp_model.LinearExpr.Sum(self.shifts[:, d, s].tolist()) for s in self.all_shifts] for d in self.all_days
+        ]
+
+    def useTemplate(self, template):
+        """
+        모델 템플릿을 복제하고, 입력으로 정해지는 값(presolveValues()와 근무 가능 인원 조건)을
+        변수 domain으로 고정합니다. 변수 표현과 공용 식은 템플릿의 것을 그대로 사용합니다.
+        """
+        self.model = template.model.Clone()
+        for name in templates.SHARED_ATTRIBUTES:
+            setattr(self, name, getattr(template, name))
+        variables = self.model.Proto().variables
+
+        def fix(index, value):
+            domain = variables[index].domain
+            domain.clear()
+            domain.extend([value, value])
+
+        values = self.presolveValues()
+        determined = values >= 0
+        for index, value in zip(self.shift_indices[determined].tolist(), values[determined].tolist()):
+            fix(index, value)
+        for (d, count), index in template.availability.items():
+            fix(index, int(self.available_workers[d] >= count))
+        self.telemetry['input_presolve'] = {
+            'variables_before': int(values.size),
+            'variables_after': int((~determined).sum()),
+            'fixed': int((values == 1).sum()),
+            'forbidden': int((values == 0).sum()),
+        }
+
+    def whenAvailable(self, d, count):
+        """
+        d일 근무 가능 인원이 count 이상일 때만 적용하는 제약조건의 enforcement literal 목록.
+        입력으로 정해지면 [](항상 적용) 또는 None(적용 안 함), 템플릿을 만드는 중이면 조건 리터럴
+        """
+        if self.availability is None or count <= 0:
+            return [] if self.available_workers[d] >= count else None
+        if count > self.num_workers:
+            return None
+        if (d, count) not in self.availability:
+            self.availability[d, count] = self.model.NewBoolVar(f'available_d{d}_ge{count}')
+        return [self.availability[d, count]]
+
+    def presolveValues(self):
+        """
+        입력만으로 정해지는 변수 값 (근무자 × 날짜 × 근무 int8 배열: 1, 0, 정해지지 않으면 -1).
+        사용하는 제약조건에 해당하는 것만 반영합니다.
+        - 고정 근무(addFixedAssignments)와 부분 재계산의 고정 날짜(addFrozenAssignments): 그 근무는 1,
+          하루 한 근무(addExactlyOne)를 사용하면 같은 날 다른 근무는 0
+        - 휴가 등 고정 근무로만 배정하는 근무(addVacationRestrictions, addOnlyWhenFixed): 고정 근무가 없는 날 0
+        같은 칸이 서로 다른 값으로 정해지면 먼저 정한 값을 두고, 해당 제약조건이 상수 간의 모순을
+        모델에 추가해 해가 없게 됩니다.
+        """
+        values = np.full((self.num_workers, self.num_days, self.num_shifts), -1, dtype=np.int8)
+        rules = [getattr(constraint, 'func', constraint) for constraint in self.constraints]
+        exactly_one = addExactlyOne in rules
+        leave = [VACATION] if addVacationRestrictions in rules else []
+        leave += [constraint.kwargs['duty'] for constraint in self.constraints if getattr(constraint, 'func', None) is addOnlyWhenFixed]
+
+        def assign(n, d, s):
+            if values[n, d, s] < 0:
+                values[n, d, s] = 1
+            if exactly_one:
+                others = values[n, d]
+                others[(others < 0) & (np.arange(self.num_shifts) != s)] = 0
+
+        if leave:
+            allowed = np.zeros((self.num_workers, self.num_days), dtype=bool)
+            for (n, d) in self.fixed_assignments:
+                allowed[n, d] = True
+            for s in leave:
+                values[:, :, s][~allowed] = 0
+        if addFixedAssignments in rules:
+            for (n, d), s in self.fixed_assignments.items():
+                assign(n, d, s)
+        if addFrozenAssignments in rules and self.base_schedule:
+            for n, codes in self.base_schedule.items():
+                for d in self.all_days:
+                    if d not in self.free_days:
+                        assign(n, d, codes[d])
+        return values
+
+    def interchangeableGroups(self):
+        """
+        고정 근무, 이전 기간 마지막 근무, 누적값(carry_over), 기존 스케줄이 모두 같은 근무자 그룹
+        (2명 이상인 그룹만). 같은 그룹의 근무자끼리는 제약조건과 목적함수가 구분하지 못합니다.
+        """
+        fixed = {n: [None] * self.num_days for n in self.all_workers}
+        for (n, d), s in self.fixed_assignments.items():
+            fixed[n][d] = s
+        groups = {}
         for n in self.all_workers:
-            for d in self.all_days:
+            signature = (
+                tuple(fixed[n]),
+                (self.previous_shifts or {}).get(n),
+                tuple(sorted((self.carry_over or {}).get(n, {}).items())),
+                tuple((self.base_schedule or {}).get(n, ())),
+            )
+            groups.setdefault(signature, []).append(n)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def addHints(self):
+        """self.hint의 근무 코드를 변수별 hint로 추가. 범위를 벗어난 근무자/날짜는 무시합니다."""
+        for n, codes in self.hint.items():
+            if n not in self.all_workers:
+                continue
+            for d, code in enumerate(codes[:self.num_days]):
                 for s in self.all_shifts:
-                    self.shifts[(n, d, s)] = self.model.NewBoolVar(f'shift_n{n}_d{d}_s{s}')
+                    var = self.shifts[n, d, s]
+                    if var is not self.true and var is not self.false:
+                        self.model.AddHint(var, s == code)
 
-    def solve(self):
-        """OR-Tools를 사용하여 스케줄을 계산하고 결과를 반환하는 함수"""
-        # 제약조건 반영
-        for constraint in self.constraints:
-            constraint(self)
+    def extract_matrix(self, response):
+        """
+        CpSolverResponse(CpSolver.ResponseProto(), 콜백의 Response())의 solution 배열에서
+        (근무자 × 날짜) uint8 근무 코드 행렬을 변수별 Value() 호출 없이 한 번에 만듭니다.
+        """
+        solution = np.array(response.solution, dtype=np.int64)
+        return solution[self.shift_indices].argmax(axis=2).astype(SCHEDULE_DTYPE)
+
+    def extract_schedule(self, response):
+        """extract_matrix()의 결과를 {worker: [codes]}로"""
+        return dict(enumerate(self.extract_matrix(response).tolist()))
+
+    def _solve_with_watcher(self, solver, monitor):
+        """
+        감시 스레드에서 다음 경우 탐색을 중단합니다.
+        - profile.stall_time 동안 목적함수 값이 개선되지 않음
+        - cancel_event가 set()됨
+        """
+        stall_time = self.profile.stall_time
+        if not stall_time and self.cancel_event is None:
+            return solver.Solve(self.model, monitor)
+
+        done = threading.Event()
+
+        def watch():
+            while not done.wait(0.1):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    self.cancelled = True
+                    solver.StopSearch()
+                    return
+                if stall_time and monitor.solutions and time.monotonic() - monitor.last_improvement >= stall_time:
+                    self.stopped_by_stall = True
+                    solver.StopSearch()
+                    return
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+        try:
+            return solver.Solve(self.model, monitor)
+        finally:
+            done.set()
+            watcher.join()
+
+    def addAssumptionLiterals(self, rule, first):
+        """
+        first번째 이후 추가된 제약조건에 assumption 리터럴을 enforcement literal로 붙입니다.
+        addFixedAssignments는 고정 근무 하나당 리터럴 하나, 나머지는 제약조건 함수당 하나입니다.
+        (addExactlyOne은 변수 표현 자체의 조건이므로 제외)
+        """
+        if rule == addExactlyOne.__name__:
+            return
+        proto = self.model.Proto()
+        constraints = [proto.constraints[i] for i in range(first, len(proto.constraints))]
+        if rule == addFixedAssignments.__name__:
+            groups = [
+                ({'rule': rule, 'worker': n, 'day': d + 1, 'shift': s,
+                  'message': f"근무자 {n}의 {d + 1}일 고정 근무 {self.duties[s].name}"}, [constraint])
+                for ((n, d), s), constraint in zip(self.fixed_assignments.items(), constraints)
+            ]
+        else:
+            groups = [({'rule': rule, 'message': f"제약조건 {rule}"}, constraints)]
+        for label, group in groups:
+            literal = self.model.NewBoolVar(f'assume_{len(self.assumptions)}')
+            for constraint in group:
+                constraint.enforcement_literal.append(literal.Index())
+            self.assumptions[literal.Index()] = label
+        self._setAssumptions(self.assumptions)
+
+    def _setAssumptions(self, indices):
+        self.model.ClearAssumptions()
+        self.model.AddAssumptions([self.model.GetBoolVarFromProtoIndex(index) for index in indices])
+
+    def explainInfeasibility(self, solver, core):
+        """
+        CP-SAT가 찾은 충돌 assumption 집합(core)에서 하나씩 빼 보며 여전히 해가 없으면
+        제거합니다 (deletion 방식의 최소화). 남은 시간은 남은 항목에 나누어 주고, 시간 안에
+        판정하지 못한 항목은 남겨 둡니다. 따라서 시간이 부족하면 최소가 아닐 수 있습니다.
+        """
+        deadline = time.monotonic() + max(0.0, self.time_limit - solver.WallTime())
+        core = list(core)
+        i = 0
+        while i < len(core) and time.monotonic() < deadline:
+            trial = core[:i] + core[i + 1:]
+            self._setAssumptions(trial)
+            check = cp_model.CpSolver()
+            check.parameters.num_workers = EXPLAIN_NUM_WORKERS
+            remaining = deadline - time.monotonic()
+            check.parameters.max_time_in_seconds = min(remaining, max(EXPLAIN_MIN_TRIAL_TIME, remaining / (len(core) - i)))
+            if check.Solve(self.model) == cp_model.INFEASIBLE:
+                # 더 작은 충돌 집합을 돌려주면 그것으로 교체
+                smaller = list(check.SufficientAssumptionsForInfeasibility())
+                core = smaller if smaller and len(smaller) < len(trial) else trial
+            else:
+                # 해가 있거나 (필요한 항목) 시간 안에 판정하지 못하면 (UNKNOWN) 남겨 둠
+                i += 1
+        self._setAssumptions(self.assumptions)
+        return [self.assumptions[index] for index in core]
+
+    def objectiveExpression(self):
+        """모델에 설정된 목적함수의 (식, offset, scaling). 목적함수가 없으면 None"""
+        objective = self.model.Proto().objective
+        if not objective.vars:
+            return None
+        variables = [
+            self.model.GetIntVarFromProtoIndex(index) if index >= 0
+            else 1 - self.model.GetIntVarFromProtoIndex(-index - 1)
+            for index in objective.vars
+        ]
+        return cp_model.LinearExpr.WeightedSum(variables, list(objective.coeffs)), objective.offset, objective.scaling_factor or 1
+
+    def solveAlternatives(self, count, tolerance=0.05, min_distance=None, time_limit=None):
+        """
+        solve()로 해를 찾은 뒤, 같은 모델에 제약조건만 더해 대안 스케줄을 최대 count개 더 찾습니다.
+        - tolerance    : 목적함수 값이 첫 해의 (1 + tolerance)배 이내
+        - min_distance : 앞서 찾은 모든 해와 이 수 이상의 (근무자, 날짜) 칸이 달라야 함
+                         (None이면 전체 칸의 5%)
+        - time_limit   : 대안 하나당 계산 시간 (None이면 self.time_limit)
+        반환값: [{'schedule': {worker: [codes]}, 'objective': ..., 'distance': 가장 가까운 앞선 해와 다른 칸 수}, ...]
+        """
+        if self.schedule_matrix is None or count <= 0:
+            return []
+        if min_distance is None:
+            min_distance = max(1, self.num_workers * self.num_days // 20)
+        objective = self.objectiveExpression()
+        if objective is not None and self.stats['solutions']:
+            expression, offset, scaling = objective
+            best = self.stats['objective']
+            self.model.Add(expression <= math.floor((best + abs(best) * tolerance) / scaling - offset + 1e-9))
+
+        found = [self.schedule_matrix]
+        alternatives = []
+        while len(alternatives) < count:
+            # 직전 해와 같은 근무인 칸이 (정해지지 않은 칸 수 - min_distance) 이하
+            same = [
+                self.shifts[n, d, code] for (n, d), code in np.ndenumerate(found[-1])
+                if self.shifts[n, d, code] is not self.true
+            ]
+            self.model.Add(cp_model.LinearExpr.Sum(same) <= len(same) - min_distance)
+
+            solver = cp_model.CpSolver()
+            self.profile.apply(solver.parameters)
+            solver.parameters.max_time_in_seconds = time_limit if time_limit is not None else self.time_limit
+            status = self._solve_with_watcher(solver, SolutionMonitor(self))
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                break
+            matrix = self.extract_matrix(solver.ResponseProto())
+            alternatives.append({
+                'schedule': dict(enumerate(matrix.tolist())),
+                'objective': solver.ObjectiveValue(),
+                'status': solver.StatusName(status),
+                'distance': min(int((matrix != previous).sum()) for previous in found),
+            })
+            found.append(matrix)
+        return alternatives
+
+    def build(self):
+        """제약조건, 목적함수, hint를 모델에 반영합니다. (solve()에서 한 번만 호출)"""
+        if self.built:
+            return
+        # 제약조건 반영 (템플릿을 복제했으면 이미 반영됨)
+        if self.template is None:
+            rules_start = len(self.model.Proto().constraints)
+            for constraint in self.constraints:
+                first = len(self.model.Proto().constraints)
+                with self.measure(constraint.__name__):
+                    constraint(self)
+                if self.explain:
+                    self.addAssumptionLiterals(constraint.__name__, first)
+            self.rule_constraints = len(self.model.Proto().constraints) - rules_start
+        # 입력 presolve 후 제약조건 수. presolve 전 제약조건 수는 모델을 한 번 더 만들어야 하므로
+        # presolve 통계를 수집할 때(collect_presolve_stats)만 기록
+        input_presolve = self.telemetry.get('input_presolve')
+        if input_presolve is not None:
+            input_presolve['constraints'] = self.rule_constraints
+            if self.collect_presolve_stats:
+                with self.measure('unreducedConstraintCount'):
+                    input_presolve['constraints_before'] = self.unreducedConstraintCount()
+
+        # 입력이 같은 근무자 간 대칭 제거 (프로필 설정, 충돌 설명 모드에서는 사용하지 않음)
+        if self.profile.symmetry_breaking and not self.explain:
+            with self.measure(addSymmetryBreaking.__name__):
+                addSymmetryBreaking(self)
 
         # 목적함수 설정
-        if self.objectiveFunc:
-            self.objectiveFunc(self)
+        if self.objectiveFunc and not self.explain and self.template is None:
+            with self.measure(self.objectiveFunc.__name__):
+                self.objectiveFunc(self)
+
+        # 이전 스케줄을 초기 해 후보로 전달 (warm start)
+        if self.hint:
+            with self.measure('addHints'):
+                self.addHints()
+        self.built = True
+
+    def solveStages(self):
+        """
+        계층형 목적함수: profile.objective_stages의 항목을 순서대로 최소화하고, 찾은 값을
+        `항목 <= 값` 제약조건으로 고정한 뒤 다음 항목으로 넘어갑니다. 같은 모델을 계속 사용하고
+        앞 단계의 해를 다음 단계의 hint로 줍니다. 단계의 시간은 [항목, 시간] 값과 남은
+        self.time_limit 중 작은 값이며, 어떤 단계에서 해를 찾지 못하면 앞 단계의 해를 결과로 씁니다.
+        끝나면 목적함수를 가중합으로 되돌립니다. (solveAlternatives()의 기준)
+        """
+        unknown = [term for term, _ in self.profile.objective_stages if term not in self.objective_terms]
+        if unknown:
+            raise ValueError(f"알 수 없는 목적함수 항목입니다: {', '.join(unknown)} ({', '.join(self.objective_terms)} 중 선택)")
+
+        stages = []
+        best = None
+        monitors = []
+        elapsed = 0.0
+        conflicts = branches = 0
+        time_to_best = None
+        for term, stage_time in self.profile.objective_stages:
+            remaining = self.time_limit - elapsed
+            if stages and remaining <= 0:
+                break
+            expression = self.objective_terms[term]
+            self.model.Minimize(expression)
+            solver = cp_model.CpSolver()
+            self.profile.apply(solver.parameters)
+            solver.parameters.max_time_in_seconds = min(stage_time, remaining)
+            monitor = SolutionMonitor(self, self.solution_callback)
+            status = self._solve_with_watcher(solver, monitor)
+            monitors.append(monitor)
+            stage = {
+                'term': term,
+                'status': solver.StatusName(status),
+                'value': None,
+                'best_bound': None,
+                'wall_time': solver.WallTime(),
+                'solutions': monitor.solutions,
+            }
+            stages.append(stage)
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                value = round(solver.ObjectiveValue())
+                stage.update(value=value, best_bound=solver.BestObjectiveBound())
+                best = (solver, status)
+                if monitor.time_to_best is not None:
+                    time_to_best = elapsed + monitor.time_to_best
+                # 이 항목의 값을 고정하고, 찾은 해를 다음 단계의 시작점으로
+                self.model.Add(expression <= value)
+                self.model.ClearHints()
+                hint = self.model.Proto().solution_hint
+                solution = solver.ResponseProto().solution
+                hint.vars.extend(range(len(solution)))
+                hint.values.extend(solution)
+            elapsed += solver.WallTime()
+            conflicts += solver.NumConflicts()
+            branches += solver.NumBranches()
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE) or self.cancelled:
+                break
+        self.model.Minimize(self.objective_expression)
+
+        solver, status = best if best else (solver, status)
+        if best and any(stage['status'] != 'OPTIMAL' for stage in stages):
+            status = cp_model.FEASIBLE
+        self.status_name = solver.StatusName(status)
+        self.schedule_matrix = None
+        self.stats = {
+            'status': self.status_name,
+            'objective': solver.Value(self.objective_expression) if best else None,
+            'best_bound': None,
+            'conflicts': conflicts,
+            'branches': branches,
+            'wall_time': elapsed,
+            'solutions': sum(monitor.solutions for monitor in monitors),
+            'time_to_best': time_to_best,
+            'profile': self.profile.name,
+            'stopped_by_stall': self.stopped_by_stall,
+            'cancelled': self.cancelled,
+            'stages': stages,
+        }
+        self.telemetry['trajectory'] = [point for monitor in monitors for point in monitor.trajectory]
+
+        schedule_data = None
+        if best:
+            self.schedule_matrix = self.extract_matrix(solver.ResponseProto())
+            schedule_data = dict(enumerate(self.schedule_matrix.tolist()))
+        else:
+            logger.info("해결 가능한 스케줄을 찾을 수 없습니다.")
+        logger.info(
+            "Statistics - status: %s, objective: %s, stages: %s, wall time: %s s",
+            self.status_name, self.stats['objective'],
+            ', '.join(f"{stage['term']}={stage['value']}({stage['status']}, {stage['wall_time']:.2f}s)" for stage in stages),
+            elapsed,
+        )
+        return schedule_data
+
+    def solve(self):
+        """OR-Tools를 사용하여 스케줄을 계산하고 결과를 반환하는 함수"""
+        self.build()
+        if self.profile.objective_stages and self.objective_terms:
+            return self.solveStages()
 
         # 해결
         solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = 10.0
-        status = solver.Solve(self.model)
+        self.profile.apply(solver.parameters)
+        solver.parameters.max_time_in_seconds = self.time_limit
+        log_lines = []
+        if self.collect_presolve_stats:
+            solver.parameters.log_search_progress = True
+            solver.parameters.log_to_stdout = False
+            solver.log_callback = log_lines.append
+        if self.explain:
+            # SufficientAssumptionsForInfeasibility()는 단일 worker에서만 충돌 집합을 반환
+            solver.parameters.num_workers = 1
+        monitor = SolutionMonitor(self, self.solution_callback)
+        status = self._solve_with_watcher(solver, monitor)
+        self.status_name = solver.StatusName(status)
+        self.schedule_matrix = None
+        if self.explain and status == cp_model.INFEASIBLE:
+            self.conflicts = self.explainInfeasibility(solver, solver.SufficientAssumptionsForInfeasibility())
+        self.stats = {
+            'status': self.status_name,
+            'objective': solver.ObjectiveValue(),
+            'best_bound': solver.BestObjectiveBound(),
+            'conflicts': solver.NumConflicts(),
+            'branches': solver.NumBranches(),
+            'wall_time': solver.WallTime(),
+            'solutions': monitor.solutions,
+            'time_to_best': monitor.time_to_best,
+            'profile': self.profile.name,
+            'stopped_by_stall': self.stopped_by_stall,
+            'cancelled': self.cancelled,
+        }
+        self.telemetry['trajectory'] = monitor.trajectory
+        if log_lines:
+            self.telemetry['presolve'] = parse_presolve_log(log_lines)
 
         # 결과
         schedule_data = None
         if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-            print("\n최적의 스케줄을 찾았습니다!")
-            schedule_data = {}
-            for n in self.all_workers:
-                schedule_data[n] = []
-                for d in self.all_days:
-                    for s in self.all_shifts:
-                        if solver.Value(self.shifts[(n, d, s)]):
-                            schedule_data[n].append(s)
-                            break
+            self.schedule_matrix = self.extract_matrix(solver.ResponseProto())
+            schedule_data = dict(enumerate(self.schedule_matrix.tolist()))
         else:
-            print("해결 가능한 스케줄을 찾을 수 없습니다.")
+            logger.info("해결 가능한 스케줄을 찾을 수 없습니다.")
 
-        print("\nStatistics")
-        print(f"  - Status           : {solver.StatusName(status)}")
-        print(f"  - Objective value  : {solver.ObjectiveValue()}")
-        print(f"  - conflicts        : {solver.NumConflicts()}")
-        print(f"  - branches         : {solver.NumBranches()}")
-        print(f"  - wall time        : {solver.WallTime()} s")
+        logger.info(
+            "Statistics - status: %s, objective: %s, conflicts: %s, branches: %s, wall time: %s s",
+            self.status_name, solver.ObjectiveValue(), solver.NumConflicts(), solver.NumBranches(), solver.WallTime(),
+        )
 
         return schedule_data
 
+
+def rule_set(params):
+    """params의 (RulePlan 또는 None, 제약조건 목록, 목적함수)"""
+    plan = plan_for(params)
+    if plan:
+        constraints, objective = plan.constraints, plan.objective
+    else:
+        constraints, objective = DEFAULT_CONSTRAINTS, setObjective
+    # 누적값 사용(use_ledger): 같은 가중치에 야간/주말 근무 수의 누적 공정성을 더한 목적함수
+    if objective is not None and params.get('ledger') is not None:
+        objective = BoundRule(
+            balanceLedgerObjective, 'ledger', **(getattr(objective, 'kwargs', None) or {}),
+            night_duty=plan.codes.get('NIGHT') if plan else NIGHT,
+        )
+    return plan, constraints, objective
+
+
+def build_solver(params, **kwargs):
+    """params_from_form()의 결과로 ScheduleSolver를 생성합니다. (설정이 있으면 모델 템플릿 캐시 사용)"""
+    kwargs.setdefault('template_cache', templates.get_template_cache())
+    plan, constraints, objective = rule_set(params)
+    if params.get('ledger'):
+        kwargs.setdefault('context', SolveContext(carry_over={int(n): offsets for n, offsets in params['ledger'].items()}))
+    fixed_assignments = {
+        (item['worker'], item['day']): item['shift']
+        for item in params['fixed_assignments']
+    }
+    return ScheduleSolver(
+        num_workers=params['num_workers'],
+        num_days=params['num_days'],
+        fixed_assignments=fixed_assignments,
+        weekends=get_weekends(params['num_days'], params['start_day_of_week']),
+        holidays=params['holidays'],
+        max_monthly_hours=params['max_monthly_hours'],
+        constraints=constraints,
+        objectiveFunc=objective,
+        plan=plan,
+        **kwargs
+    )
+
+
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     num_workers = 3
     num_days = 30
     start_day_of_week = 5
-    weekends = [d for d in range(num_days) if (d + start_day_of_week) % 7 == 5 or (d + start_day_of_week) % 7 == 6]
+    weekends = get_weekends(num_days, start_day_of_week)
     holidays = [24]
     max_monthly_hours = 250
     fixed = {(1, 11): 3, (1, 12): 3, (1, 13): 3, (1, 14): 3, (1, 15): 3, (1, 16): 3, (1, 1): 0}
-    constraints = [
-        addExactlyOne,
-        addDailyShiftRequirements,
-        addNightShiftRestRequirement,
-        addFixedAssignments,
-        addVacationRestrictions,
-        addNoConsecutiveOffDays,
-        addMonthlyWorkConstraints,
-    ]
-    schedule = ScheduleSolver(num_workers, num_days, fixed_assignments=fixed, weekends=weekends, holidays=holidays, max_monthly_hours=max_monthly_hours, constraints=constraints, objectiveFunc=setObjective)
+    schedule = ScheduleSolver(num_workers, num_days, fixed_assignments=fixed, weekends=weekends, holidays=holidays, max_monthly_hours=max_monthly_hours, constraints=DEFAULT_CONSTRAINTS, objectiveFunc=setObjective)
     rst = schedule.solve()
     if rst:
         print("\n--- 최종 근무표 ---")
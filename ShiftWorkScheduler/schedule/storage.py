@@ -0,0 +1,286 @@
+"""
+계산 결과 저장과 조회 (Team, Worker, SolveRun, Assignment)
+
+- store_schedule(): 계산이 끝난 스케줄을 한 트랜잭션에서 bulk_create로 저장합니다.
+  같은 팀의 겹치는 날짜에 있던 배정은 새 결과로 바뀝니다.
+- 조회는 모두 (team, date) 또는 (worker, date) 인덱스를 사용하고, 목록은
+  (date, worker) 기준 keyset 페이지네이션(cursor)으로 나눠서 반환합니다.
+- 근무자별 누적값(WorkerLedger)은 store_schedule()이 새 배정과 교체된 배정의 차이만큼 갱신하므로,
+  ledger_offsets()는 저장된 기간의 길이와 관계없이 근무자 수만큼의 행만 읽습니다.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .encoding import matrix_to_schedule, pack_matrix, schedule_to_matrix, unpack_matrix
+from .models import Assignment, SolveRun, Team, Worker, WorkerLedger
+from .plan import plan_for
+from .duties import ALL_DUTIES_DICT, DAY, NIGHT
+from .params import normalize_schedule
+
+BULK_BATCH_SIZE = 2000
+LEDGER_FIELDS = ('hours', 'night_count', 'weekend_count', 'holiday_count', 'weekday_day', 'holiday_day')
+
+
+def storage_options(data):
+    """폼 cleaned_data 중 저장 위치 (team이 없으면 None: 저장하지 않음)"""
+    if not data.get('team'):
+        return None
+    return {'team': data['team'], 'start_date': data['start_date'].isoformat()}
+
+
+@transaction.atomic
+def store_schedule(team, start_date, params, schedule, stats=None, job=None):
+    """
+    - team       : 팀 이름 (없으면 생성)
+    - start_date : 스케줄 첫날 (date 또는 ISO 문자열)
+    - schedule   : {worker: [codes]} 또는 {"worker_N": [...]}
+    반환값: 생성한 SolveRun
+    """
+    if isinstance(start_date, str):
+        start_date = datetime.date.fromisoformat(start_date)
+    schedule = normalize_schedule(schedule)
+    matrix = schedule_to_matrix(schedule)
+    num_days = matrix.shape[1]
+    plan = plan_for(params)
+    duties = plan.duties if plan else ALL_DUTIES_DICT
+    end_date = start_date + datetime.timedelta(days=num_days - 1)
+
+    team, _ = Team.objects.get_or_create(name=team)
+    Worker.objects.bulk_create(
+        [Worker(team=team, index=n) for n in schedule],
+        ignore_conflicts=True,
+    )
+    workers = dict(Worker.objects.filter(team=team, index__in=list(schedule)).values_list('index', 'id'))
+
+    run = SolveRun.objects.create(
+        team=team, job=job, start_date=start_date, num_days=num_days, params=params, stats=stats or {},
+        schedule=pack_matrix(matrix),
+    )
+    replaced = Assignment.objects.filter(team=team, date__range=(start_date, end_date))
+    # 누적값: 교체되는 배정을 빼고 새 배정을 더함
+    counts = _assignment_counts(replaced, sign=-1)
+    replaced.delete()
+    cells = [
+        (workers[n], start_date + datetime.timedelta(days=d), code)
+        for n, codes in schedule.items()
+        for d, code in enumerate(codes)
+    ]
+    Assignment.objects.bulk_create(
+        (
+            Assignment(run=run, team=team, worker_id=worker_id, date=date, shift=code, hours=duties[code].time)
+            for worker_id, date, code in cells
+        ),
+        batch_size=BULK_BATCH_SIZE,
+    )
+    _ledger_counts(cells, params, start_date, counts)
+    _update_ledgers(counts)
+    return run
+
+
+def _ledger_counts(cells, params, start_date, counts=None, sign=1):
+    """
+    (worker_id, date, shift) 배정의 근무자별 누적값에 sign을 곱해 counts {worker_id: {LEDGER_FIELDS: 값}}에 더합니다.
+    주말은 날짜의 요일, 공휴일은 params['holidays'](start_date 기준 1-based), 근무 종류는 params의 규칙으로 판단
+    """
+    plan = plan_for(params)
+    duties = plan.duties if plan else ALL_DUTIES_DICT
+    night_duty = plan.codes.get('NIGHT') if plan else NIGHT
+    fairness_duty = plan.fairness_duty if plan else DAY
+    holidays = {start_date + datetime.timedelta(days=day - 1) for day in params.get('holidays', ())}
+    counts = {} if counts is None else counts
+    for worker_id, date, shift in cells:
+        row = counts.setdefault(worker_id, dict.fromkeys(LEDGER_FIELDS, 0))
+        weekend = date.weekday() >= 5
+        holiday = weekend or date in holidays
+        if duties[shift].type == 'work':
+            row['hours'] += sign * duties[shift].time
+            if weekend:
+                row['weekend_count'] += sign
+            elif holiday:
+                row['holiday_count'] += sign
+        if shift == night_duty:
+            row['night_count'] += sign
+        if shift == fairness_duty:
+            row['holiday_day' if holiday else 'weekday_day'] += sign
+    return counts
+
+
+def _assignment_counts(queryset, counts=None, sign=1):
+    """배정 queryset의 근무자별 누적값. 배정마다 그 배정을 만든 SolveRun의 params로 판단합니다."""
+    cells_by_run = {}
+    for run_id, worker_id, date, shift in queryset.values_list('run_id', 'worker_id', 'date', 'shift'):
+        cells_by_run.setdefault(run_id, []).append((worker_id, date, shift))
+    counts = {} if counts is None else counts
+    runs = SolveRun.objects.filter(pk__in=list(cells_by_run)).values_list('pk', 'params', 'start_date')
+    for run_id, params, start_date in runs:
+        _ledger_counts(cells_by_run[run_id], params, start_date, counts, sign)
+    return counts
+
+
+def _update_ledgers(counts):
+    """counts의 차이를 WorkerLedger에 더합니다. (근무자마다 한 행)"""
+    counts = {worker_id: row for worker_id, row in counts.items() if any(row.values())}
+    if not counts:
+        return
+    WorkerLedger.objects.bulk_create([WorkerLedger(worker_id=worker_id) for worker_id in counts], ignore_conflicts=True)
+    ledgers = list(WorkerLedger.objects.select_for_update().filter(worker_id__in=list(counts)))
+    now = timezone.now()
+    for ledger in ledgers:
+        for field, value in counts[ledger.worker_id].items():
+            setattr(ledger, field, getattr(ledger, field) + value)
+        ledger.updated_at = now
+    WorkerLedger.objects.bulk_update(ledgers, LEDGER_FIELDS + ('updated_at',), batch_size=BULK_BATCH_SIZE)
+
+
+@transaction.atomic
+def rebuild_ledger(team):
+    """팀의 누적값을 남아있는 배정 전체로 다시 계산합니다. (저장된 기간에 비례, 누적값 도입 전 데이터 이전용)"""
+    counts = _assignment_counts(Assignment.objects.filter(team__name=team))
+    WorkerLedger.objects.filter(worker__team__name=team).delete()
+    WorkerLedger.objects.bulk_create(
+        [WorkerLedger(worker_id=worker_id, **row) for worker_id, row in counts.items()],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+
+def ledger_totals(team):
+    """팀 근무자별 누적값 (근무자 번호 순서)"""
+    rows = (
+        WorkerLedger.objects.filter(worker__team__name=team)
+        .values('worker__index', *LEDGER_FIELDS, 'updated_at')
+        .order_by('worker__index')
+    )
+    return [dict(row, worker=row.pop('worker__index')) for row in rows]
+
+
+def ledger_offsets(team, num_workers):
+    """
+    근무자 0..num_workers-1의 누적값에서 각 항목의 최솟값을 뺀 값 (params['ledger'], ScheduleSolver의 carry_over).
+    반환값: {"n": {'hours', 'weekday_day', 'holiday_day', 'night', 'weekend'}} (값이 모두 0인 근무자는 생략)
+    WorkerLedger를 근무자 수만큼만 읽습니다. 누적값이 없는 근무자(새 근무자)는 최솟값(0)으로 봅니다.
+    """
+    totals = {
+        row['worker__index']: {
+            'hours': row['hours'],
+            'weekday_day': row['weekday_day'],
+            'holiday_day': row['holiday_day'],
+            'night': row['night_count'],
+            'weekend': row['weekend_count'] + row['holiday_count'],
+        }
+        for row in WorkerLedger.objects.filter(worker__team__name=team, worker__index__lt=num_workers)
+        .values('worker__index', *LEDGER_FIELDS)
+    }
+    if not totals:
+        return {}
+    if len(totals) < num_workers:
+        # 누적값이 없는 근무자가 있으면 모든 항목의 최솟값은 0
+        minimum = dict.fromkeys(next(iter(totals.values())), 0)
+    else:
+        minimum = {key: min(values[key] for values in totals.values()) for key in next(iter(totals.values()))}
+    offsets = {}
+    for n, values in sorted(totals.items()):
+        offset = {key: value - minimum[key] for key, value in values.items()}
+        if any(offset.values()):
+            offsets[str(n)] = offset
+    return offsets
+
+
+def encode_cursor(date, worker_id):
+    return f"{date.isoformat()}.{worker_id}"
+
+
+def decode_cursor(cursor):
+    """encode_cursor()의 값 → (date, worker_id). 형식이 틀리면 ValueError"""
+    date, worker_id = cursor.split('.')
+    return datetime.date.fromisoformat(date), int(worker_id)
+
+
+def assignment_page(team, date_from=None, date_to=None, shift=None, worker=None, cursor=None, limit=500):
+    """
+    팀의 배정을 (date, worker) 순서로 limit개씩 반환합니다.
+    반환값: (배정 dict 리스트, 다음 페이지 cursor 또는 None)
+    """
+    queryset = Assignment.objects.filter(team__name=team)
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if shift is not None:
+        queryset = queryset.filter(shift=shift)
+    if worker is not None:
+        queryset = queryset.filter(worker__index=worker)
+    if cursor:
+        date, worker_id = decode_cursor(cursor)
+        queryset = queryset.filter(Q(date__gt=date) | Q(date=date, worker_id__gt=worker_id))
+
+    rows = list(
+        queryset.order_by('date', 'worker_id')
+        .values('date', 'worker_id', 'worker__index', 'shift', 'hours', 'run_id')[:limit + 1]
+    )
+    next_cursor = encode_cursor(rows[limit - 1]['date'], rows[limit - 1]['worker_id']) if len(rows) > limit else None
+    return [
+        {
+            'date': row['date'].isoformat(),
+            'worker': row['worker__index'],
+            'shift': row['shift'],
+            'hours': row['hours'],
+            'run_id': row['run_id'],
+        }
+        for row in rows[:limit]
+    ], next_cursor
+
+
+def worker_totals(team, date_from, date_to):
+    """
+    기간 내 근무자별 총 근무시간과 근무 종류별 횟수.
+    근무 종류는 배정마다 그 배정을 만든 SolveRun의 params(규칙 설정)로 판단합니다.
+    """
+    assignments = Assignment.objects.filter(team__name=team, date__range=(date_from, date_to))
+    # 근무 종류 이름 -> 그 종류를 나타내는 (run, shift) 조건
+    filters = {}
+    for run_id, params in SolveRun.objects.filter(pk__in=assignments.values('run_id')).values_list('pk', 'params'):
+        plan = plan_for(params)
+        for code, duty in (plan.duties if plan else ALL_DUTIES_DICT).items():
+            condition = Q(run_id=run_id, shift=code)
+            name = f'{duty.name.lower()}_count'
+            filters[name] = filters[name] | condition if name in filters else condition
+    rows = (
+        assignments.values('worker__index')
+        .annotate(
+            hours=Sum('hours'),
+            days=Count('id'),
+            **{name: Count('id', filter=condition) for name, condition in filters.items()},
+        )
+        .order_by('worker__index')
+    )
+    return [dict(row, worker=row.pop('worker__index')) for row in rows]
+
+
+def run_page(team=None, cursor=None, limit=50):
+    """저장된 계산 결과를 최신순으로 limit개씩 반환합니다. cursor는 마지막 run_id"""
+    queryset = SolveRun.objects.select_related('team').defer('schedule')
+    if team:
+        queryset = queryset.filter(team__name=team)
+    if cursor:
+        queryset = queryset.filter(pk__lt=int(cursor))
+    runs = list(queryset.order_by('-pk')[:limit + 1])
+    next_cursor = str(runs[limit - 1].pk) if len(runs) > limit else None
+    return [run.to_dict() for run in runs[:limit]], next_cursor
+
+
+def run_schedule(run):
+    """
+    SolveRun의 스케줄을 API 형식 {"worker_N": [codes]}으로.
+    압축 저장본이 없으면 남아있는 배정에서 만듭니다. (다른 결과로 바뀐 날짜는 None)
+    """
+    if run.schedule:
+        return matrix_to_schedule(unpack_matrix(bytes(run.schedule)))
+    schedule = {}
+    offsets = {}
+    for index, date, shift in run.assignments.values_list('worker__index', 'date', 'shift'):
+        codes = schedule.setdefault(f'worker_{index}', [None] * run.num_days)
+        codes[offsets.setdefault(date, (date - run.start_date).days)] = shift
+    return schedule
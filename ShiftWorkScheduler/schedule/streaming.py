@@ -0,0 +1,100 @@
+"""
+스트리밍 응답 (SSE /api/solve_schedule/stream/, NDJSON /api/solve_schedule/batch/, sweep/)
+
+계산 결과를 기다리는 코드(producer)는 별도 스레드에서 실행하고, 응답은 producer가 emit()한 값을
+queue에서 꺼내 바로 전송합니다.
+- WSGI: 동기 iterator
+- ASGI: async iterator. 다음 값은 스레드 풀에서 기다리므로 이벤트 루프를 막지 않습니다.
+  (동기 iterator를 그대로 주면 Django의 ASGI handler는 스트림 전체를 list로 모은 뒤 전송함)
+응답이 끝나거나 클라이언트가 연결을 끊으면 (WSGI: response.close(), ASGI: CancelledError 또는
+response.close()) stopped를 설정하므로, producer는 stopped를 확인해 남은 계산을 취소합니다.
+"""
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import StreamingHttpResponse
+
+# producer가 stopped를 확인하는 간격 (초)
+POLL_INTERVAL = 0.5
+
+_END = object()
+
+
+class ProducerStream:
+    """
+    producer(emit, stopped)를 스레드에서 실행하고 emit()한 값을 차례로 반환하는 iterator (WSGI)
+    keepalive를 주면 keepalive_interval초 동안 값이 없을 때 keepalive를 보냅니다.
+    """
+
+    def __init__(self, producer, keepalive=None, keepalive_interval=15.0):
+        self.items = queue.Queue()
+        self.stopped = threading.Event()
+        self.keepalive = keepalive
+        self.keepalive_interval = keepalive_interval
+        self._producer = producer
+        self._thread = None
+
+    def _run(self):
+        try:
+            self._producer(self.items.put, self.stopped)
+        finally:
+            self.items.put(_END)
+            # 이 스레드에서 연 DB 연결 정리
+            connections.close_all()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _next(self):
+        try:
+            return self.items.get(timeout=self.keepalive_interval if self.keepalive is not None else None)
+        except queue.Empty:
+            return self.keepalive
+
+    def __iter__(self):
+        self._start()
+        try:
+            while (item := self._next()) is not _END:
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        self.stopped.set()
+
+
+class AsyncProducerStream(ProducerStream):
+    """ProducerStream의 async iterator (ASGI)"""
+
+    # StreamingHttpResponse가 async iterator로 사용하도록 동기 iterator 프로토콜은 제거
+    __iter__ = None
+
+    async def __aiter__(self):
+        self._start()
+        try:
+            while (item := await sync_to_async(self._next, thread_sensitive=False)()) is not _END:
+                yield item
+        finally:
+            # 연결이 끊기면 CancelledError가 여기까지 전달됨
+            self.close()
+
+
+def streaming_response(request, producer, content_type, keepalive=None):
+    """요청을 처리하는 handler(WSGI/ASGI)에 맞는 iterator로 producer의 값을 보내는 StreamingHttpResponse"""
+    stream_class = AsyncProducerStream if isinstance(request, ASGIRequest) else ProducerStream
+    return StreamingHttpResponse(stream_class(producer, keepalive), content_type=content_type)
+
+
+def wait_first(pending, stopped):
+    """pending Future 중 끝난 것들. 그 전에 stopped가 설정되면 빈 집합"""
+    while not stopped.is_set():
+        done, _ = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        if done:
+            return done
+    return set()
@@ -0,0 +1,89 @@
+"""
+what-if 비교 계산 (/api/solve_schedule/sweep/)
+
+기본 설정(base, /api/solve_schedule/과 같은 payload)에서 일부 값만 바꾼 변형을 모두 계산해
+실행 가능 여부와 공정성 항목을 비교합니다. sweep의 값 목록은 데카르트 곱으로 펼칩니다.
+
+    {"base": {...}, "sweep": {"max_monthly_hours": [180, 200, 220], "num_workers": [10, 11]}}
+
+변형은 일괄 계산과 같은 프로세스 풀(jobs.solve_in_pool)에서 동시에 계산합니다.
+- 모델 템플릿: 작업 프로세스마다 templates.get_template_cache()를 사용하므로 모양이 같은 변형은
+  두 번째부터 템플릿을 복제합니다.
+- 초기 해: 모양(근무자 수, 일수, 시작 요일)마다 첫 변형을 먼저 계산하고, 나머지는 그 결과를 hint로 사용합니다.
+비교 항목(compare_row)도 작업 프로세스에서 계산하므로 웹 프로세스는 계산 모듈을 불러오지 않습니다.
+"""
+import itertools
+
+from .params import normalize_schedule
+
+# 값을 바꿔 볼 수 있는 설정
+SWEEP_FIELDS = ('num_workers', 'num_days', 'start_day_of_week', 'max_monthly_hours', 'holidays', 'profile', 'rule_config')
+
+
+class SweepError(ValueError):
+    pass
+
+
+def expand_sweep(base, sweep, max_variants):
+    """
+    base payload와 sweep {필드: [값, ...]}의 데카르트 곱.
+    반환값: [(변경한 값 {필드: 값}, payload), ...] (sweep의 필드 순서대로, 마지막 필드가 가장 빨리 바뀜)
+    """
+    if not isinstance(base, dict):
+        raise SweepError("base는 스케줄 설정 딕셔너리(객체)여야 합니다.")
+    if not isinstance(sweep, dict) or not sweep:
+        raise SweepError("sweep은 {필드: [값, ...]} 형식이어야 합니다.")
+    unknown = [field for field in sweep if field not in SWEEP_FIELDS]
+    if unknown:
+        raise SweepError(f"sweep에 사용할 수 없는 필드입니다: {', '.join(unknown)} (가능: {', '.join(SWEEP_FIELDS)})")
+    if any(not isinstance(values, list) or not values for values in sweep.values()):
+        raise SweepError("sweep의 값은 비어 있지 않은 리스트(배열)여야 합니다.")
+    total = 1
+    for values in sweep.values():
+        total *= len(values)
+    if total > max_variants:
+        raise SweepError(f"변형은 최대 {max_variants}개까지 계산할 수 있습니다. (요청: {total}개)")
+
+    fields = list(sweep)
+    variants = []
+    for values in itertools.product(*(sweep[field] for field in fields)):
+        variation = dict(zip(fields, values))
+        variants.append((variation, dict(base, **variation)))
+    return variants
+
+
+def shape_key(params):
+    """hint를 공유할 수 있는 변형의 키 (cache.make_hint_key와 같은 기준)"""
+    return params['num_workers'], params['num_days'], params['start_day_of_week']
+
+
+def compare_row(params, entry):
+    """cached_solve() 결과의 비교 항목: 실행 가능 여부, 목적함수 값, 공정성 항목과 근무시간 범위"""
+    stats = entry['stats']
+    row = {
+        'feasible': entry['schedule'] is not None,
+        'solver_status': stats.get('status'),
+        'objective': stats.get('objective'),
+        'wall_time': stats.get('wall_time'),
+        'warm_start': stats.get('warm_start', False),
+    }
+    if entry['schedule']:
+        import numpy as np
+
+        from .roster import fairness_evaluator
+
+        schedule = normalize_schedule(entry['schedule'])
+        matrix = np.array([schedule[n] for n in sorted(schedule)])
+        evaluator, _ = fairness_evaluator(params)
+        hours = evaluator.values(matrix)['hours']
+        row['terms'] = evaluator.terms(matrix)
+        row['hours'] = {'min': int(hours.min()), 'max': int(hours.max()), 'spread': int(hours.max() - hours.min())}
+    return row
+
+
+def run_variant(params, options):
+    """프로세스 풀에서 변형 하나를 계산. 반환값: (cached_solve()의 entry, 캐시 사용 여부, compare_row())"""
+    from .jobs import run_solve
+
+    entry, cached = run_solve(params, options)
+    return entry, cached, compare_row(params, entry)
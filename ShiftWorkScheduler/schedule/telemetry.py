@@ -0,0 +1,232 @@
+"""
+계산 과정 계측 (로그, Prometheus /metrics)
+
+- 모델 생성 시간, 제약조건 함수별로 추가된 변수/제약조건 수, presolve 전후 모델 크기,
+  목적함수 값/하한의 변화는 ScheduleSolver.telemetry에 기록됩니다.
+- record_solve()가 이를 로그로 남기고 아래 지표에 반영합니다.
+- 지표는 프로세스별로 집계됩니다. 프로세스 풀에서 계산한 결과는 결과를 받은
+  웹 프로세스에서 record_solve()를 호출해 반영합니다.
+"""
+import logging
+import re
+import threading
+
+logger = logging.getLogger('schedule.telemetry')
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 600.0)
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, values)) + '}'
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Counter):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            bucket_counts, count, total = self._values.get(key, ([0] * len(self.buckets), 0, 0.0))
+            bucket_counts = [c + (value <= bound) for c, bound in zip(bucket_counts, self.buckets)]
+            self._values[key] = (bucket_counts, count + 1, total + value)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        samples = []
+        bucket_labels = self.labelnames + ('le',)
+        for key, (bucket_counts, count, total) in items:
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                samples.append((self.name + '_bucket', _format_labels(bucket_labels, key + (bound,)), bucket_count))
+            samples.append((self.name + '_bucket', _format_labels(bucket_labels, key + ('+Inf',)), count))
+            samples.append((self.name + '_sum', _format_labels(self.labelnames, key), total))
+            samples.append((self.name + '_count', _format_labels(self.labelnames, key), count))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Prometheus text exposition format (0.0.4)"""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+SOLVES = REGISTRY.register(Counter(
+    'schedule_solves_total', '계산 횟수 (CP-SAT 상태, 프로필별)', ('status', 'profile')))
+SOLVE_SECONDS = REGISTRY.register(Histogram(
+    'schedule_solve_seconds', 'CP-SAT 계산 시간 (초)', ('profile',)))
+BUILD_SECONDS = REGISTRY.register(Histogram(
+    'schedule_build_seconds', '모델 생성 시간 (초)'))
+RULE_SECONDS = REGISTRY.register(Counter(
+    'schedule_rule_build_seconds_total', '제약조건 함수별 누적 모델 생성 시간 (초)', ('rule',)))
+RULE_VARIABLES = REGISTRY.register(Counter(
+    'schedule_rule_variables_total', '제약조건 함수별 누적 추가 변수 수', ('rule',)))
+RULE_CONSTRAINTS = REGISTRY.register(Counter(
+    'schedule_rule_constraints_total', '제약조건 함수별 누적 추가 제약조건 수', ('rule',)))
+PRESOLVE_SIZE = REGISTRY.register(Gauge(
+    'schedule_last_model_size', '마지막 계산의 presolve 전/후 모델 크기 (input: 입력 presolve 전 근무 변수/제약조건 수)', ('stage', 'kind')))
+PRECHECK_REJECTIONS = REGISTRY.register(Counter(
+    'schedule_precheck_rejections_total', '사전 검사에서 해가 없다고 판단한 요청 수 (제약조건별)', ('rule',)))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'schedule_cache_requests_total', '결과 캐시 조회 (hit/miss)', ('result',)))
+JOBS_SUBMITTED = REGISTRY.register(Counter(
+    'schedule_jobs_submitted_total', '작업 큐에 제출된 작업 수'))
+JOBS_REJECTED = REGISTRY.register(Counter(
+    'schedule_jobs_rejected_total', '대기열이 가득 차 거절된 작업 수'))
+JOBS = REGISTRY.register(Gauge(
+    'schedule_jobs', '상태별 작업 수 (조회 시점)', ('status',)))
+MODEL_TEMPLATES = REGISTRY.register(Counter(
+    'schedule_model_templates_total', '모델 템플릿 캐시 조회 (hit/miss)', ('result',)))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    'schedule_admission_rejected_total', '429로 거절한 요청 수 (queue_full, timeout, rate_limit)', ('reason',)))
+SOLVER_SLOTS = REGISTRY.register(Gauge(
+    'schedule_solver_slots', '웹 프로세스의 계산 자리 사용량 (active: 계산 수, threads: 스레드 합계, waiting: 대기 수)', ('kind',)))
+
+
+def record_cache(hit):
+    CACHE_REQUESTS.inc(result='hit' if hit else 'miss')
+
+
+def record_solve(entry, cached):
+    """cached_solve()의 결과 하나를 로그와 지표에 반영합니다."""
+    if entry['stats'].get('precheck'):
+        for rule in sorted({conflict['rule'] for conflict in entry['conflicts']}):
+            PRECHECK_REJECTIONS.inc(rule=rule)
+        logger.info("precheck rejected: %s", '; '.join(conflict['message'] for conflict in entry['conflicts']))
+        return
+    record_cache(cached)
+    if cached:
+        return
+    stats = entry['stats']
+    telemetry = entry.get('telemetry') or {}
+    SOLVES.inc(status=stats['status'], profile=stats.get('profile', ''))
+    SOLVE_SECONDS.observe(stats['wall_time'], profile=stats.get('profile', ''))
+    if 'build_seconds' in telemetry:
+        BUILD_SECONDS.observe(telemetry['build_seconds'])
+    for rule in telemetry.get('rules', []):
+        RULE_SECONDS.inc(rule['seconds'], rule=rule['rule'])
+        RULE_VARIABLES.inc(rule['variables'], rule=rule['rule'])
+        RULE_CONSTRAINTS.inc(rule['constraints'], rule=rule['rule'])
+    for stage, size in (telemetry.get('presolve') or {}).items():
+        for kind, value in size.items():
+            PRESOLVE_SIZE.set(value, stage=stage, kind=kind)
+    if telemetry.get('model_template'):
+        MODEL_TEMPLATES.inc(result=telemetry['model_template'])
+    input_presolve = telemetry.get('input_presolve')
+    if input_presolve:
+        PRESOLVE_SIZE.set(input_presolve['variables_before'], stage='input', kind='variables')
+        if 'constraints_before' in input_presolve:
+            PRESOLVE_SIZE.set(input_presolve['constraints_before'], stage='input', kind='constraints')
+        logger.debug("input presolve: %d -> %d shift variables (fixed %d, forbidden %d), %s -> %s constraints",
+                     input_presolve['variables_before'], input_presolve['variables_after'],
+                     input_presolve['fixed'], input_presolve['forbidden'],
+                     input_presolve.get('constraints_before', '?'), input_presolve.get('constraints'))
+
+    logger.info(
+        "solve status=%s profile=%s objective=%s bound=%s wall_time=%.3fs build=%.3fs solutions=%s",
+        stats['status'], stats.get('profile'), stats['objective'], stats.get('best_bound'),
+        stats['wall_time'], telemetry.get('build_seconds', 0.0), stats.get('solutions'),
+    )
+    for rule in telemetry.get('rules', []):
+        logger.debug("  rule %-32s %.4fs +%d vars +%d constraints",
+                     rule['rule'], rule['seconds'], rule['variables'], rule['constraints'])
+
+
+def render_metrics():
+    """/metrics 응답 본문. 작업 상태별 개수는 조회 시점에 DB에서 읽습니다."""
+    from django.db.models import Count
+    from .models import SolveJob
+
+    counts = dict(SolveJob.objects.values_list('status').annotate(n=Count('id')))
+    for status, _ in SolveJob.STATUS_CHOICES:
+        JOBS.set(counts.get(status, 0), status=status)
+    return REGISTRY.render()
+
+
+# ---------------------------------------------------------------------------
+# CP-SAT 로그에서 presolve 전/후 모델 크기 추출
+# ---------------------------------------------------------------------------
+
+_MODEL_HEADER = re.compile(r'^(Initial|Presolved) optimization model')
+_VARIABLES = re.compile(r"^#Variables: ([\d']+)")
+_CONSTRAINT = re.compile(r"^#k\w+: ([\d']+)")
+
+
+def parse_presolve_log(lines):
+    """
+    CP-SAT 검색 로그(log_search_progress)에서 모델 요약을 읽어
+    {'initial': {'variables': n, 'constraints': m}, 'presolved': {...}}를 반환합니다.
+    """
+    result = {}
+    stage = None
+    for line in (line for block in lines for line in block.splitlines()):
+        header = _MODEL_HEADER.match(line)
+        if header:
+            stage = header.group(1).lower()
+            result[stage] = {'variables': 0, 'constraints': 0}
+            continue
+        if stage is None:
+            continue
+        match = _VARIABLES.match(line)
+        if match:
+            result[stage]['variables'] = int(match.group(1).replace("'", ''))
+            continue
+        match = _CONSTRAINT.match(line)
+        if match:
+            result[stage]['constraints'] += int(match.group(1).replace("'", ''))
+        elif not line.startswith(('#', '  ')):
+            stage = None
+    return result
@@ -0,0 +1,168 @@
+"""
+모델 템플릿 캐시
+
+같은 모양(근무자 수, 일수, 주말/공휴일, 최대 근무시간, 규칙)의 요청은 변수와 구조적인 제약조건,
+목적함수가 모두 같고 고정 근무와 근무 가능 인원만 다릅니다. 처음 요청에서 고정 근무 없이 만든
+모델(ModelTemplate)을 저장해 두고, 이후 요청은 CpModel.Clone()으로 복제한 뒤 입력으로 정해지는
+값만 변수 domain으로 고정합니다. (ScheduleSolver.useTemplate)
+
+- 고정 근무/휴가 제한(BOUND_RULES): presolveValues()의 값 (1 또는 0)
+- 근무 가능 인원 조건(whenAvailable): 날짜별 조건 리터럴을 참/거짓으로
+
+모델 밖에서 정해진 근무 정보(solve.SolveContext: 부분 재계산, 이전 기간 근무, 누적값, 모델 밖 근무자 값), 충돌 설명 모드,
+TEMPLATE_RULES 밖의 제약조건을 쓰는 요청은 템플릿 없이 모델을 만듭니다.
+캐시는 프로세스별이며, max_entries개 / 템플릿 proto 직렬화 크기 합 max_bytes를 넘으면 오래 쓰지 않은 것부터 지웁니다.
+"""
+import threading
+from collections import OrderedDict
+
+from . import rules
+
+# 모델 모양만 보고 만드는 제약조건 (근무 가능 인원은 whenAvailable()로 사용)
+STRUCTURAL_RULES = {
+    rules.addExactlyOne, rules.addDailyShiftRequirements, rules.addNightShiftRestRequirement,
+    rules.addNoConsecutiveOffDays, rules.addMonthlyWorkConstraints,
+    rules.addCoverage, rules.addRestAfter, rules.addNoConsecutive, rules.addWorkload,
+}
+# 요청의 고정 근무로 정해지는 제약조건: 템플릿에는 넣지 않고 변수 domain으로 반영
+BOUND_RULES = {rules.addFixedAssignments, rules.addVacationRestrictions, rules.addOnlyWhenFixed}
+TEMPLATE_RULES = STRUCTURAL_RULES | BOUND_RULES
+TEMPLATE_OBJECTIVES = {rules.setObjective, rules.balanceObjective}
+
+# 템플릿과 복제한 모델이 함께 쓰는 ScheduleSolver 속성 (변수는 번호로만 참조되므로 그대로 사용 가능)
+SHARED_ATTRIBUTES = (
+    'shifts', 'shift_indices', 'worker_hours', 'worker_work_days', 'worker_shift_count', 'day_shift_count',
+    'objective_terms', 'objective_expression', 'rule_constraints',
+)
+
+
+def _rule(constraint):
+    return getattr(constraint, 'func', constraint)
+
+
+def _rule_key(constraint):
+    return constraint.__name__, repr(sorted((getattr(constraint, 'kwargs', None) or {}).items()))
+
+
+def serialized_size(model):
+    """
+    모델 proto의 직렬화 크기 (바이트). 캐시 메모리 제한의 기준으로 사용
+    OR-Tools 9.13부터 Proto()는 protobuf 메시지가 아니라 C++ 객체 래퍼라 ByteSize()가 없으므로
+    텍스트 형식의 길이로 추정합니다. (바이너리 크기보다 크므로 제한에 여유가 생기는 쪽)
+    """
+    proto = model.Proto()
+    if hasattr(proto, 'ByteSize'):
+        return proto.ByteSize()
+    return len(str(proto))
+
+
+def template_key(solver):
+    """solver의 모델 템플릿 키. 템플릿을 사용할 수 없는 요청이면 None"""
+    if solver.explain or not solver.presolve or solver.context:
+        return None
+    if any(_rule(constraint) not in TEMPLATE_RULES for constraint in solver.constraints):
+        return None
+    if solver.objectiveFunc is not None and _rule(solver.objectiveFunc) not in TEMPLATE_OBJECTIVES:
+        return None
+    return (
+        solver.num_workers, solver.num_days, tuple(sorted(solver.weekends)), tuple(sorted(solver.holidays)),
+        solver.max_monthly_hours, solver.plan.fingerprint if solver.plan else None,
+        tuple(_rule_key(constraint) for constraint in solver.constraints),
+        _rule_key(solver.objectiveFunc) if solver.objectiveFunc else None,
+    )
+
+
+class ModelTemplate:
+    def __init__(self, builder):
+        self.model = builder.model
+        for name in SHARED_ATTRIBUTES:
+            setattr(self, name, getattr(builder, name))
+        # {(날짜, 인원): 조건 리터럴 번호}
+        self.availability = {key: literal.Index() for key, literal in builder.availability.items()}
+        self.nbytes = serialized_size(self.model)
+        self.build_seconds = builder.telemetry['build_seconds']
+
+
+def build_template(solver):
+    """solver와 같은 모양의 모델을 고정 근무 없이 만듭니다. (BOUND_RULES는 제외)"""
+    builder = type(solver)(
+        solver.num_workers, solver.num_days,
+        weekends=solver.weekends,
+        holidays=[d + 1 for d in solver.holidays],
+        max_monthly_hours=solver.max_monthly_hours,
+        constraints=[constraint for constraint in solver.constraints if _rule(constraint) not in BOUND_RULES],
+        objectiveFunc=solver.objectiveFunc,
+        plan=solver.plan,
+        presolve=False,
+    )
+    # 근무 가능 인원 조건은 입력으로 정하지 않고 리터럴로 남겨 둠 (ScheduleSolver.whenAvailable)
+    builder.availability = {}
+    builder.build()
+    return ModelTemplate(builder)
+
+
+class TemplateCache:
+    def __init__(self, max_entries=32, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._templates = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._templates)
+
+    def get(self, solver):
+        """
+        solver의 (모델 템플릿, 캐시 사용 여부). 없으면 만들어 저장합니다.
+        템플릿을 사용할 수 없는 요청이면 (None, False)
+        """
+        key = template_key(solver)
+        if key is None:
+            return None, False
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template, True
+            self.misses += 1
+        template = build_template(solver)
+        with self._lock:
+            if key not in self._templates and template.nbytes <= self.max_bytes:
+                self._templates[key] = template
+                self._bytes += template.nbytes
+                while len(self._templates) > self.max_entries or self._bytes > self.max_bytes:
+                    _, evicted = self._templates.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+        return template, False
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._templates), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_template_cache():
+    """settings.SCHEDULE_MODEL_TEMPLATE_CACHE의 캐시 (None이거나 Django 설정이 없으면 None: 사용 안 함)"""
+    global _cache
+    from django.conf import settings
+    if not settings.configured:
+        return None
+    config = getattr(settings, 'SCHEDULE_MODEL_TEMPLATE_CACHE', None)
+    if config is None:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TemplateCache(**config)
+        return _cache
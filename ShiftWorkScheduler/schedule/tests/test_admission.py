@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from schedule import admission
+from schedule.admission import AdmissionRejected, RateLimiter, SolverBudget
+from schedule.cache import build_solver, get_result_cache
+from schedule.jobs import submit_job
+from schedule.profiles import get_profile
+
+from .utils import PARAMS, PAYLOAD, post_json
+
+
+class SolverBudgetTests(SimpleTestCase):
+    def test_threads_are_clamped_and_released(self):
+        budget = SolverBudget(max_concurrent=2, max_threads=4)
+        ticket = budget.acquire(8)
+        self.assertEqual(ticket.threads, 4)
+        self.assertEqual((budget.active, budget.threads), (1, 4))
+        ticket.release()
+        ticket.release()
+        self.assertEqual((budget.active, budget.threads), (0, 0))
+
+    def test_queue_full_and_timeout(self):
+        budget = SolverBudget(max_concurrent=1, max_queue=0)
+        budget.acquire(1)
+        with self.assertRaises(AdmissionRejected) as raised:
+            budget.acquire(1)
+        self.assertEqual(raised.exception.reason, 'queue_full')
+
+        budget = SolverBudget(max_concurrent=1, max_queue=1, queue_timeout=0.05)
+        budget.acquire(1)
+        with self.assertRaises(AdmissionRejected) as raised:
+            budget.acquire(1)
+        self.assertEqual(raised.exception.reason, 'timeout')
+        self.assertEqual(budget.waiting, 0)
+
+    def test_rate_limiter(self):
+        limiter = RateLimiter(requests=2, per=60.0)
+        self.assertEqual([limiter.check('a'), limiter.check('a')], [0, 0])
+        self.assertGreater(limiter.check('a'), 0)
+        self.assertEqual(limiter.check('b'), 0)
+
+
+class ProfileLimitTests(SimpleTestCase):
+    def test_limited(self):
+        profile = get_profile('interactive')
+        self.assertEqual(profile.limited(2).num_search_workers, 2)
+        self.assertEqual(profile.limited(16).num_search_workers, profile.num_search_workers)
+        self.assertIs(profile.limited(None), profile)
+        # num_search_workers=0(코어 수)이면 상한만큼
+        self.assertEqual(get_profile('batch').limited(3).num_search_workers, 3)
+        self.assertEqual(profile.num_search_workers, 8)
+
+
+class AdmissionControlTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    @override_settings(SCHEDULE_RATE_LIMIT={'requests': 1, 'per': 60.0})
+    def test_rate_limit_returns_429_with_retry_after(self):
+        with mock.patch.object(admission, '_limiter', None):
+            # 폼 검증 실패(400)도 요청 수에 포함
+            self.assertEqual(post_json(self.client, '/api/solve_schedule/', dict(PAYLOAD, num_workers=0)).status_code, 400)
+            response = post_json(self.client, '/api/solve_schedule/', PAYLOAD)
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    @override_settings(SCHEDULE_RATE_LIMIT=None)
+    def test_busy_solver_returns_429(self):
+        budget = SolverBudget(max_concurrent=1, max_queue=0)
+        ticket = budget.acquire(1)
+        with mock.patch.object(admission, '_budget', budget):
+            response = post_json(self.client, '/api/solve_schedule/', PAYLOAD)
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        ticket.release()
+
+    @override_settings(SCHEDULE_RATE_LIMIT=None)
+    def test_solve_uses_reserved_threads(self):
+        budget = SolverBudget(max_threads=2)
+        with mock.patch.object(admission, '_budget', budget), \
+                mock.patch('schedule.cache.build_solver', wraps=build_solver) as built:
+            response = post_json(self.client, '/api/solve_schedule/', PAYLOAD)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(built.call_args.kwargs['profile'].num_search_workers, 2)
+        self.assertEqual(response.json()['stats']['profile'], PAYLOAD['profile'])
+        self.assertEqual((budget.active, budget.threads), (0, 0))
+
+
+@override_settings(SCHEDULE_JOB_BACKEND='worker')
+class PoolProfileTests(TestCase):
+    def test_jobs_default_to_throughput(self):
+        job = submit_job(PARAMS, {'profile': None})
+        self.assertEqual(job.options['profile'], 'throughput')
+        self.assertEqual(submit_job(PARAMS, {'profile': 'interactive'}).options['profile'], 'interactive')
@@ -0,0 +1,56 @@
+from django.test import TestCase
+
+from schedule.cache import cached_solve, get_result_cache, lookup, result_key
+from schedule.jobs import submit_job
+from schedule.models import SolveJob
+
+from .utils import PARAMS, PAYLOAD, PROFILE, post_json
+
+
+class AlternativesTests(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_key_depends_on_alternatives(self):
+        key = result_key(PARAMS, PROFILE)
+        self.assertNotEqual(key, result_key(PARAMS, PROFILE, alternatives=1))
+        self.assertNotEqual(result_key(PARAMS, PROFILE, alternatives=1),
+                            result_key(PARAMS, PROFILE, alternatives=1, alternative_min_distance=3))
+        # 허용 범위를 주지 않으면 기본값과 같은 키
+        self.assertEqual(
+            result_key(PARAMS, PROFILE, alternatives=1),
+            result_key(PARAMS, PROFILE, alternatives=1, alternative_tolerance=0.05),
+        )
+
+    def test_lookup_finds_cached_solve_result(self):
+        entry, cached = cached_solve(PARAMS, profile=PROFILE, max_time_limit=600.0, alternatives=1)
+        self.assertFalse(cached)
+        self.assertIsNotNone(entry['schedule'])
+        self.assertIn('alternatives', entry)
+
+        self.assertEqual(lookup(PARAMS, PROFILE, max_time_limit=600.0, alternatives=1), entry)
+        # 대안 스케줄 없이 요청하면 다른 결과
+        self.assertIsNone(lookup(PARAMS, PROFILE, max_time_limit=600.0))
+
+        job = submit_job(PARAMS, {'profile': PROFILE, 'alternatives': 1})
+        self.assertEqual(job.status, SolveJob.SUCCEEDED)
+        self.assertTrue(job.progress['cached'])
+        self.assertEqual(job.progress['alternatives'], entry['alternatives'])
+
+    def test_alternatives_are_distinct_and_near_optimal(self):
+        tolerance, min_distance = 0.05, 10
+        response = post_json(self.client, '/api/solve_schedule/', dict(
+            PAYLOAD, alternatives=2, alternative_tolerance=tolerance, alternative_min_distance=min_distance,
+        ))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        found = [data['schedule']] + [alternative['schedule'] for alternative in data['alternatives']]
+        self.assertEqual(len(found), 3)
+        for i, alternative in enumerate(data['alternatives'], start=1):
+            self.assertLessEqual(alternative['objective'], data['stats']['objective'] * (1 + tolerance))
+            distances = [
+                sum(a != b for worker in found[i] for a, b in zip(found[i][worker], previous[worker]))
+                for previous in found[:i]
+            ]
+            self.assertGreaterEqual(min(distances), min_distance)
+            self.assertEqual(alternative['distance'], min(distances))
@@ -0,0 +1,47 @@
+import json
+
+from django.test import TestCase, override_settings
+
+from .utils import PAYLOAD, post_json
+
+
+def ndjson_lines(response):
+    return [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+
+
+@override_settings(SCHEDULE_JOB_BACKEND='worker')
+class BatchTests(TestCase):
+    """계산은 프로세스 풀에서 실행 (solver_worker 방식이면 남은 작업을 다시 제출하지 않음)"""
+
+    def test_items_are_validated_and_solved(self):
+        items = [
+            dict(PAYLOAD, profile='throughput'),
+            dict(PAYLOAD, num_workers=0),
+            'x',
+            dict(PAYLOAD, profile='throughput', max_monthly_hours=150),
+        ]
+        response = post_json(self.client, '/api/solve_schedule/batch/', {'items': items})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = ndjson_lines(response)
+
+        # 검증 실패는 계산 결과보다 먼저, 마지막 줄은 요약
+        self.assertEqual([line['index'] for line in lines[:2]], [1, 2])
+        self.assertIn('num_workers', lines[0]['errors'])
+        self.assertIn('message', lines[1])
+        self.assertEqual(lines[-1], {'status': 'done', 'total': 4, 'succeeded': 1, 'failed': 3})
+
+        results = {line['index']: line for line in lines[2:-1]}
+        self.assertEqual(set(results), {0, 3})
+        self.assertEqual(results[0]['status'], 'success')
+        self.assertEqual(len(results[0]['schedule']), PAYLOAD['num_workers'])
+        self.assertEqual(results[3]['status'], 'error')
+        self.assertIn('addMonthlyWorkConstraints', [conflict['rule'] for conflict in results[3]['conflicts']])
+
+    def test_requires_list(self):
+        self.assertEqual(post_json(self.client, '/api/solve_schedule/batch/', {'items': 'x'}).status_code, 400)
+        self.assertEqual(post_json(self.client, '/api/solve_schedule/batch/', 'x').status_code, 400)
+
+    @override_settings(SCHEDULE_BATCH_MAX_ITEMS=1)
+    def test_max_items(self):
+        self.assertEqual(post_json(self.client, '/api/solve_schedule/batch/', [PAYLOAD, PAYLOAD]).status_code, 400)
@@ -0,0 +1,65 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from benchmarks.harness import cmd_compare, resolve_constraints, run_instance, write_results
+from benchmarks.instances import SUITES, generate_instance, generate_suite
+from schedule.precheck import precheck
+from schedule.profiles import SolverProfile
+from schedule.rules import setObjective
+
+
+class InstanceGeneratorTests(SimpleTestCase):
+    def test_same_seed_gives_same_instance(self):
+        self.assertEqual(generate_instance(10, 31, 0.1, 0.05, seed=3), generate_instance(10, 31, 0.1, 0.05, seed=3))
+        self.assertNotEqual(
+            generate_instance(10, 31, 0.1, 0.05, seed=3)['params'],
+            generate_instance(10, 31, 0.1, 0.05, seed=4)['params'],
+        )
+
+    def test_instances_pass_precheck(self):
+        for instance in generate_suite(*SUITES['default']):
+            with self.subTest(instance['name']):
+                self.assertEqual(precheck(instance['params']), [])
+
+
+class HarnessTests(SimpleTestCase):
+    def test_run_instance_records_model_size(self):
+        instance = generate_instance(3, 28, seed=0)
+        profile = SolverProfile('benchmark', num_search_workers=1, time_limit=5.0)
+        row = run_instance(instance, resolve_constraints(), setObjective, profile)
+        self.assertIn(row['status'], ('OPTIMAL', 'FEASIBLE'))
+        self.assertEqual(row['name'], instance['name'])
+        self.assertGreater(row['variables'], 0)
+        self.assertGreater(row['model_constraints'], 0)
+
+    def test_resolve_constraints_without(self):
+        names = [constraint.__name__ for constraint in resolve_constraints(without=['addNoConsecutiveOffDays'])]
+        self.assertNotIn('addNoConsecutiveOffDays', names)
+        self.assertIn('addExactlyOne', names)
+
+    def _compare(self, base_rows, new_rows):
+        with tempfile.TemporaryDirectory() as directory:
+            base, new = os.path.join(directory, 'base.json'), os.path.join(directory, 'new.csv')
+            write_results(base, {'label': 'base'}, base_rows)
+            write_results(new, {'label': 'new'}, new_rows)
+            args = argparse.Namespace(base=base, new=new, threshold=1.2, min_seconds=0.05)
+            with contextlib.redirect_stdout(io.StringIO()):
+                return cmd_compare(args)
+
+    def test_compare_flags_regressions(self):
+        row = {
+            'name': 'w3-d28', 'status': 'OPTIMAL', 'objective': 100.0, 'best_bound': 100.0, 'gap': 0.0,
+            'build_seconds': 0.1, 'solve_seconds': 1.0, 'time_to_best': 0.5,
+        }
+        self.assertEqual(self._compare([row], [row]), 0)
+        self.assertEqual(self._compare([row], [dict(row, solve_seconds=2.0)]), 1)
+        self.assertEqual(self._compare([row], [dict(row, status='FEASIBLE')]), 1)
+        self.assertEqual(self._compare([row], [dict(row, objective=120.0)]), 1)
+        # min_seconds보다 짧은 시간은 비교하지 않음
+        self.assertEqual(self._compare([dict(row, build_seconds=0.001)], [dict(row, build_seconds=0.01)]), 0)
+
@@ -0,0 +1,65 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from schedule.cache import LocMemResultCache, cached_solve, get_result_cache, lookup, make_cache_key, result_key
+from schedule.duties import DAY, NIGHT
+
+from .utils import PARAMS, PROFILE, make_params
+
+
+class CacheKeyTests(SimpleTestCase):
+    def test_key_ignores_order_of_holidays_and_fixed_assignments(self):
+        fixed = [{'worker': 0, 'day': 3, 'shift': DAY}, {'worker': 1, 'day': 2, 'shift': NIGHT}]
+        self.assertEqual(
+            make_cache_key(make_params(holidays=[5, 3, 5], fixed_assignments=fixed)),
+            make_cache_key(make_params(holidays=[3, 5], fixed_assignments=fixed[::-1])),
+        )
+
+    def test_key_depends_on_input_profile_and_time_limit(self):
+        key = result_key(PARAMS, PROFILE)
+        self.assertNotEqual(key, result_key(make_params(max_monthly_hours=210), PROFILE))
+        self.assertNotEqual(key, result_key(PARAMS, 'batch'))
+        self.assertNotEqual(key, result_key(PARAMS, PROFILE, max_time_limit=0.5))
+        # 프로필의 시간 제한보다 큰 상한은 키를 바꾸지 않음
+        self.assertEqual(key, result_key(PARAMS, PROFILE, max_time_limit=10000))
+
+
+class LocMemResultCacheTests(SimpleTestCase):
+    def test_lru_eviction(self):
+        cache = LocMemResultCache(max_entries=2, ttl=0)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+    def test_ttl(self):
+        cache = LocMemResultCache(ttl=10)
+        with mock.patch('schedule.cache.time.monotonic', return_value=100.0):
+            cache.set('a', 1)
+        with mock.patch('schedule.cache.time.monotonic', return_value=105.0):
+            self.assertEqual(cache.get('a'), 1)
+        with mock.patch('schedule.cache.time.monotonic', return_value=111.0):
+            self.assertIsNone(cache.get('a'))
+
+
+class CachedSolveTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_second_request_is_cached(self):
+        entry, cached = cached_solve(PARAMS, profile=PROFILE)
+        self.assertFalse(cached)
+        self.assertEqual(entry['stats']['status'], 'OPTIMAL')
+        again, cached = cached_solve(PARAMS, profile=PROFILE)
+        self.assertTrue(cached)
+        self.assertEqual(again, entry)
+        self.assertEqual(lookup(PARAMS, PROFILE), entry)
+
+    def test_precheck_result_is_not_cached(self):
+        params = make_params(max_monthly_hours=150)
+        entry, cached = cached_solve(params, profile=PROFILE)
+        self.assertIsNone(entry['schedule'])
+        self.assertTrue(entry['stats']['precheck'])
+        self.assertIsNone(lookup(params, PROFILE))
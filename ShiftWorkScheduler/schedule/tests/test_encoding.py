@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from schedule.cache import get_result_cache
+from schedule.encoding import (
+    PACKED_BINARY, PACKED_JSON, decode_packed, encode_packed, matrix_to_schedule, pack_matrix, schedule_to_matrix,
+    unpack_matrix,
+)
+
+from .utils import PAYLOAD, post_json
+
+
+class PackedEncodingTests(SimpleTestCase):
+    def test_round_trip(self):
+        rng = np.random.default_rng(0)
+        for workers, days, codes in [(1, 1, 1), (5, 28, 4), (7, 31, 5), (300, 92, 4), (3, 3, 256)]:
+            with self.subTest(workers=workers, days=days, codes=codes):
+                matrix = rng.integers(0, codes, size=(workers, days), dtype=np.uint8)
+                packed = pack_matrix(matrix)
+                np.testing.assert_array_equal(unpack_matrix(packed), matrix)
+                np.testing.assert_array_equal(decode_packed(encode_packed(matrix)), matrix)
+
+    def test_size(self):
+        # 근무 4종류(0~3)는 칸마다 2비트
+        matrix = np.full((5, 28), 3, dtype=np.uint8)
+        self.assertEqual(encode_packed(matrix)['bits'], 2)
+        # 헤더 9바이트 + 5 * 28칸 * 2비트
+        self.assertEqual(len(pack_matrix(matrix)), 9 + 5 * 28 * 2 // 8)
+
+    def test_schedule_conversion(self):
+        schedule = {'worker_10': [1, 2], 'worker_2': [0, 3]}
+        matrix = schedule_to_matrix(schedule)
+        self.assertEqual(matrix.tolist(), [[0, 3], [1, 2]])
+        self.assertEqual(matrix_to_schedule(matrix), {'worker_0': [0, 3], 'worker_1': [1, 2]})
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            unpack_matrix(b'XYZ' + pack_matrix(np.zeros((1, 1), dtype=np.uint8))[3:])
+
+
+class PackedResponseTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_accept_header(self):
+        schedule = post_json(self.client, '/api/solve_schedule/', PAYLOAD).json()['schedule']
+        expected = schedule_to_matrix(schedule)
+
+        response = post_json(self.client, '/api/solve_schedule/', PAYLOAD, HTTP_ACCEPT=PACKED_JSON)
+        self.assertEqual(response['Content-Type'], PACKED_JSON)
+        self.assertEqual(response['Vary'], 'Accept')
+        data = response.json()
+        self.assertTrue(data['cached'])
+        np.testing.assert_array_equal(decode_packed(data['schedule']), expected)
+
+        response = post_json(self.client, '/api/solve_schedule/', PAYLOAD, HTTP_ACCEPT=PACKED_BINARY)
+        self.assertEqual(response['Content-Type'], PACKED_BINARY)
+        np.testing.assert_array_equal(unpack_matrix(response.content), expected)
+        meta = json.loads(response['X-Schedule-Meta'])
+        self.assertEqual(meta['status'], 'success')
+        self.assertNotIn('schedule', meta)
@@ -0,0 +1,65 @@
+from django.test import SimpleTestCase
+
+from schedule.duties import ALL_DUTIES_DICT, DAY, NIGHT, OFF, VACATION
+from schedule.horizon import _carry_over, _windows, plan_horizon
+from schedule.profiles import SolverProfile
+
+from .utils import make_params
+
+
+class HorizonTests(SimpleTestCase):
+    def assertCovers(self, windows, num_days, window_days):
+        committed = 0
+        for start, end, commit_end in windows:
+            # 앞 구간이 확정한 날짜 뒤에 빈 날짜가 없고, 확정 범위는 구간 안
+            self.assertLessEqual(start, committed)
+            self.assertLess(committed, commit_end)
+            self.assertLessEqual(commit_end, end)
+            self.assertEqual(end - start, min(window_days, num_days))
+            committed = commit_end
+        self.assertEqual(committed, num_days)
+        self.assertEqual(windows[-1][1], num_days)
+
+    def test_windows_cover_period(self):
+        for num_days, window_days, overlap_days in [(90, 28, 7), (365, 31, 7), (60, 30, 0), (40, 28, 27)]:
+            with self.subTest(num_days=num_days, window_days=window_days, overlap_days=overlap_days):
+                self.assertCovers(_windows(num_days, window_days, overlap_days), num_days, window_days)
+
+    def test_windows_boundaries(self):
+        # 기간이 구간보다 짧거나 같으면 구간 하나
+        self.assertEqual(_windows(20, 28, 7), [(0, 20, 20)])
+        self.assertEqual(_windows(28, 28, 7), [(0, 28, 28)])
+        # 두 번째 구간이 기간 끝에 정확히 맞는 경우
+        self.assertEqual(_windows(49, 28, 7), [(0, 28, 21), (21, 49, 49)])
+        # 마지막 구간은 기간 끝에 맞추고 앞쪽은 이미 확정된 날짜와 겹침
+        self.assertEqual(_windows(50, 28, 7), [(0, 28, 21), (21, 49, 42), (22, 50, 50)])
+
+    def test_carry_over_counts_committed_days_only(self):
+        schedule = {0: [DAY, NIGHT, OFF, DAY], 1: [NIGHT, DAY, VACATION, NIGHT]}
+        is_holiday = [False, True, False, False]
+        carry_over = _carry_over(schedule, 3, is_holiday, ledger={'0': {'hours': 5, 'night': 1}})
+        day, night = ALL_DUTIES_DICT[DAY].time, ALL_DUTIES_DICT[NIGHT].time
+        self.assertEqual(carry_over[0], {
+            'hours': day + night + 5, 'weekday_day': 1, 'holiday_day': 0, 'night': 2, 'weekend': 1,
+        })
+        self.assertEqual(carry_over[1], {
+            'hours': day + night, 'weekday_day': 0, 'holiday_day': 1, 'night': 1, 'weekend': 1,
+        })
+
+    def test_rules_hold_across_window_boundaries(self):
+        params = make_params(num_days=50)
+        windows = []
+        schedule, stats = plan_horizon(
+            params, window_days=28, overlap_days=7,
+            on_window=lambda index, total, window: windows.append((index, total)),
+            profile=SolverProfile('test', num_search_workers=8, time_limit=2.0),
+        )
+        self.assertEqual(windows, [(0, 3), (1, 3), (2, 3)])
+        self.assertEqual([window['commit_end_day'] for window in stats], [21, 42, 50])
+        self.assertTrue(all(len(codes) == 50 for codes in schedule.values()))
+        for d in range(50):
+            self.assertEqual(sum(codes[d] == NIGHT for codes in schedule.values()), 1, d)
+        for n, codes in schedule.items():
+            for today, tomorrow in zip(codes, codes[1:]):
+                self.assertFalse(today == NIGHT and tomorrow != OFF, n)
+                self.assertFalse(today == OFF and tomorrow == OFF, n)
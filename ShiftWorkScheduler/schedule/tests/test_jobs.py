@@ -0,0 +1,95 @@
+import datetime
+import uuid
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from schedule.cache import get_result_cache
+from schedule.jobs import _process_owner, _requeue_stale, run_job
+from schedule.models import SolveJob
+
+from .utils import PARAMS, PAYLOAD, PROFILE, post_json
+
+
+class RunJobTests(TransactionTestCase):
+    """진행 상황은 CP-SAT 콜백 스레드에서 기록하므로 테스트 트랜잭션 밖에서 실행"""
+
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_run_job_claims_and_stores_result(self):
+        job = SolveJob.objects.create(params=PARAMS, options={'profile': PROFILE})
+        entry, cached = run_job(str(job.pk))
+        self.assertFalse(cached)
+        job.refresh_from_db()
+        self.assertEqual(job.status, SolveJob.SUCCEEDED)
+        self.assertEqual(job.result, entry['schedule'])
+        self.assertEqual(job.owner, _process_owner())
+        self.assertIsNotNone(job.finished_at)
+        # 이미 가져간 작업은 다시 실행하지 않음
+        self.assertIsNone(run_job(str(job.pk)))
+
+    def test_infeasible_job_fails_with_conflicts(self):
+        job = SolveJob.objects.create(params=dict(PARAMS, max_monthly_hours=150), options={'profile': PROFILE})
+        run_job(str(job.pk))
+        job.refresh_from_db()
+        self.assertEqual(job.status, SolveJob.FAILED)
+        self.assertIn('addMonthlyWorkConstraints', [conflict['rule'] for conflict in job.progress['conflicts']])
+
+
+class RequeueStaleTests(TestCase):
+    def _running(self, owner, heartbeat_age, started_age=0):
+        now = timezone.now()
+        heartbeat_at = now - datetime.timedelta(seconds=heartbeat_age) if heartbeat_age is not None else None
+        return SolveJob.objects.create(
+            params=PARAMS, status=SolveJob.RUNNING, owner=owner, heartbeat_at=heartbeat_at,
+            started_at=now - datetime.timedelta(seconds=started_age),
+        ).pk
+
+    @override_settings(SCHEDULE_JOB_STALE_AFTER=60.0)
+    def test_requeues_only_stale_jobs(self):
+        host = _process_owner().rpartition(':')[0]
+        # 없는 pid (pid 최댓값보다 큼)
+        dead = self._running(f'{host}:99999999', 1)
+        alive = self._running(_process_owner(), 1)
+        remote_fresh = self._running('other-host:1', 1)
+        remote_old = self._running('other-host:1', 600)
+        # owner/heartbeat_at이 없던 때 시작한 작업은 시작 시각으로 판단
+        legacy = self._running('', None, started_age=600)
+        legacy_fresh = self._running('', None)
+
+        self.assertCountEqual(_requeue_stale(), [dead, remote_old, legacy])
+        statuses = dict(SolveJob.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[alive], SolveJob.RUNNING)
+        self.assertEqual(statuses[remote_fresh], SolveJob.RUNNING)
+        self.assertEqual(statuses[legacy_fresh], SolveJob.RUNNING)
+        self.assertEqual(statuses[dead], SolveJob.QUEUED)
+
+
+@override_settings(SCHEDULE_JOB_BACKEND='worker')
+class JobApiTests(TestCase):
+    """solver_worker 방식이면 웹 프로세스는 작업을 저장만 함 (프로세스 풀 없이 확인)"""
+
+    def test_submit_and_poll(self):
+        response = post_json(self.client, '/api/jobs/', PAYLOAD)
+        self.assertEqual(response.status_code, 202)
+        job = response.json()['job']
+        self.assertEqual(job['status'], SolveJob.QUEUED)
+
+        response = self.client.get(job['status_url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['job']['job_id'], job['job_id'])
+
+    @override_settings(SCHEDULE_JOB_MAX_WORKERS=1, SCHEDULE_JOB_MAX_QUEUE=1)
+    def test_queue_full(self):
+        self.assertEqual(post_json(self.client, '/api/jobs/', PAYLOAD).status_code, 202)
+        self.assertEqual(post_json(self.client, '/api/jobs/', PAYLOAD).status_code, 202)
+        response = post_json(self.client, '/api/jobs/', PAYLOAD)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '5')
+
+    def test_status_errors(self):
+        self.assertEqual(self.client.get(f'/api/jobs/{uuid.uuid4()}/').status_code, 404)
+        job = SolveJob.objects.create(params=PARAMS)
+        self.assertEqual(self.client.get(f'/api/jobs/{job.pk}/', {'wait': 'x'}).status_code, 400)
+        self.assertEqual(post_json(self.client, '/api/jobs/', dict(PAYLOAD, num_workers=0)).status_code, 400)
@@ -0,0 +1,76 @@
+import datetime
+
+from django.test import TestCase
+
+from schedule.duties import ALL_DUTIES_DICT, DAY, NIGHT, OFF
+from schedule.storage import LEDGER_FIELDS, ledger_offsets, ledger_totals, rebuild_ledger, store_schedule
+
+from .utils import make_params
+
+PARAMS = make_params(num_workers=3, num_days=7)
+
+
+class LedgerTests(TestCase):
+    START = datetime.date(2026, 11, 2)
+
+    def _schedule(self, first, num_days=7):
+        """근무자 3명, 근무자마다 first부터 DAY/NIGHT/OFF를 돌아가며 배정"""
+        cycle = [DAY, NIGHT, OFF]
+        return {n: [cycle[(first + n + d) % 3] for d in range(num_days)] for n in range(3)}
+
+    def _ledger(self, team):
+        return [{field: row[field] for field in ('worker',) + LEDGER_FIELDS} for row in ledger_totals(team)]
+
+    def _expected_hours(self, *schedules):
+        return [
+            sum(ALL_DUTIES_DICT[code].time for schedule in schedules for code in schedule[n])
+            for n in range(3)
+        ]
+
+    def test_ledger_accumulates_and_restore_is_idempotent(self):
+        first, second = self._schedule(0), self._schedule(1)
+        store_schedule('a', self.START, PARAMS, first)
+        self.assertEqual([row['hours'] for row in self._ledger('a')], self._expected_hours(first))
+
+        # 같은 기간을 같은 결과로 다시 저장해도 누적값은 그대로
+        ledger = self._ledger('a')
+        store_schedule('a', self.START, PARAMS, first)
+        self.assertEqual(self._ledger('a'), ledger)
+
+        # 같은 기간을 다른 결과로 저장하면 교체된 배정만큼 빠짐
+        store_schedule('a', self.START, PARAMS, second)
+        self.assertEqual([row['hours'] for row in self._ledger('a')], self._expected_hours(second))
+
+        # 이어지는 기간은 더해짐
+        store_schedule('a', self.START + datetime.timedelta(days=7), PARAMS, first)
+        self.assertEqual([row['hours'] for row in self._ledger('a')], self._expected_hours(first, second))
+
+        # 남아있는 배정 전체로 다시 계산한 값과 같음
+        ledger = self._ledger('a')
+        rebuild_ledger('a')
+        self.assertEqual(self._ledger('a'), ledger)
+
+    def test_offsets_subtract_team_minimum(self):
+        store_schedule('a', self.START, PARAMS, self._schedule(0))
+        hours = self._expected_hours(self._schedule(0))
+        offsets = ledger_offsets('a', 3)
+        for n in range(3):
+            self.assertEqual(offsets.get(str(n), {}).get('hours', 0), hours[n] - min(hours))
+        # 값이 모두 최솟값인 근무자는 생략
+        self.assertTrue(all(any(offset.values()) for offset in offsets.values()))
+        self.assertEqual(ledger_offsets('b', 3), {})
+
+    def test_offsets_with_new_workers(self):
+        """누적값이 없는 새 근무자가 있으면 기존 근무자의 누적값이 그대로 (최솟값 0)"""
+        store_schedule('a', self.START, PARAMS, self._schedule(0))
+        totals = {row['worker']: row for row in ledger_totals('a')}
+        offsets = ledger_offsets('a', 4)
+        self.assertNotIn('3', offsets)
+        for n in range(3):
+            self.assertEqual(offsets[str(n)], {
+                'hours': totals[n]['hours'],
+                'weekday_day': totals[n]['weekday_day'],
+                'holiday_day': totals[n]['holiday_day'],
+                'night': totals[n]['night_count'],
+                'weekend': totals[n]['weekend_count'] + totals[n]['holiday_count'],
+            })
@@ -0,0 +1,71 @@
+from ortools.sat.python import cp_model
+
+from django.test import SimpleTestCase
+
+from benchmarks.bench_model_build import LegacyModel, make_instance
+from schedule.duties import NUM_SHIFT
+from schedule.solve import DEFAULT_CONSTRAINTS, ScheduleSolver, setObjective
+
+NUM_WORKERS, NUM_DAYS = 5, 28
+
+
+def solve(model, time_limit=10.0):
+    solver = cp_model.CpSolver()
+    solver.parameters.num_workers = 8
+    solver.parameters.max_time_in_seconds = time_limit
+    status = solver.Solve(model)
+    return solver, status
+
+
+class VectorizedBuildTests(SimpleTestCase):
+    """
+    배열 변수와 공용 식으로 만든 모델(ScheduleSolver)과 기존 방식(dict + 규칙마다 합계)의 모델에서
+    한쪽의 해를 다른 쪽에 고정하면 해가 있고 목적함수 값이 같음
+    """
+
+    def setUp(self):
+        instance = make_instance(NUM_WORKERS, NUM_DAYS)
+        self.current = ScheduleSolver(NUM_WORKERS, NUM_DAYS, constraints=DEFAULT_CONSTRAINTS,
+                                      objectiveFunc=setObjective, **instance)
+        self.current.build()
+        self.legacy = LegacyModel(NUM_WORKERS, NUM_DAYS, **instance)
+        self.legacy.build()
+
+    def test_current_solution_in_legacy_model(self):
+        solver, status = solve(self.current.model, time_limit=2.0)
+        self.assertIn(status, (cp_model.OPTIMAL, cp_model.FEASIBLE))
+        for n, codes in self.current.extract_schedule(solver.ResponseProto()).items():
+            for d, code in enumerate(codes):
+                self.legacy.model.Add(self.legacy.shifts[(n, d, code)] == 1)
+        legacy_solver, legacy_status = solve(self.legacy.model)
+        self.assertEqual(legacy_status, cp_model.OPTIMAL)
+        self.assertEqual(legacy_solver.ObjectiveValue(), solver.ObjectiveValue())
+
+    def test_legacy_solution_in_current_model(self):
+        legacy_solver, status = solve(self.legacy.model, time_limit=2.0)
+        self.assertIn(status, (cp_model.OPTIMAL, cp_model.FEASIBLE))
+        for n in range(NUM_WORKERS):
+            for d in range(NUM_DAYS):
+                code = next(s for s in range(NUM_SHIFT) if legacy_solver.Value(self.legacy.shifts[(n, d, s)]))
+                var = self.current.shifts[n, d, code]
+                # 입력 presolve로 상수가 된 변수: 1이어야 하는 칸이 0이면 두 모델이 다름
+                self.assertIsNot(var, self.current.false)
+                if var is not self.current.true:
+                    self.current.model.Add(var == 1)
+        solver, current_status = solve(self.current.model)
+        self.assertEqual(current_status, cp_model.OPTIMAL)
+        self.assertEqual(solver.ObjectiveValue(), legacy_solver.ObjectiveValue())
+
+    def test_shared_expressions(self):
+        """근무자별/날짜별 공용 식의 항이 해당 변수들과 일치"""
+        solver, _ = solve(self.current.model, time_limit=2.0)
+        schedule = self.current.extract_schedule(solver.ResponseProto())
+        for n, codes in schedule.items():
+            hours = sum(self.current.duties[code].time for code in codes)
+            self.assertEqual(solver.Value(self.current.worker_hours[n]), hours)
+            self.assertEqual(solver.Value(self.current.worker_work_days[n]),
+                             sum(code in self.current.work_shifts for code in codes))
+        for d in range(NUM_DAYS):
+            for s in range(NUM_SHIFT):
+                self.assertEqual(solver.Value(self.current.day_shift_count[d][s]),
+                                 sum(codes[d] == s for codes in schedule.values()))
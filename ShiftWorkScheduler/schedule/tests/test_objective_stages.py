@@ -0,0 +1,43 @@
+from ortools.sat.python import cp_model
+
+from django.test import SimpleTestCase
+
+from schedule.profiles import SolverProfile
+from schedule.solve import build_solver
+
+from .utils import PARAMS
+
+STAGES = [['weekday', 2.0], ['hours', 2.0], ['total_hours', 2.0]]
+
+
+def profile(stages):
+    return SolverProfile('test', num_search_workers=8, time_limit=6.0, stall_time=1.0, objective_stages=stages)
+
+
+class ObjectiveStagesTests(SimpleTestCase):
+    def test_stages_fix_earlier_terms(self):
+        solver = build_solver(PARAMS, profile=profile(STAGES), template_cache=None)
+        schedule = solver.solve()
+        self.assertIsNotNone(schedule)
+        stages = solver.stats['stages']
+        self.assertEqual([stage['term'] for stage in stages], [term for term, _ in STAGES])
+        self.assertTrue(all(stage['value'] is not None for stage in stages))
+        self.assertLessEqual(solver.stats['wall_time'], 6.0 + 0.5)
+
+        # 결과 스케줄의 항목 값은 각 단계에서 찾은 값 이하이고, stats['objective']는 가중합
+        check_solver = build_solver(PARAMS, template_cache=None)
+        check_solver.build()
+        for n, codes in schedule.items():
+            for d, code in enumerate(codes):
+                if check_solver.shifts[n, d, code] is not check_solver.true:
+                    check_solver.model.Add(check_solver.shifts[n, d, code] == 1)
+        check = cp_model.CpSolver()
+        self.assertEqual(check.Solve(check_solver.model), cp_model.OPTIMAL)
+        for stage in stages:
+            self.assertLessEqual(check.Value(check_solver.objective_terms[stage['term']]), stage['value'], stage['term'])
+        self.assertEqual(check.ObjectiveValue(), solver.stats['objective'])
+
+    def test_unknown_term(self):
+        solver = build_solver(PARAMS, profile=profile([['unknown', 1.0]]), template_cache=None)
+        with self.assertRaises(ValueError):
+            solver.solve()
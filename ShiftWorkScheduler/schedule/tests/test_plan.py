@@ -0,0 +1,109 @@
+import copy
+import datetime
+import json
+import tempfile
+
+from ortools.sat.python import cp_model
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from schedule.cache import cached_solve, get_result_cache
+from schedule.duties import DAY, NIGHT, OFF, VACATION
+from schedule.plan import DEFAULT_RULE_CONFIG, RuleConfigError, compile_plan
+from schedule.solve import build_solver
+from schedule.storage import store_schedule, worker_totals
+
+from .utils import PARAMS, PAYLOAD, PROFILE, make_params, post_json
+
+
+class CompilePlanTests(SimpleTestCase):
+    def test_same_config_is_compiled_once(self):
+        plan = compile_plan(DEFAULT_RULE_CONFIG)
+        self.assertIs(compile_plan(copy.deepcopy(DEFAULT_RULE_CONFIG)), plan)
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as f:
+            json.dump(DEFAULT_RULE_CONFIG, f)
+            f.flush()
+            self.assertIs(compile_plan(f.name), plan)
+        self.assertEqual(plan.to_dict()['constraints'][:3],
+                         ['addExactlyOne', 'addCoverage[DAY]', 'addCoverage[NIGHT]'])
+
+    def test_invalid_configs(self):
+        def changed(**items):
+            return dict(DEFAULT_RULE_CONFIG, **items)
+
+        invalid = [
+            changed(unknown=1),
+            changed(duties=[{'name': 'OFF', 'type': 'off'}]),
+            changed(duties=DEFAULT_RULE_CONFIG['duties'] + [{'name': 'OFF', 'type': 'off'}]),
+            changed(coverage=[{'duty': 'EVENING', 'min': 1}]),
+            changed(coverage=[{'duty': 'DAY', 'min': 2, 'max': 1}]),
+            changed(workload={'min_hours': -1}),
+            changed(objective={'weights': {'unknown': 1}}),
+            '/nonexistent/rules.json',
+            ['not a dict'],
+        ]
+        for config in invalid:
+            with self.subTest(config=config), self.assertRaises(RuleConfigError):
+                compile_plan(config)
+
+
+@override_settings(SCHEDULE_RULE_CONFIGS=dict(settings.SCHEDULE_RULE_CONFIGS, default=DEFAULT_RULE_CONFIG))
+class RuleConfigSolveTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_default_config_matches_default_rules(self):
+        """DEFAULT_RULE_CONFIG의 모델에 기본 규칙의 해를 고정하면 해가 있고 목적함수 값이 같음"""
+        entry, _ = cached_solve(PARAMS, profile=PROFILE)
+        solver = build_solver(make_params(rule_config='default'), template_cache=None)
+        solver.build()
+        for n in range(PARAMS['num_workers']):
+            for d, code in enumerate(entry['schedule'][f'worker_{n}']):
+                var = solver.shifts[n, d, code]
+                self.assertIsNot(var, solver.false)
+                if var is not solver.true:
+                    solver.model.Add(var == 1)
+        check = cp_model.CpSolver()
+        self.assertEqual(check.Solve(solver.model), cp_model.OPTIMAL)
+        self.assertEqual(check.ObjectiveValue(), entry['stats']['objective'])
+
+    def test_evening_config(self):
+        response = post_json(self.client, '/api/solve_schedule/', dict(PAYLOAD, rule_config='evening'))
+        self.assertEqual(response.status_code, 200)
+        schedule = response.json()['schedule']
+        day, evening, night = 1, 2, 3
+        for d in range(PAYLOAD['num_days']):
+            codes = [schedule[f'worker_{n}'][d] for n in range(PAYLOAD['num_workers'])]
+            self.assertEqual(codes.count(night), 1, d)
+            self.assertGreaterEqual(codes.count(day), 1, d)
+            self.assertGreaterEqual(codes.count(evening), 1, d)
+        for codes in schedule.values():
+            self.assertNotIn(4, codes)
+            for today, tomorrow in zip(codes, codes[1:]):
+                self.assertFalse(today == night and tomorrow != OFF)
+                self.assertFalse(today == OFF and tomorrow == OFF)
+
+    def test_unknown_config(self):
+        response = post_json(self.client, '/api/solve_schedule/', dict(PAYLOAD, rule_config='unknown'))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('rule_config', response.json()['errors'])
+
+
+class WorkerTotalsTests(TestCase):
+    START = datetime.date(2026, 11, 2)
+
+    def test_worker_totals_use_each_runs_duties(self):
+        params = make_params(num_workers=3, num_days=7)
+        store_schedule('a', self.START, params, {n: [DAY, NIGHT, OFF, VACATION, DAY, NIGHT, OFF] for n in range(3)})
+        # evening 규칙에서는 코드 2가 EVENING, 3이 NIGHT
+        store_schedule('a', self.START + datetime.timedelta(days=7), make_params(num_workers=3, num_days=7, rule_config='evening'),
+                       {n: [DAY, 2, OFF, 3, DAY, 2, OFF] for n in range(3)})
+        totals = worker_totals('a', self.START, self.START + datetime.timedelta(days=13))
+        self.assertEqual(len(totals), 3)
+        for row in totals:
+            self.assertEqual(row['days'], 14)
+            self.assertEqual(
+                (row['off_count'], row['day_count'], row['evening_count'], row['night_count'], row['vacation_count']),
+                (4, 4, 2, 3, 1),
+            )
@@ -0,0 +1,79 @@
+from django.test import SimpleTestCase, override_settings
+
+from schedule.cache import cached_solve, get_result_cache
+from schedule.duties import DAY, NIGHT, OFF
+from schedule.precheck import check_assignments, precheck
+
+from .utils import PAYLOAD, PROFILE, make_params, post_json
+
+# 사전 검사는 통과하지만 해가 없는 입력: 근무자 2명이면 야간 다음 날 OFF 때문에 야간/OFF가 번갈아
+# 배정되어 근무일이 14일뿐
+INFEASIBLE = make_params(num_workers=2)
+INFEASIBLE_RULES = ['addDailyShiftRequirements', 'addNightShiftRestRequirement', 'addMonthlyWorkConstraints']
+
+
+class PrecheckTests(SimpleTestCase):
+    def test_valid_input_has_no_conflicts(self):
+        self.assertEqual(precheck(make_params()), [])
+        self.assertEqual(precheck(INFEASIBLE), [])
+
+    def test_max_hours_below_minimum(self):
+        conflicts = precheck(make_params(max_monthly_hours=150))
+        self.assertIn('addMonthlyWorkConstraints', [conflict['rule'] for conflict in conflicts])
+
+    def test_two_nights_on_same_day(self):
+        conflicts = precheck(make_params(fixed_assignments=[
+            {'worker': 0, 'day': 3, 'shift': NIGHT},
+            {'worker': 1, 'day': 3, 'shift': NIGHT},
+        ]))
+        self.assertEqual(
+            [(conflict['rule'], conflict['day']) for conflict in conflicts],
+            [('addDailyShiftRequirements', 3)],
+        )
+
+    def test_consecutive_off_days(self):
+        conflicts = precheck(make_params(fixed_assignments=[
+            {'worker': 2, 'day': 10, 'shift': OFF},
+            {'worker': 2, 'day': 11, 'shift': OFF},
+        ]))
+        self.assertEqual(
+            [(conflict['rule'], conflict['worker'], conflict['day']) for conflict in conflicts],
+            [('addNoConsecutiveOffDays', 2, 10)],
+        )
+
+    def test_out_of_range_assignments(self):
+        conflicts = check_assignments({(5, 1): DAY, (0, 29): DAY, (0, 1): 9}, 5, 28)
+        self.assertEqual(len(conflicts), 3)
+        self.assertTrue(all(conflict['rule'] == 'input' for conflict in conflicts))
+        # 범위 검사에서 걸리면 나머지 검사는 하지 않음
+        self.assertEqual(precheck(make_params(fixed_assignments=[{'worker': 7, 'day': 1, 'shift': DAY}]))[0]['rule'], 'input')
+
+
+class ExplainTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_explain_only_when_requested(self):
+        entry, _ = cached_solve(INFEASIBLE, profile=PROFILE)
+        self.assertEqual(entry['stats']['status'], 'INFEASIBLE')
+        self.assertNotIn('conflicts', entry)
+        self.assertNotIn('explain_seconds', entry['stats'])
+
+        # 캐시된 결과에 충돌 목록만 더함
+        entry, cached = cached_solve(INFEASIBLE, profile=PROFILE, explain=True)
+        self.assertTrue(cached)
+        self.assertEqual([conflict['rule'] for conflict in entry['conflicts']], INFEASIBLE_RULES)
+        self.assertGreater(entry['stats']['explain_seconds'], 0)
+        self.assertEqual(cached_solve(INFEASIBLE, profile=PROFILE)[0], entry)
+
+    def test_explain_through_api(self):
+        response = post_json(self.client, '/api/solve_schedule/', dict(PAYLOAD, num_workers=2, explain=True))
+        self.assertEqual(response.status_code, 422)
+        data = response.json()
+        self.assertEqual([conflict['rule'] for conflict in data['conflicts']], INFEASIBLE_RULES)
+        self.assertIn('explain_seconds', data['stats'])
+
+    @override_settings(SCHEDULE_EXPLAIN_TIME_LIMIT=0)
+    def test_explain_disabled(self):
+        entry, _ = cached_solve(INFEASIBLE, profile=PROFILE, explain=True)
+        self.assertEqual(entry['conflicts'], [])
@@ -0,0 +1,69 @@
+from ortools.sat.python import cp_model
+
+from django.test import SimpleTestCase
+
+from schedule.duties import DAY, NIGHT, OFF, VACATION
+from schedule.profiles import SolverProfile
+from schedule.solve import build_solver
+from schedule.templates import TemplateCache
+
+from .utils import make_params
+
+PARAMS = make_params(fixed_assignments=[
+    {'worker': 0, 'day': 5, 'shift': VACATION},
+    {'worker': 0, 'day': 6, 'shift': VACATION},
+    {'worker': 1, 'day': 3, 'shift': NIGHT},
+    {'worker': 1, 'day': 4, 'shift': OFF},
+    {'worker': 2, 'day': 10, 'shift': DAY},
+])
+PROFILE = SolverProfile('test', num_search_workers=8, time_limit=2.0)
+
+
+class InputPresolveTests(SimpleTestCase):
+    def test_counts(self):
+        solver = build_solver(PARAMS, template_cache=None, collect_presolve_stats=True)
+        solver.build()
+        stats = solver.telemetry['input_presolve']
+        self.assertEqual(stats['variables_before'], 5 * 28 * 4)
+        # 고정 근무 5칸은 1, 같은 칸의 다른 근무 3개씩은 0, 고정 근무가 없는 칸의 VACATION은 0
+        self.assertEqual(stats['fixed'], 5)
+        self.assertEqual(stats['forbidden'], 5 * 3 + (5 * 28 - 5))
+        self.assertEqual(stats['variables_after'], stats['variables_before'] - stats['fixed'] - stats['forbidden'])
+        self.assertEqual(stats['constraints'], solver.rule_constraints)
+        self.assertLess(stats['constraints'], stats['constraints_before'])
+
+        unreduced = build_solver(PARAMS, template_cache=None, presolve=False)
+        unreduced.build()
+        self.assertNotIn('input_presolve', unreduced.telemetry)
+        self.assertEqual(unreduced.rule_constraints, stats['constraints_before'])
+
+        # presolve 전 제약조건 수는 presolve 통계를 수집할 때만
+        solver = build_solver(PARAMS, template_cache=None)
+        solver.build()
+        self.assertNotIn('constraints_before', solver.telemetry['input_presolve'])
+
+    def test_template_counts(self):
+        cache = TemplateCache()
+        build_solver(PARAMS, template_cache=cache).build()
+        solver = build_solver(PARAMS, template_cache=cache, collect_presolve_stats=True)
+        solver.build()
+        self.assertEqual(solver.telemetry['model_template'], 'hit')
+        stats = solver.telemetry['input_presolve']
+        self.assertEqual(stats['variables_after'], 5 * 28 * 4 - stats['fixed'] - stats['forbidden'])
+        # 템플릿은 고정 근무를 제약조건 대신 변수 domain으로 반영
+        self.assertLess(stats['constraints'], stats['constraints_before'])
+
+    def test_same_objective_without_presolve(self):
+        """presolve로 만든 모델의 해를 presolve 없는 모델에 고정하면 해가 있고 목적함수 값이 같음"""
+        solver = build_solver(PARAMS, profile=PROFILE, template_cache=None)
+        schedule = solver.solve()
+        self.assertIsNotNone(schedule)
+
+        unreduced = build_solver(PARAMS, template_cache=None, presolve=False)
+        unreduced.build()
+        for n, codes in schedule.items():
+            for d, code in enumerate(codes):
+                unreduced.model.Add(unreduced.shifts[n, d, code] == 1)
+        check = cp_model.CpSolver()
+        self.assertEqual(check.Solve(unreduced.model), cp_model.OPTIMAL)
+        self.assertEqual(check.ObjectiveValue(), solver.stats['objective'])
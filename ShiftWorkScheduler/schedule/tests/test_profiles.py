@@ -0,0 +1,42 @@
+from ortools.sat.python import cp_model
+
+from django.test import SimpleTestCase, override_settings
+
+from schedule.profiles import DEFAULT_PROFILES, SolverProfile, get_profile, profile_names
+
+from .utils import PAYLOAD, post_json
+
+
+class ProfileTests(SimpleTestCase):
+    def test_defaults(self):
+        self.assertCountEqual(profile_names(), DEFAULT_PROFILES)
+        self.assertEqual(get_profile().name, 'interactive')
+        self.assertEqual(get_profile('batch').time_limit, 600.0)
+        with self.assertRaises(KeyError):
+            get_profile('unknown')
+
+    @override_settings(SCHEDULE_SOLVER_PROFILES={'batch': {'time_limit': 30.0},
+                                                 'nightly': {'num_search_workers': 2}},
+                       SCHEDULE_SOLVER_DEFAULT_PROFILE='nightly')
+    def test_settings_override_and_add_profiles(self):
+        batch = get_profile('batch')
+        # 적은 항목만 바뀌고 나머지는 기본값 유지
+        self.assertEqual(batch.time_limit, 30.0)
+        self.assertEqual(batch.stall_time, DEFAULT_PROFILES['batch']['stall_time'])
+        self.assertEqual(get_profile('interactive').num_search_workers, 8)
+        nightly = get_profile()
+        self.assertEqual((nightly.name, nightly.num_search_workers), ('nightly', 2))
+        self.assertEqual(nightly.time_limit, SolverProfile('x').time_limit)
+
+    def test_apply(self):
+        solver = cp_model.CpSolver()
+        get_profile('throughput').apply(solver.parameters)
+        self.assertEqual(solver.parameters.num_workers, 1)
+        self.assertEqual(solver.parameters.max_time_in_seconds, 10.0)
+
+    def test_unknown_profile_is_rejected(self):
+        response = post_json(self.client, '/api/solve_schedule/', dict(PAYLOAD, num_workers=0, profile='unknown'))
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()['errors']
+        self.assertIn('num_workers', errors)
+        self.assertIn('profile', errors)
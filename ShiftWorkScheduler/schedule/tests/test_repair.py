@@ -0,0 +1,57 @@
+import json
+
+from django.test import SimpleTestCase
+
+from schedule.cache import cached_solve, get_result_cache
+from schedule.duties import OFF, VACATION
+from schedule.repair import _free_days, repair_schedule
+
+from .utils import PARAMS, PAYLOAD, PROFILE, post_json
+
+
+class RepairTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_free_days_are_clipped_to_month(self):
+        self.assertEqual(_free_days({0}, 2, 28), {0, 1, 2})
+        self.assertEqual(_free_days({27}, 2, 28), {25, 26, 27})
+        self.assertEqual(_free_days({5, 9}, 1, 28), {4, 5, 6, 8, 9, 10})
+        self.assertEqual(_free_days({3}, 0, 28), {3})
+
+    def test_repair_only_changes_window(self):
+        entry, _ = cached_solve(PARAMS, profile=PROFILE)
+        schedule = entry['schedule']
+        solver, result = repair_schedule(PARAMS, schedule, {(1, 14): VACATION}, window=2)
+        self.assertIsNotNone(result)
+        self.assertEqual(result[1][13], VACATION)
+        free_days = _free_days({13}, solver.stats['window'], PARAMS['num_days'])
+        for n in range(PARAMS['num_workers']):
+            before = schedule[f'worker_{n}']
+            for d in set(range(PARAMS['num_days'])) - free_days:
+                self.assertEqual(result[n][d], before[d], (n, d))
+
+    def test_repair_api(self):
+        entry, _ = cached_solve(PARAMS, profile=PROFILE)
+        payload = dict(
+            PAYLOAD,
+            schedule=json.dumps(entry['schedule']),
+            changes=json.dumps([{'worker': 1, 'day': 14, 'shift': VACATION}]),
+        )
+        response = post_json(self.client, '/api/solve_schedule/repair/', payload)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['schedule']['worker_1'][13], VACATION)
+        self.assertIn({'worker': 1, 'day': 14, 'from': entry['schedule']['worker_1'][13], 'to': VACATION},
+                      data['changed'])
+
+    def test_changes_out_of_range(self):
+        schedule = {f'worker_{n}': [OFF] * 28 for n in range(5)}
+        payload = dict(
+            PAYLOAD,
+            schedule=json.dumps(schedule),
+            changes=json.dumps([{'worker': 5, 'day': 29, 'shift': 7}]),
+        )
+        response = post_json(self.client, '/api/solve_schedule/repair/', payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json()['errors']['changes']), 3)
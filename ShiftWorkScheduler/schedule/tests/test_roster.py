@@ -0,0 +1,64 @@
+import numpy as np
+
+from django.test import SimpleTestCase
+
+from schedule.duties import OFF, VACATION
+from schedule.profiles import SolverProfile
+from schedule.roster import fairness_evaluator, partition_teams, plan_roster, team_params
+from schedule.solve import SolveContext, build_solver
+
+from .utils import make_params
+
+PARAMS = make_params(num_workers=10, fixed_assignments=[
+    {'worker': 7, 'day': 5, 'shift': VACATION},
+    {'worker': 2, 'day': 9, 'shift': OFF},
+])
+PROFILE = SolverProfile('test', num_search_workers=8, time_limit=2.0, relative_gap_limit=0.01, stall_time=1.0)
+
+
+class PartitionTests(SimpleTestCase):
+    def test_team_sizes_differ_by_at_most_one(self):
+        self.assertEqual(partition_teams(10, 5), [[0, 1, 2, 3, 4], [5, 6, 7, 8, 9]])
+        self.assertEqual([len(team) for team in partition_teams(11, 5)], [4, 4, 3])
+        self.assertEqual(partition_teams(3, 5), [[0, 1, 2]])
+
+    def test_team_params_renumbers_fixed_assignments(self):
+        params = team_params(PARAMS, [5, 6, 7, 8, 9])
+        self.assertEqual(params['num_workers'], 5)
+        self.assertEqual(params['fixed_assignments'], [{'worker': 2, 'day': 5, 'shift': VACATION}])
+
+
+class PlanRosterTests(SimpleTestCase):
+    def test_teams_then_lns(self):
+        progress = []
+        schedule, stats = plan_roster(PARAMS, team_size=5, lns_time=1.0, lns_iteration_time=0.3,
+                                      profile=PROFILE, on_progress=progress.append)
+        self.assertEqual(stats['teams'], 2)
+        self.assertEqual(len(schedule), 10)
+        self.assertEqual(schedule[7][4], VACATION)
+        self.assertEqual(schedule[2][8], OFF)
+        self.assertGreater(stats['lns_iterations'], 0)
+        self.assertLessEqual(stats['objective'], stats['phase1_objective'])
+        self.assertEqual(progress[0]['objective'], stats['phase1_objective'])
+
+        evaluator, _ = fairness_evaluator(PARAMS)
+        matrix = np.array([schedule[n] for n in range(10)])
+        self.assertEqual(evaluator.objective(matrix), stats['objective'])
+        self.assertEqual(evaluator.terms(matrix), stats['terms'])
+
+    def test_outside_matches_evaluator(self):
+        """팀 밖 근무자 값(outside)을 넣은 팀 모델의 목적함수 값은 전체 근무자 기준 계산과 같음"""
+        schedule, _ = plan_roster(PARAMS, team_size=5, lns_time=0, profile=PROFILE)
+        matrix = np.array([schedule[n] for n in range(10)])
+        evaluator, _ = fairness_evaluator(PARAMS)
+        team = [0, 1, 2, 3, 4]
+        fixed = {(n, d + 1): int(matrix[n, d]) for n in team for d in range(PARAMS['num_days'])}
+        solver = build_solver(team_params(PARAMS, team, fixed), profile=PROFILE,
+                              context=SolveContext(outside=evaluator.outside(matrix, team)))
+        self.assertIsNotNone(solver.solve())
+        self.assertEqual(solver.stats['objective'], evaluator.objective(matrix))
+
+    def test_failed_team(self):
+        schedule, stats = plan_roster(make_params(num_workers=4), team_size=2, lns_time=0, profile=PROFILE)
+        self.assertIsNone(schedule)
+        self.assertEqual(stats['failed_teams'][0], {'team': 0, 'workers': [0, 1]})
@@ -0,0 +1,42 @@
+import json
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from schedule import duties, params, rules, solve
+
+SOLVER_MODULES = ('ortools', 'numpy', 'pandas', 'schedule.solve', 'schedule.rules')
+
+
+def loaded_modules(code=''):
+    """새 프로세스에서 Django와 URLconf를 불러오고 code를 실행한 뒤, 불러온 계산 모듈 목록"""
+    script = (
+        'import json, os, sys\n'
+        f'os.environ["DJANGO_SETTINGS_MODULE"] = "{settings.SETTINGS_MODULE}"\n'
+        'import django\n'
+        'django.setup()\n'
+        'from django.urls import get_resolver\n'
+        'get_resolver().url_patterns\n'
+        f'{code}\n'
+        f'print(json.dumps([name for name in {SOLVER_MODULES!r} if name in sys.modules]))\n'
+    )
+    result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                            cwd=settings.BASE_DIR)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+class LazyImportTests(SimpleTestCase):
+    def test_urlconf_does_not_load_solver(self):
+        self.assertEqual(loaded_modules('import schedule.views, schedule.forms, schedule.jobs'), [])
+
+    def test_preload_solver(self):
+        loaded = loaded_modules('from schedule.jobs import preload_solver; preload_solver()')
+        self.assertIn('ortools', loaded)
+        self.assertIn('schedule.solve', loaded)
+
+    def test_moved_names_are_reexported(self):
+        self.assertIs(solve.params_from_form, params.params_from_form)
+        self.assertIs(solve.get_weekends, params.get_weekends)
+        self.assertIs(rules.ALL_DUTIES_DICT, duties.ALL_DUTIES_DICT)
@@ -0,0 +1,79 @@
+import datetime
+
+from django.test import TestCase
+
+from schedule.duties import DAY, NIGHT, OFF
+from schedule.storage import assignment_page, run_page, store_schedule
+
+from .utils import PAYLOAD, make_params, post_json
+
+
+class StorageTests(TestCase):
+    START = datetime.date(2026, 11, 2)
+
+    def _schedule(self, first, num_days=7):
+        """근무자 3명, 근무자마다 first부터 DAY/NIGHT/OFF를 돌아가며 배정"""
+        cycle = [DAY, NIGHT, OFF]
+        return {n: [cycle[(first + n + d) % 3] for d in range(num_days)] for n in range(3)}
+
+    def test_assignment_pages_cover_all_rows_once(self):
+        params = make_params(num_workers=3, num_days=7)
+        store_schedule('a', self.START, params, self._schedule(0))
+        store_schedule('b', self.START, params, self._schedule(1))
+
+        rows, cursor = [], None
+        while True:
+            page, cursor = assignment_page('a', cursor=cursor, limit=5)
+            self.assertLessEqual(len(page), 5)
+            rows.extend(page)
+            if cursor is None:
+                break
+        self.assertEqual(len(rows), 21)
+        keys = [(row['date'], row['worker']) for row in rows]
+        self.assertEqual(keys, sorted(set(keys)))
+
+        # 필터와 함께 사용
+        nights, cursor = assignment_page('a', shift=NIGHT, limit=100)
+        self.assertIsNone(cursor)
+        self.assertEqual(len(nights), 7)
+        self.assertTrue(all(row['shift'] == NIGHT for row in nights))
+
+    def test_assignment_pages_through_api(self):
+        store_schedule('a', self.START, make_params(num_workers=3, num_days=7), self._schedule(0))
+        response = self.client.get('/api/teams/a/assignments/', {'limit': 10})
+        data = response.json()
+        self.assertEqual(len(data['assignments']), 10)
+        response = self.client.get('/api/teams/a/assignments/', {'limit': 20, 'cursor': data['next_cursor']})
+        data = response.json()
+        self.assertEqual(len(data['assignments']), 11)
+        self.assertIsNone(data['next_cursor'])
+
+    def test_runs_pages_and_detail(self):
+        params = make_params(num_workers=3, num_days=7)
+        run_ids = [
+            store_schedule('a', self.START + datetime.timedelta(days=7 * week), params, self._schedule(week)).pk
+            for week in range(3)
+        ]
+        store_schedule('b', self.START, params, self._schedule(0))
+
+        page, cursor = run_page('a', limit=2)
+        self.assertEqual([run['run_id'] for run in page], run_ids[:0:-1])
+        page, cursor = run_page('a', cursor=cursor, limit=2)
+        self.assertEqual([run['run_id'] for run in page], run_ids[:1])
+        self.assertIsNone(cursor)
+
+        response = self.client.get(f'/api/runs/{run_ids[1]}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['schedule'],
+                         {f'worker_{n}': codes for n, codes in self._schedule(1).items()})
+        self.assertEqual(self.client.get('/api/runs/999999/').status_code, 404)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get('/api/teams/a/assignments/', {'cursor': 'bad'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/teams/a/assignments/', {'date': '2026-13-01'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/teams/a/totals/').status_code, 400)
+        self.assertEqual(self.client.get('/api/runs/', {'cursor': 'x'}).status_code, 400)
+
+        response = post_json(self.client, '/api/jobs/', dict(PAYLOAD, team='a'))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('start_date', response.json()['errors'])
@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+from concurrent.futures import Future
+
+from django.test import SimpleTestCase
+
+from schedule.cache import get_result_cache
+from schedule.streaming import ProducerStream, wait_first
+
+from .utils import PAYLOAD, post_json
+
+
+def parse_events(content):
+    """SSE 본문을 [(event, data), ...]로 (keep-alive 주석은 제외)"""
+    events = []
+    for message in content.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in message.splitlines() if not line.startswith(':'))
+        if fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+class ProducerStreamTests(SimpleTestCase):
+    def test_yields_emitted_items_in_order(self):
+        def produce(emit, stopped):
+            for i in range(3):
+                emit(i)
+
+        self.assertEqual(list(ProducerStream(produce)), [0, 1, 2])
+
+    def test_keepalive_while_waiting(self):
+        release = threading.Event()
+
+        def produce(emit, stopped):
+            release.wait(1)
+            emit('value')
+
+        stream = iter(ProducerStream(produce, keepalive='ping', keepalive_interval=0.01))
+        self.assertEqual(next(stream), 'ping')
+        release.set()
+        self.assertIn('value', list(stream))
+
+    def test_close_sets_stopped(self):
+        seen = threading.Event()
+
+        def produce(emit, stopped):
+            emit('first')
+            if stopped.wait(5):
+                seen.set()
+
+        stream = ProducerStream(produce)
+        iterator = iter(stream)
+        self.assertEqual(next(iterator), 'first')
+        # 클라이언트가 연결을 끊으면 (response.close()) producer가 멈춤
+        iterator.close()
+        self.assertTrue(stream.stopped.is_set())
+        self.assertTrue(seen.wait(5))
+
+    def test_wait_first(self):
+        done, pending = Future(), Future()
+        done.set_result(1)
+        self.assertEqual(wait_first({done, pending}, threading.Event()), {done})
+
+        stopped = threading.Event()
+        stopped.set()
+        start = time.monotonic()
+        self.assertEqual(wait_first({pending}, stopped), set())
+        self.assertLess(time.monotonic() - start, 1)
+
+
+class SolveStreamTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def _events(self, payload):
+        response = post_json(self.client, '/api/solve_schedule/stream/', payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return parse_events(b''.join(response.streaming_content).decode())
+
+    def test_solutions_then_done(self):
+        events = self._events(PAYLOAD)
+        names = [event for event, _ in events]
+        self.assertEqual(names[-1], 'done')
+        self.assertIn('solution', names)
+        done = events[-1][1]
+        self.assertFalse(done['cached'])
+        self.assertIsNotNone(done['schedule'])
+        # 마지막 해가 결과와 같고, 목적함수 값은 좋아지기만 함
+        solutions = [data for event, data in events if event == 'solution']
+        self.assertEqual(solutions[-1]['schedule'], done['schedule'])
+        objectives = [data['objective'] for data in solutions]
+        self.assertEqual(objectives, sorted(objectives, reverse=True))
+
+    def test_cached_result_is_sent_as_done(self):
+        self._events(PAYLOAD)
+        events = self._events(PAYLOAD)
+        self.assertEqual([event for event, _ in events], ['done'])
+        self.assertTrue(events[0][1]['cached'])
+
+    def test_invalid_form(self):
+        response = post_json(self.client, '/api/solve_schedule/stream/', dict(PAYLOAD, num_workers=0))
+        self.assertEqual(response.status_code, 400)
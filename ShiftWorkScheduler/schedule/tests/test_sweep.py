@@ -0,0 +1,83 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from schedule.cache import cached_solve, get_result_cache
+from schedule.sweep import SweepError, compare_row, expand_sweep, shape_key
+
+from .test_batch import ndjson_lines
+from .utils import PARAMS, PAYLOAD, PROFILE, make_params, post_json
+
+
+class ExpandSweepTests(SimpleTestCase):
+    def test_cartesian_product_in_field_order(self):
+        variants = expand_sweep(PAYLOAD, {'num_workers': [5, 6], 'max_monthly_hours': [180, 200]}, 64)
+        self.assertEqual([variation for variation, _ in variants], [
+            {'num_workers': 5, 'max_monthly_hours': 180}, {'num_workers': 5, 'max_monthly_hours': 200},
+            {'num_workers': 6, 'max_monthly_hours': 180}, {'num_workers': 6, 'max_monthly_hours': 200},
+        ])
+        self.assertEqual(variants[2][1], dict(PAYLOAD, num_workers=6, max_monthly_hours=180))
+
+    def test_errors(self):
+        for base, sweep in [('x', {'num_workers': [5]}), (PAYLOAD, {}), (PAYLOAD, {'fixed_assignments': [[]]}),
+                            (PAYLOAD, {'num_workers': []}), (PAYLOAD, {'num_workers': 5})]:
+            with self.assertRaises(SweepError):
+                expand_sweep(base, sweep, 64)
+        with self.assertRaisesMessage(SweepError, '요청: 4개'):
+            expand_sweep(PAYLOAD, {'num_workers': [5, 6], 'max_monthly_hours': [180, 200]}, 3)
+
+    def test_shape_key_ignores_limits(self):
+        self.assertEqual(shape_key(PARAMS), shape_key(make_params(max_monthly_hours=220, holidays=[3])))
+        self.assertNotEqual(shape_key(PARAMS), shape_key(make_params(num_workers=6)))
+
+
+class CompareRowTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_rows(self):
+        entry, _ = cached_solve(PARAMS, profile=PROFILE)
+        row = compare_row(PARAMS, entry)
+        self.assertTrue(row['feasible'])
+        self.assertEqual(row['objective'], entry['stats']['objective'])
+        self.assertEqual(row['hours']['spread'], row['terms']['hours'])
+        self.assertLessEqual(row['hours']['min'], row['hours']['max'])
+
+        params = make_params(max_monthly_hours=150)
+        row = compare_row(params, cached_solve(params, profile=PROFILE)[0])
+        self.assertFalse(row['feasible'])
+        self.assertNotIn('terms', row)
+
+
+@override_settings(SCHEDULE_JOB_BACKEND='worker')
+class SweepApiTests(TestCase):
+    """변형은 프로세스 풀에서 계산 (solver_worker 방식이면 남은 작업을 다시 제출하지 않음)"""
+
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_variants_are_compared(self):
+        body = {'base': dict(PAYLOAD, profile=None), 'sweep': {'max_monthly_hours': [200, 210, 150]},
+                'include_schedules': True}
+        response = post_json(self.client, '/api/solve_schedule/sweep/', body)
+        self.assertEqual(response.status_code, 200)
+        lines = ndjson_lines(response)
+        self.assertEqual(lines[-1], {'status': 'done', 'total': 3, 'succeeded': 3, 'failed': 0})
+
+        rows = {line['index']: line for line in lines[:-1]}
+        self.assertEqual(rows[1]['variation'], {'max_monthly_hours': 210})
+        self.assertTrue(rows[0]['feasible'])
+        self.assertEqual(len(rows[0]['schedule']), PAYLOAD['num_workers'])
+        # 같은 모양의 나머지 변형은 첫 변형의 결과를 초기 해로 사용
+        self.assertFalse(rows[0]['warm_start'])
+        self.assertTrue(rows[1]['warm_start'])
+        self.assertFalse(rows[2]['feasible'])
+        self.assertNotIn('schedule', rows[2])
+
+    def test_invalid_variant_and_request(self):
+        body = {'base': PAYLOAD, 'sweep': {'num_workers': [0]}}
+        lines = ndjson_lines(post_json(self.client, '/api/solve_schedule/sweep/', body))
+        self.assertEqual(lines[0]['status'], 'error')
+        self.assertIn('num_workers', lines[0]['errors'])
+        self.assertEqual(lines[-1]['failed'], 1)
+
+        self.assertEqual(post_json(self.client, '/api/solve_schedule/sweep/', {'base': PAYLOAD, 'sweep': {'x': [1]}}).status_code, 400)
+        self.assertEqual(post_json(self.client, '/api/solve_schedule/sweep/', [PAYLOAD]).status_code, 400)
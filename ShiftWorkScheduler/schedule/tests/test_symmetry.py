@@ -0,0 +1,51 @@
+from ortools.sat.python import cp_model
+
+from django.test import SimpleTestCase
+
+from schedule.duties import VACATION
+from schedule.profiles import SolverProfile
+from schedule.solve import SolveContext, build_solver
+
+from .utils import make_params
+
+# 근무자 0만 휴가가 있고 1~4는 입력이 같음
+PARAMS = make_params(fixed_assignments=[{'worker': 0, 'day': day, 'shift': VACATION} for day in (5, 6)])
+
+
+def profile(symmetry_breaking):
+    return SolverProfile('test', num_search_workers=8, time_limit=2.0, symmetry_breaking=symmetry_breaking)
+
+
+class SymmetryBreakingTests(SimpleTestCase):
+    def test_interchangeable_groups(self):
+        solver = build_solver(PARAMS, template_cache=None)
+        self.assertEqual(solver.interchangeableGroups(), [[1, 2, 3, 4]])
+        solver = build_solver(PARAMS, template_cache=None, context=SolveContext(carry_over={1: {'hours': 10}, 3: {'hours': 10}}))
+        self.assertEqual(solver.interchangeableGroups(), [[1, 3], [2, 4]])
+        self.assertEqual(build_solver(make_params(num_workers=1), template_cache=None).interchangeableGroups(), [])
+
+    def test_solution_is_sorted_within_groups(self):
+        solver = build_solver(PARAMS, profile=profile(True), template_cache=None)
+        schedule = solver.solve()
+        self.assertIsNotNone(schedule)
+        rows = [schedule[n] for n in (1, 2, 3, 4)]
+        self.assertEqual(rows, sorted(rows, reverse=True))
+
+    def test_keeps_an_equally_good_solution(self):
+        """대칭 제거 없이 찾은 해의 그룹 안 근무자 순서를 정렬하면 대칭 제거 모델의 해이고 목적함수 값이 같음"""
+        baseline = build_solver(PARAMS, profile=profile(False), template_cache=None)
+        schedule = baseline.solve()
+        self.assertIsNotNone(schedule)
+        for group in baseline.interchangeableGroups():
+            for n, codes in zip(group, sorted((schedule[n] for n in group), reverse=True)):
+                schedule[n] = codes
+
+        solver = build_solver(PARAMS, profile=profile(True), template_cache=None)
+        solver.build()
+        for n, codes in schedule.items():
+            for d, code in enumerate(codes):
+                if solver.shifts[n, d, code] is not solver.true:
+                    solver.model.Add(solver.shifts[n, d, code] == 1)
+        check = cp_model.CpSolver()
+        self.assertEqual(check.Solve(solver.model), cp_model.OPTIMAL)
+        self.assertEqual(check.ObjectiveValue(), baseline.stats['objective'])
@@ -0,0 +1,52 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from schedule.cache import get_result_cache
+from schedule.telemetry import Counter, Histogram, MetricsRegistry
+
+from .utils import PAYLOAD, post_json
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    def test_render(self):
+        registry = MetricsRegistry()
+        counter = registry.register(Counter('solves_total', 'solves', ('status',)))
+        histogram = registry.register(Histogram('solve_seconds', 'seconds', buckets=(1.0, 10.0)))
+        counter.inc(status='OPTIMAL')
+        counter.inc(2, status='OPTIMAL')
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+        lines = registry.render().splitlines()
+        self.assertIn('# TYPE solves_total counter', lines)
+        self.assertIn('solves_total{status="OPTIMAL"} 3', lines)
+        self.assertIn('solve_seconds_bucket{le="1.0"} 1', lines)
+        self.assertIn('solve_seconds_bucket{le="10.0"} 2', lines)
+        self.assertIn('solve_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn('solve_seconds_sum 5.5', lines)
+
+
+class TelemetryApiTests(TestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    @override_settings(SCHEDULE_TELEMETRY_PRESOLVE_STATS=True)
+    def test_include_telemetry_and_metrics(self):
+        response = post_json(self.client, '/api/solve_schedule/', dict(PAYLOAD, include_telemetry=True))
+        self.assertEqual(response.status_code, 200)
+        telemetry = response.json()['telemetry']
+        self.assertGreater(telemetry['build_seconds'], 0)
+        # 모델 템플릿을 사용하면 제약조건 함수 대신 템플릿 조회/복제 시간이 기록됨
+        self.assertIn(telemetry['model_template'], ('hit', 'miss'))
+        self.assertEqual([rule['rule'] for rule in telemetry['rules']][:2], ['template', 'useTemplate'])
+        self.assertEqual(telemetry['input_presolve']['variables_before'], 5 * 28 * 4)
+        self.assertLess(telemetry['presolve']['presolved']['variables'], telemetry['presolve']['initial']['variables'])
+        self.assertTrue(telemetry['trajectory'])
+
+        # 기본값은 telemetry 없음
+        self.assertNotIn('telemetry', post_json(self.client, '/api/solve_schedule/', PAYLOAD).json())
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertRegex(body, r'schedule_solves_total\{status="(OPTIMAL|FEASIBLE)",profile="interactive"\} \d+')
+        self.assertIn('schedule_cache_requests_total{result="hit"}', body)
+        self.assertIn('schedule_jobs{status="queued"}', body)
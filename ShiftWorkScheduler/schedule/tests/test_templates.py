@@ -0,0 +1,75 @@
+from ortools.sat.python import cp_model
+
+from django.test import SimpleTestCase
+
+from schedule.duties import DAY, NIGHT, OFF, VACATION
+from schedule.profiles import SolverProfile
+from schedule.solve import build_solver
+from schedule.templates import TemplateCache, serialized_size
+
+from .utils import make_params
+
+PARAMS = make_params(holidays=[3, 17], fixed_assignments=[
+    {'worker': 0, 'day': 5, 'shift': VACATION},
+    {'worker': 1, 'day': 3, 'shift': NIGHT},
+    {'worker': 1, 'day': 4, 'shift': OFF},
+    {'worker': 2, 'day': 10, 'shift': DAY},
+])
+PROFILE = SolverProfile('test', num_search_workers=8, time_limit=2.0)
+
+
+def fix_schedule(solver, schedule):
+    for n, codes in schedule.items():
+        for d, code in enumerate(codes):
+            solver.model.Add(solver.shifts[n, d, code] == 1)
+
+
+class ModelTemplateTests(SimpleTestCase):
+    def test_template_and_direct_build_are_equivalent(self):
+        """템플릿을 복제한 모델과 직접 만든 모델에서 한쪽의 해를 다른 쪽에 고정하면 목적함수 값이 같음"""
+        cache = TemplateCache()
+        build_solver(PARAMS, template_cache=cache).build()
+        templated = build_solver(PARAMS, profile=PROFILE, template_cache=cache)
+        schedule = templated.solve()
+        self.assertEqual(templated.telemetry['model_template'], 'hit')
+        self.assertIsNotNone(schedule)
+
+        direct = build_solver(PARAMS, template_cache=None, presolve=False)
+        direct.build()
+        fix_schedule(direct, schedule)
+        check = cp_model.CpSolver()
+        self.assertEqual(check.Solve(direct.model), cp_model.OPTIMAL)
+        self.assertEqual(check.ObjectiveValue(), templated.stats['objective'])
+
+        direct = build_solver(PARAMS, profile=PROFILE, template_cache=None)
+        schedule = direct.solve()
+        templated = build_solver(PARAMS, template_cache=cache)
+        templated.build()
+        fix_schedule(templated, schedule)
+        check = cp_model.CpSolver()
+        self.assertEqual(check.Solve(templated.model), cp_model.OPTIMAL)
+        self.assertEqual(check.ObjectiveValue(), direct.stats['objective'])
+
+    def test_cache_stats(self):
+        cache = TemplateCache()
+        build_solver(PARAMS, template_cache=cache).build()
+        # 고정 근무만 다른 요청은 같은 템플릿
+        build_solver(dict(PARAMS, fixed_assignments=[]), template_cache=cache).build()
+        build_solver(make_params(num_workers=6), template_cache=cache).build()
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['hits'], stats['misses']), (2, 1, 2))
+        self.assertGreater(stats['bytes'], 0)
+
+        # 템플릿을 사용할 수 없는 요청은 캐시를 거치지 않음
+        self.assertEqual(cache.get(build_solver(PARAMS, template_cache=cache, presolve=False)), (None, False))
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_max_bytes(self):
+        solver = build_solver(PARAMS, template_cache=None)
+        solver.build()
+        self.assertGreater(serialized_size(solver.model), 0)
+        cache = TemplateCache(max_bytes=1)
+        template, cached = cache.get(build_solver(PARAMS, template_cache=cache))
+        self.assertIsNotNone(template)
+        self.assertFalse(cached)
+        self.assertEqual(len(cache), 0)
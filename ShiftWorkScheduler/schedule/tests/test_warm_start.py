@@ -0,0 +1,27 @@
+from django.test import SimpleTestCase
+
+from schedule.cache import cached_solve, get_result_cache
+from schedule.solve import build_solver
+
+from .utils import PARAMS, PROFILE, make_params
+
+
+class WarmStartTests(SimpleTestCase):
+    def setUp(self):
+        get_result_cache().clear()
+
+    def test_uses_last_result_of_same_shape(self):
+        first, _ = cached_solve(PARAMS, profile=PROFILE, warm_start=True)
+        self.assertFalse(first['stats']['warm_start'])
+        second, cached = cached_solve(make_params(max_monthly_hours=210), profile=PROFILE, warm_start=True)
+        self.assertFalse(cached)
+        self.assertTrue(second['stats']['warm_start'])
+        self.assertIsNotNone(second['schedule'])
+
+    def test_hint_outside_model_is_ignored(self):
+        hint = {n: [1] * 40 for n in range(8)}
+        solver = build_solver(PARAMS, hint=hint, template_cache=None)
+        solver.build()
+        # 범위 안의 (근무자, 날짜)에서 입력으로 정해지지 않은 변수마다 hint 하나
+        free = [var for var in solver.shifts.ravel().tolist() if var is not solver.true and var is not solver.false]
+        self.assertEqual(len(solver.model.Proto().solution_hint.vars), len(free))
@@ -0,0 +1,30 @@
+"""테스트에서 공통으로 사용하는 입력과 요청 함수"""
+import json
+
+# 테스트에서 계산하는 작은 입력 (interactive 프로필로 수 초 안에 끝남)
+PARAMS = {
+    'num_workers': 5,
+    'num_days': 28,
+    'start_day_of_week': 0,
+    'max_monthly_hours': 200,
+    'holidays': [],
+    'fixed_assignments': [],
+}
+PROFILE = 'interactive'
+
+# /api/solve_schedule/ 등에 보내는 PARAMS와 같은 폼 입력
+PAYLOAD = {
+    'num_workers': 5,
+    'num_days': 28,
+    'start_day_of_week': 0,
+    'max_monthly_hours': 200,
+    'profile': PROFILE,
+}
+
+
+def make_params(**kwargs):
+    return dict(PARAMS, **kwargs)
+
+
+def post_json(client, path, data, **extra):
+    return client.post(path, json.dumps(data), content_type='application/json', **extra)
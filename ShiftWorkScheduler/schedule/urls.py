@@ -24,4 +24,18 @@ app_name = "schedule"
 urlpatterns = [
     path("", schedule.views.index, name="index"),
     path("api/solve_schedule/", schedule.views.solve_schedule, name="solve_schedule"),
+    path("api/solve_schedule/stream/", schedule.views.solve_schedule_stream, name="solve_schedule_stream"),
+    path("api/solve_schedule/repair/", schedule.views.solve_schedule_repair, name="solve_schedule_repair"),
+    path("api/solve_schedule/batch/", schedule.views.solve_schedule_batch, name="solve_schedule_batch"),
+    path("api/solve_schedule/sweep/", schedule.views.solve_schedule_sweep, name="solve_schedule_sweep"),
+    path("api/jobs/", schedule.views.submit_solve_job, name="submit_solve_job"),
+    path("api/horizon/", schedule.views.submit_horizon_job, name="submit_horizon_job"),
+    path("api/roster/", schedule.views.submit_roster_job, name="submit_roster_job"),
+    path("api/jobs/<uuid:job_id>/", schedule.views.solve_job_status, name="solve_job_status"),
+    path("api/teams/<str:team>/assignments/", schedule.views.team_assignments, name="team_assignments"),
+    path("api/teams/<str:team>/totals/", schedule.views.team_worker_totals, name="team_worker_totals"),
+    path("api/teams/<str:team>/ledger/", schedule.views.team_ledger, name="team_ledger"),
+    path("api/runs/", schedule.views.solve_runs, name="solve_runs"),
+    path("api/runs/<int:run_id>/", schedule.views.solve_run_detail, name="solve_run_detail"),
+    path("metrics", schedule.views.metrics, name="metrics"),
 ]
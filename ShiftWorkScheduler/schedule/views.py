@@ -1,68 +1,477 @@
 from django.shortcuts import render
-from .solve import *
+import datetime
 import json
-from django.http import JsonResponse, HttpResponseBadRequest
-from django.views.decorators.http import require_POST
-from .forms import ScheduleSettingsForm
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, HttpResponseBadRequest
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+from .admission import admission_control
+from .encoding import JSON, PACKED_JSON, encode_schedule, preferred_type, schedule_response
+from .forms import HorizonSettingsForm, LargeRosterSettingsForm, RepairScheduleForm, ScheduleSettingsForm
+from .jobs import JobQueueFull, get_executor, solve_in_pool, submit_job, wait_for_job
+from .models import SolveJob, SolveRun
+from .params import format_schedule, horizon_options, params_from_form, roster_options, solve_options
+from .precheck import no_schedule_message
+from .profiles import SolverProfile
+from .streaming import streaming_response, wait_first
+from .sweep import SweepError, expand_sweep, run_variant, shape_key
+from .storage import (
+    assignment_page, ledger_totals, run_page, run_schedule, storage_options, store_schedule, worker_totals,
+)
+from .telemetry import record_solve, render_metrics
 from django.views.decorators.csrf import ensure_csrf_cookie
 
+# 계산 모듈(cache, repair → solve, rules → OR-Tools)은 계산하는 view에서 처음 사용할 때 불러옵니다. (params.py)
+
 @ensure_csrf_cookie
 def index(request):
     return render(request, "index.html")
 
-@require_POST
-def solve_schedule(request):
+def _parse_settings_form(request, form_class=ScheduleSettingsForm):
+    """요청 본문(JSON)을 form_class로 검증합니다. (form, 에러 응답) 반환"""
     try:
         request_data = json.loads(request.body)
     except json.JSONDecodeError:
-        return HttpResponseBadRequest("잘못된 JSON 요청입니다.")
+        return None, HttpResponseBadRequest("잘못된 JSON 요청입니다.")
 
-    form = ScheduleSettingsForm(request_data)
+    form = form_class(request_data)
 
     if not form.is_valid():
-        return JsonResponse({'status': 'error', 'errors': form.errors}, status=400)
+        return None, JsonResponse({'status': 'error', 'errors': form.errors}, status=400)
+    return form, None
+
+def _result_data(entry, cached, include_telemetry):
+    """cached_solve() 결과 중 응답에 포함할 값"""
+    data = {'schedule': entry['schedule'], 'stats': entry['stats'], 'cached': cached}
+    if include_telemetry:
+        data['telemetry'] = entry.get('telemetry')
+    if entry.get('conflicts'):
+        data['conflicts'] = entry['conflicts']
+    if entry.get('alternatives'):
+        data['alternatives'] = entry['alternatives']
+    return data
+
+def _store_result(cleaned_data, params, entry, data):
+    """폼에 team이 있으면 결과를 팀 스케줄로 저장하고 data['run_id']에 기록합니다."""
+    store = storage_options(cleaned_data)
+    if store and entry['schedule']:
+        data['run_id'] = store_schedule(store['team'], store['start_date'], params, entry['schedule'], entry['stats']).pk
+
+@require_POST
+@admission_control()
+def solve_schedule(request):
+    from .cache import cached_solve
+
+    form, error_response = _parse_settings_form(request)
+    if error_response:
+        return error_response
+    try:
+        params = params_from_form(form.cleaned_data)
+        entry, cached = cached_solve(params, max_threads=request.solver_threads, **solve_options(form.cleaned_data))
+
+        data = _result_data(entry, cached, form.cleaned_data['include_telemetry'])
+        _store_result(form.cleaned_data, params, entry, data)
+
+        if not entry['schedule']:
+            return schedule_response(request, {'status': 'error', 'message': no_schedule_message(entry.get('conflicts')), **data}, status=422)
+
+        return schedule_response(request, {'status': 'success', **data})
+
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'message': f'서버 오류: {str(e)}'}, status=500)
+
+@require_POST
+@admission_control()
+def solve_schedule_repair(request):
+    """
+    기존 스케줄에서 변경된 고정 근무(changes) 주변 window일만 다시 계산합니다.
+    나머지 날짜는 기존 배정으로 고정되고, 변경되는 배정 수가 최소가 되도록 계산합니다.
+    """
+    from .repair import diff_schedules, repair_schedule
+
+    form, error_response = _parse_settings_form(request, RepairScheduleForm)
+    if error_response:
+        return error_response
     try:
         data = form.cleaned_data
-        
-        # 1. 주말 계산
-        weekends = [
-            d for d in range(data['num_days']) 
-            if (d + data['start_day_of_week']) % 7 == 5 or 
-               (d + data['start_day_of_week']) % 7 == 6
-        ]
-
-        # 2. 제약조건 리스트
-        constraints = [
-            addExactlyOne,
-            addDailyShiftRequirements,
-            addNightShiftRestRequirement,
-            addFixedAssignments,
-            addVacationRestrictions,
-            addNoConsecutiveOffDays,
-            addMonthlyWorkConstraints,
-        ]
-        
-        solver = ScheduleSolver(
-            num_workers=data['num_workers'],
-            num_days=data['num_days'],
-            fixed_assignments=data['fixed_assignments'],
-            weekends=weekends,
-            holidays=data['holidays'],
-            max_monthly_hours=data['max_monthly_hours'],
-            constraints=constraints,
-            objectiveFunc=setObjective
+        solver, schedule_result = repair_schedule(
+            params_from_form(data),
+            data['schedule'],
+            data['changes'],
+            window=data['window'],
+            time_limit=getattr(settings, 'SCHEDULE_REPAIR_TIME_LIMIT', 1.0),
+            # 탐색 스레드는 admission_control이 예약한 수만큼
+            profile=SolverProfile('repair', num_search_workers=request.solver_threads),
         )
-        
-        schedule_result = solver.solve()
 
         if not schedule_result:
-            return JsonResponse({'status': 'error', 'message': '해결 가능한 스케줄을 찾지 못했습니다.'}, status=422)
-
-        final_schedule = {}
-        for worker, codes in schedule_result.items():
-            final_schedule[f"worker_{worker}"] = [code for code in codes]
+            return JsonResponse({'status': 'error', 'message': '해결 가능한 스케줄을 찾지 못했습니다.', 'stats': solver.stats}, status=422)
 
-        return JsonResponse({'status': 'success', 'schedule': final_schedule})
+        return JsonResponse({
+            'status': 'success',
+            'schedule': format_schedule(schedule_result),
+            'changed': diff_schedules(data['schedule'], schedule_result),
+            'stats': solver.stats,
+        })
 
     except Exception as e:
-        return JsonResponse({'status': 'error', 'message': f'서버 오류: {str(e)}'}, status=500)
\ No newline at end of file
+        return JsonResponse({'status': 'error', 'message': f'서버 오류: {str(e)}'}, status=500)
+
+def _sse(event, data):
+    """Server-Sent Events 형식의 메시지 한 개"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@require_POST
+@admission_control()
+def solve_schedule_stream(request):
+    """
+    계산 중 더 좋은 해를 찾을 때마다 Server-Sent Events로 전송합니다.
+    - event: solution  {schedule, objective, best_bound, elapsed, solutions}
+    - event: done      {schedule, stats, cached} (해가 없으면 schedule은 null)
+    - event: error     {message}
+    WSGI와 ASGI 모두 이벤트마다 바로 전송하고 (streaming.py), 클라이언트가 연결을 끊으면 남은 탐색을 중단합니다.
+    """
+    from .cache import cached_solve
+
+    form, error_response = _parse_settings_form(request)
+    if error_response:
+        return error_response
+
+    params = params_from_form(form.cleaned_data)
+    options = solve_options(form.cleaned_data)
+
+    def produce(emit, stopped):
+        def on_solution(monitor):
+            emit(_sse('solution', {
+                'schedule': format_schedule(monitor.current_schedule()),
+                'objective': monitor.ObjectiveValue(),
+                'best_bound': monitor.BestObjectiveBound(),
+                'elapsed': monitor.WallTime(),
+                'solutions': monitor.solutions,
+            }))
+
+        try:
+            # 응답이 끝나기 전에 연결이 끊기면(stopped) 탐색 중단
+            entry, cached = cached_solve(params, solution_callback=on_solution, cancel_event=stopped,
+                                         max_threads=request.solver_threads, **options)
+            data = _result_data(entry, cached, form.cleaned_data['include_telemetry'])
+            _store_result(form.cleaned_data, params, entry, data)
+            emit(_sse('done', data))
+        except Exception as e:
+            emit(_sse('error', {'message': f'서버 오류: {str(e)}'}))
+
+    response = streaming_response(request, produce, 'text/event-stream', keepalive=": keep-alive\n\n")
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def _ndjson(data):
+    return json.dumps(data, ensure_ascii=False) + "\n"
+
+@require_POST
+@admission_control(solve=False)
+def solve_schedule_batch(request):
+    """
+    여러 스케줄 설정을 한 번에 계산합니다.
+    - 요청: [payload, ...] 또는 {"items": [payload, ...]} (payload는 /api/solve_schedule/과 동일)
+    - 응답: 항목마다 한 줄씩 끝나는 순서대로 전송하는 NDJSON
+      {"index": i, "status": "success", "schedule": {...}, "stats": {...}, "cached": bool}
+      {"index": i, "status": "error", "errors": {...}} 또는 {"index": i, "status": "error", "message": "..."}
+      마지막 줄: {"status": "done", "total": N, "succeeded": k, "failed": m}
+    WSGI와 ASGI 모두 줄마다 바로 전송합니다. (streaming.py)
+    """
+    try:
+        items = json.loads(request.body)
+    except json.JSONDecodeError:
+        return HttpResponseBadRequest("잘못된 JSON 요청입니다.")
+    if isinstance(items, dict):
+        items = items.get('items')
+    if not isinstance(items, list):
+        return HttpResponseBadRequest("요청은 스케줄 설정의 리스트(배열)여야 합니다.")
+    max_items = getattr(settings, 'SCHEDULE_BATCH_MAX_ITEMS', 100)
+    if len(items) > max_items:
+        return HttpResponseBadRequest(f"한 번에 최대 {max_items}개까지 계산할 수 있습니다.")
+
+    # 1. 모든 항목을 먼저 검증
+    forms = [ScheduleSettingsForm(item) if isinstance(item, dict) else None for item in items]
+    valid = [form is not None and form.is_valid() for form in forms]
+    batch_profile = getattr(settings, 'SCHEDULE_BATCH_PROFILE', 'throughput')
+    # NDJSON 각 줄은 JSON이므로 바이너리 형식을 요청해도 base64 packed 형식으로 보냄
+    media_type = JSON if preferred_type(request) == JSON else PACKED_JSON
+
+    def produce(emit, stopped):
+        succeeded = failed = 0
+        for index, form in enumerate(forms):
+            if not valid[index]:
+                failed += 1
+                if form is None:
+                    emit(_ndjson({'index': index, 'status': 'error', 'message': '항목은 딕셔너리(객체)여야 합니다.'}))
+                else:
+                    emit(_ndjson({'index': index, 'status': 'error', 'errors': form.errors}))
+
+        # 2. 유효한 항목은 프로세스 풀에서 동시에 계산하고, 끝나는 순서대로 전송
+        pending = {}
+        params = {}
+        for index, form in enumerate(forms):
+            if valid[index]:
+                options = solve_options(form.cleaned_data)
+                options['profile'] = options['profile'] or batch_profile
+                params[index] = params_from_form(form.cleaned_data)
+                pending[solve_in_pool(params[index], options)] = index
+        try:
+            while pending:
+                done = wait_first(pending, stopped)
+                if not done:
+                    return
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        entry, cached = future.result()
+                    except Exception as e:
+                        failed += 1
+                        emit(_ndjson({'index': index, 'status': 'error', 'message': f'서버 오류: {str(e)}'}))
+                        continue
+                    record_solve(entry, cached)
+                    data = _result_data(entry, cached, forms[index].cleaned_data['include_telemetry'])
+                    _store_result(forms[index].cleaned_data, params[index], entry, data)
+                    data['schedule'] = encode_schedule(data['schedule'], media_type)
+                    for alternative in data.get('alternatives', []):
+                        alternative['schedule'] = encode_schedule(alternative['schedule'], media_type)
+                    if entry['schedule']:
+                        succeeded += 1
+                        emit(_ndjson({'index': index, 'status': 'success', **data}))
+                    else:
+                        failed += 1
+                        emit(_ndjson({'index': index, 'status': 'error', 'message': no_schedule_message(entry.get('conflicts')), **data}))
+            emit(_ndjson({'status': 'done', 'total': len(forms), 'succeeded': succeeded, 'failed': failed}))
+        finally:
+            # 클라이언트가 연결을 끊으면(stopped) 아직 시작하지 않은 계산은 취소
+            for future in pending:
+                future.cancel()
+
+    return streaming_response(request, produce, 'application/x-ndjson')
+
+@require_POST
+@admission_control(solve=False)
+def solve_schedule_sweep(request):
+    """
+    기본 설정에서 일부 값만 바꾼 변형(what-if)을 동시에 계산해 비교합니다.
+    - 요청: {"base": payload, "sweep": {"max_monthly_hours": [180, 200, 220], ...}, "include_schedules": false}
+    - 응답: 변형마다 한 줄씩 끝나는 순서대로 전송하는 NDJSON
+      {"index": i, "variation": {...}, "status": "success", "feasible": true, "objective": ...,
+       "terms": {...}, "hours": {"min", "max", "spread"}, ...}
+      {"index": i, "variation": {...}, "status": "error", "errors": {...}} (설정 검증 실패)
+      마지막 줄: {"status": "done", "total": N, "succeeded": k, "failed": m}
+    WSGI와 ASGI 모두 줄마다 바로 전송합니다. (streaming.py)
+    """
+    try:
+        body = json.loads(request.body)
+    except json.JSONDecodeError:
+        return HttpResponseBadRequest("잘못된 JSON 요청입니다.")
+    if not isinstance(body, dict):
+        return HttpResponseBadRequest("요청은 {\"base\": {...}, \"sweep\": {...}} 형식이어야 합니다.")
+    try:
+        variants = expand_sweep(body.get('base'), body.get('sweep'), getattr(settings, 'SCHEDULE_SWEEP_MAX_VARIANTS', 64))
+    except SweepError as e:
+        return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+    include_schedules = bool(body.get('include_schedules'))
+    forms = [ScheduleSettingsForm(payload) for _, payload in variants]
+    valid = [form.is_valid() for form in forms]
+    sweep_profile = getattr(settings, 'SCHEDULE_BATCH_PROFILE', 'throughput')
+    media_type = JSON if preferred_type(request) == JSON else PACKED_JSON
+
+    def produce(emit, stopped):
+        succeeded = failed = 0
+        for index, form in enumerate(forms):
+            if not valid[index]:
+                failed += 1
+                emit(_ndjson({'index': index, 'variation': variants[index][0], 'status': 'error', 'errors': form.errors}))
+
+        # 모양마다 첫 변형을 먼저 계산하고, 나머지는 그 결과를 hint로 계산
+        params = {}
+        options = {}
+        followers = {}
+        pending = {}
+        for index, form in enumerate(forms):
+            if valid[index]:
+                params[index] = params_from_form(form.cleaned_data)
+                options[index] = solve_options(form.cleaned_data)
+                options[index]['profile'] = options[index]['profile'] or sweep_profile
+                shape = shape_key(params[index])
+                if shape in followers:
+                    followers[shape].append(index)
+                else:
+                    followers[shape] = []
+                    pending[get_executor().submit(run_variant, params[index], options[index])] = index
+        try:
+            while pending:
+                done = wait_first(pending, stopped)
+                if not done:
+                    return
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        entry, cached, comparison = future.result()
+                    except Exception as e:
+                        entry = None
+                        failed += 1
+                        emit(_ndjson({'index': index, 'variation': variants[index][0], 'status': 'error', 'message': f'서버 오류: {str(e)}'}))
+                    else:
+                        record_solve(entry, cached)
+                        succeeded += 1
+                        row = {'index': index, 'variation': variants[index][0], 'status': 'success',
+                               'cached': cached, **comparison}
+                        if include_schedules and entry['schedule']:
+                            row['schedule'] = encode_schedule(entry['schedule'], media_type)
+                        emit(_ndjson(row))
+                    # 같은 모양의 나머지 변형 제출
+                    for follower in followers.pop(shape_key(params[index]), []):
+                        hint = entry['schedule'] if entry else None
+                        pending[get_executor().submit(run_variant, params[follower], dict(options[follower], hint=options[follower]['hint'] or hint))] = follower
+            emit(_ndjson({'status': 'done', 'total': len(forms), 'succeeded': succeeded, 'failed': failed}))
+        finally:
+            # 클라이언트가 연결을 끊으면(stopped) 아직 시작하지 않은 계산은 취소
+            for future in pending:
+                future.cancel()
+
+    return streaming_response(request, produce, 'application/x-ndjson')
+
+@require_POST
+@admission_control(solve=False)
+def submit_solve_job(request):
+    """스케줄 계산 작업을 대기열에 넣고 작업 id를 바로 반환합니다."""
+    form, error_response = _parse_settings_form(request)
+    if error_response:
+        return error_response
+    return _submit_job_response(params_from_form(form.cleaned_data), solve_options(form.cleaned_data), form.cleaned_data)
+
+@require_POST
+@admission_control(solve=False)
+def submit_horizon_job(request):
+    """
+    여러 달(num_days 최대 366일) 스케줄 계산 작업을 대기열에 넣습니다.
+    window_days일 구간을 overlap_days일씩 겹쳐 차례로 계산해 하나의 스케줄로 이어 붙입니다.
+    """
+    form, error_response = _parse_settings_form(request, HorizonSettingsForm)
+    if error_response:
+        return error_response
+    return _submit_job_response(params_from_form(form.cleaned_data), horizon_options(form.cleaned_data), form.cleaned_data, SolveJob.HORIZON)
+
+@require_POST
+@admission_control(solve=False)
+def submit_roster_job(request):
+    """
+    대규모 근무자(num_workers 최대 1000명) 스케줄 계산 작업을 대기열에 넣습니다.
+    team_size명 안팎의 팀별로 계산한 뒤 lns_time초 동안 전체 근무자의 공정성을 개선합니다.
+    """
+    form, error_response = _parse_settings_form(request, LargeRosterSettingsForm)
+    if error_response:
+        return error_response
+    return _submit_job_response(params_from_form(form.cleaned_data), roster_options(form.cleaned_data), form.cleaned_data, SolveJob.ROSTER)
+
+def _submit_job_response(params, options, cleaned_data, kind=SolveJob.MONTH):
+    store = storage_options(cleaned_data)
+    if store:
+        options['store'] = store
+    try:
+        job = submit_job(params, options, kind)
+    except JobQueueFull:
+        response = JsonResponse({'status': 'error', 'message': '작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.'}, status=503)
+        response['Retry-After'] = '5'
+        return response
+
+    data = job.to_dict()
+    data['status_url'] = reverse('schedule:solve_job_status', args=[job.pk])
+    return JsonResponse({'status': 'success', 'job': data}, status=202)
+
+@require_GET
+def solve_job_status(request, job_id):
+    """
+    작업 상태를 조회합니다.
+    - ?wait=N : 작업이 끝날 때까지 최대 N초 기다린 뒤 응답 (long-poll)
+    """
+    try:
+        wait = float(request.GET.get('wait', 0))
+    except ValueError:
+        return HttpResponseBadRequest("wait 값은 숫자여야 합니다.")
+    try:
+        job = wait_for_job(job_id, wait) if wait > 0 else SolveJob.objects.get(pk=job_id)
+    except SolveJob.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': '작업을 찾을 수 없습니다.'}, status=404)
+    return schedule_response(request, {'status': 'success', 'job': job.to_dict()}, container='job')
+
+def metrics(request):
+    """Prometheus text format 지표 (telemetry.py)"""
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def _page_limit(request, default_setting, default):
+    """?limit 값 (SCHEDULE_STORAGE_MAX_PAGE_SIZE 이하)"""
+    limit = int(request.GET.get('limit', getattr(settings, default_setting, default)))
+    return max(1, min(limit, getattr(settings, 'SCHEDULE_STORAGE_MAX_PAGE_SIZE', 5000)))
+
+@require_GET
+def team_assignments(request, team):
+    """
+    저장된 팀 스케줄의 배정을 (날짜, 근무자) 순서로 페이지 단위로 반환합니다.
+    - ?date=2026-11-03 (또는 ?from=&to=), ?shift=2, ?worker=0 으로 필터
+    - ?cursor=: 이전 응답의 next_cursor, ?limit=: 페이지 크기
+    예: 11월 3일 야간 근무자 → ?date=2026-11-03&shift=2
+    """
+    try:
+        date_from = request.GET.get('date') or request.GET.get('from')
+        date_to = request.GET.get('date') or request.GET.get('to')
+        date_from = datetime.date.fromisoformat(date_from) if date_from else None
+        date_to = datetime.date.fromisoformat(date_to) if date_to else None
+        shift = int(request.GET['shift']) if request.GET.get('shift') else None
+        worker = int(request.GET['worker']) if request.GET.get('worker') else None
+        limit = _page_limit(request, 'SCHEDULE_STORAGE_PAGE_SIZE', 500)
+        assignments, next_cursor = assignment_page(
+            team, date_from, date_to, shift, worker, request.GET.get('cursor'), limit,
+        )
+    except ValueError:
+        return HttpResponseBadRequest("잘못된 조회 조건입니다.")
+    return JsonResponse({'status': 'success', 'team': team, 'assignments': assignments, 'next_cursor': next_cursor})
+
+@require_GET
+def team_worker_totals(request, team):
+    """
+    기간 내 근무자별 총 근무시간과 근무 종류별 횟수
+    - ?month=2026-11 또는 ?from=2026-11-01&to=2026-11-30
+    """
+    try:
+        if request.GET.get('month'):
+            date_from = datetime.date.fromisoformat(request.GET['month'] + '-01')
+            date_to = (date_from + datetime.timedelta(days=31)).replace(day=1) - datetime.timedelta(days=1)
+        else:
+            date_from = datetime.date.fromisoformat(request.GET['from'])
+            date_to = datetime.date.fromisoformat(request.GET['to'])
+    except (KeyError, ValueError):
+        return HttpResponseBadRequest("month 또는 from/to 날짜가 필요합니다.")
+    return JsonResponse({
+        'status': 'success', 'team': team, 'from': date_from.isoformat(), 'to': date_to.isoformat(),
+        'workers': worker_totals(team, date_from, date_to),
+    })
+
+@require_GET
+def team_ledger(request, team):
+    """근무자별 누적 근무 기록 (저장된 모든 스케줄의 합계, use_ledger에서 사용)"""
+    return JsonResponse({'status': 'success', 'team': team, 'workers': ledger_totals(team)})
+
+@require_GET
+def solve_runs(request):
+    """저장된 계산 결과 목록 (최신순). ?team=, ?cursor=, ?limit="""
+    try:
+        runs, next_cursor = run_page(request.GET.get('team'), request.GET.get('cursor'),
+                                     _page_limit(request, 'SCHEDULE_STORAGE_RUN_PAGE_SIZE', 50))
+    except ValueError:
+        return HttpResponseBadRequest("잘못된 조회 조건입니다.")
+    return JsonResponse({'status': 'success', 'runs': runs, 'next_cursor': next_cursor})
+
+@require_GET
+def solve_run_detail(request, run_id):
+    """저장된 계산 결과 하나와 스케줄"""
+    try:
+        run = SolveRun.objects.select_related('team').get(pk=run_id)
+    except SolveRun.DoesNotExist:
+        return JsonResponse({'status': 'error', 'message': '저장된 계산 결과를 찾을 수 없습니다.'}, status=404)
+    return schedule_response(request, {'status': 'success', 'run': run.to_dict(), 'schedule': run_schedule(run)})